@@ -0,0 +1,260 @@
+"""
+Description  : 语法树的二进制序列化 (带格式版本与源代码哈希) 与按源文件缓存语法树的磁盘缓存
+Author       : Hyoung
+Date         : 2026-10-17 23:56:09
+LastEditTime : 2026-10-17 23:56:09
+FilePath     : \\课程设计\\rust-like-compiler\\ast_cache.py
+"""
+
+import gc
+import hashlib
+import os
+import struct
+import sys
+from array import array
+
+from flat_ast import FlatAST, NODE_CLASSES
+from lexer import Token
+
+MAGIC = b"RLAST"
+FORMAT_VERSION = 1
+# 节点类的定义 (类名与字段) 改变后，旧文件中的类别码与字段编码不再有效
+SCHEMA = hashlib.sha256(
+    "|".join(f"{cls.__name__}:{','.join(cls._fields)}" for cls in NODE_CLASSES).encode()
+).digest()[:8]
+
+# 文件头: 魔数, 格式版本, 节点定义摘要, 源代码 SHA-256, 节点数, 字段编码数,
+#         值表大小, Token 数, 常量数, 根节点
+HEADER = struct.Struct("<5sH8s32sIIIIIi")
+
+# 值表中各值的类型标记
+TAG_STR, TAG_INT, TAG_FALSE, TAG_TRUE = range(4)
+LENGTH = struct.Struct("<I")
+# Token 表每项: 类型 (值表下标), 值 (值表下标), 行号, 列号, 偏移量；None 记为 -1
+TOKEN_WIDTH = 5
+
+
+class ASTFormatError(ValueError):
+    """二进制语法树文件损坏或不完整"""
+
+
+def source_digest(source):
+    """源代码 (str 或 bytes) 的 SHA-256 摘要"""
+    if isinstance(source, str):
+        source = source.encode("utf-8")
+    return hashlib.sha256(source).digest()
+
+
+def file_digest(path):
+    """源文件内容的 SHA-256 摘要，按块读取，与 source_digest(文件内容) 相同"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def little_endian(values):
+    """int32 数组按小端序输出的字节"""
+    if sys.byteorder == "big":
+        values = array("i", values)
+        values.byteswap()
+    return values.tobytes()
+
+
+# --- 序列化 ---
+def dump_ast(ast, digest):
+    """
+    把语法树 (parser_nodes 节点对象或 FlatAST) 编码为二进制数据，digest 为对应源代码的摘要。
+
+    文件头之后依次为 FlatAST 的 kinds、starts、slots 数组，然后是常量表：
+    不重复的字符串与整数组成值表，Token 编码为定长的 int32 表 (类型与值为值表下标)，
+    每个常量记为值表下标 (>= 0) 或 -1 - Token 下标。整数数组均为小端序 int32。
+    """
+    flat = ast if isinstance(ast, FlatAST) else FlatAST.from_tree(ast)
+    pool = []
+    pool_index = {}
+
+    def intern(value):
+        if value is None:
+            return -1
+        if type(value) not in (str, int, bool):
+            raise TypeError(
+                f"无法序列化语法树中的 {type(value).__name__} 值: {value!r}"
+            )
+        key = (type(value), value)
+        index = pool_index.get(key)
+        if index is None:
+            index = pool_index[key] = len(pool)
+            pool.append(value)
+        return index
+
+    tokens = array("i")
+    constants = array("i")
+    for value in flat.constants:
+        if type(value) is Token:
+            constants.append(-1 - len(tokens) // TOKEN_WIDTH)
+            offset = -1 if value.offset is None else value.offset
+            tokens.extend(
+                (
+                    intern(value.type),
+                    intern(value.value),
+                    value.line,
+                    value.column,
+                    offset,
+                )
+            )
+        else:
+            constants.append(intern(value))
+
+    out = bytearray(
+        HEADER.pack(
+            MAGIC,
+            FORMAT_VERSION,
+            SCHEMA,
+            digest,
+            len(flat.kinds),
+            len(flat.slots),
+            len(pool),
+            len(tokens) // TOKEN_WIDTH,
+            len(constants),
+            flat.root,
+        )
+    )
+    out += flat.kinds.tobytes()
+    out += little_endian(flat.starts)
+    out += little_endian(flat.slots)
+    for value in pool:
+        if value is True or value is False:
+            out.append(TAG_TRUE if value else TAG_FALSE)
+        else:
+            # 整数记为十进制文本，数值大小不受限制
+            out.append(TAG_STR if type(value) is str else TAG_INT)
+            data = str(value).encode("utf-8")
+            out += LENGTH.pack(len(data))
+            out += data
+    out += little_endian(tokens)
+    out += little_endian(constants)
+    return bytes(out)
+
+
+# --- 反序列化 ---
+def read_header(data):
+    """返回 (格式版本, 节点定义摘要, 源代码摘要)；不是语法树文件时抛出 ASTFormatError"""
+    if len(data) < HEADER.size or data[: len(MAGIC)] != MAGIC:
+        raise ASTFormatError("不是二进制语法树文件")
+    return HEADER.unpack_from(data)[1:4]
+
+
+def load_ast(data, digest=None):
+    """
+    读回 dump_ast 的结果，返回 parser_nodes 节点对象组成的语法树。
+    格式版本或节点定义与当前程序不同、或给出的 digest 与文件中的源代码摘要不同时返回 None；
+    数据损坏时抛出 ASTFormatError。
+    """
+    version, schema, stored_digest = read_header(data)
+    if version != FORMAT_VERSION or schema != SCHEMA:
+        return None
+    if digest is not None and digest != stored_digest:
+        return None
+    fields = HEADER.unpack_from(data)
+    nodes, slot_count, pool_size, token_count, constant_count, root = fields[4:]
+    reader = Reader(data, HEADER.size)
+    flat = FlatAST()
+    flat.kinds = array("B", reader.take(nodes))
+    flat.starts = reader.int32(nodes)
+    flat.slots = reader.int32(slot_count)
+    pool = [reader.value() for _ in range(pool_size)]
+    tokens = reader.int32(TOKEN_WIDTH * token_count)
+    constants = reader.int32(constant_count)
+    if reader.position != len(data) or not 0 <= root < nodes:
+        raise ASTFormatError("二进制语法树文件不完整")
+    if max(flat.kinds, default=0) >= len(NODE_CLASSES):
+        raise ASTFormatError("未知的节点类别码")
+    # 读回的语法树中没有循环引用；大量创建对象时暂停循环垃圾回收，避免反复扫描已创建的节点
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        pool.append(None)  # 下标 -1
+        token_list = [
+            Token(pool[t], pool[v], line, column, None if offset < 0 else offset)
+            for t, v, line, column, offset in zip(*[iter(tokens)] * TOKEN_WIDTH)
+        ]
+        flat.constants = [
+            pool[code] if code >= 0 else token_list[-1 - code] for code in constants
+        ]
+        flat.root = root
+        return flat.to_tree()
+    except IndexError:
+        raise ASTFormatError("二进制语法树文件中的引用无效") from None
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class Reader:
+    def __init__(self, data, position):
+        self.data = data
+        self.position = position
+
+    def take(self, size):
+        start = self.position
+        self.position += size
+        if self.position > len(self.data):
+            raise ASTFormatError("二进制语法树文件不完整")
+        return self.data[start : self.position]
+
+    def int32(self, count):
+        values = array("i", self.take(4 * count))
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values
+
+    def value(self):
+        tag = self.take(1)[0]
+        if tag == TAG_TRUE or tag == TAG_FALSE:
+            return tag == TAG_TRUE
+        if tag != TAG_STR and tag != TAG_INT:
+            raise ASTFormatError(f"未知的值类型标记 {tag}")
+        (size,) = LENGTH.unpack(self.take(LENGTH.size))
+        try:
+            text = str(self.take(size), "utf-8")
+            return text if tag == TAG_STR else int(text)
+        except ValueError:
+            raise ASTFormatError("无效的字符串或整数") from None
+
+
+# --- 磁盘缓存 ---
+class ASTCache:
+    """
+    按源文件缓存语法分析结果：directory 下的 <源文件名>.astc 保存语法树与源代码摘要。
+    源文件内容未改变时 load 直接读回语法树，跳过词法分析与语法分析。
+    只缓存没有语法错误的语法树。
+    """
+
+    SUFFIX = ".astc"
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def path_for(self, source_path):
+        name = os.path.splitext(os.path.basename(source_path))[0]
+        return os.path.join(self.directory, name + self.SUFFIX)
+
+    def load(self, source_path, digest):
+        """返回缓存的语法树；没有缓存、源文件已修改或缓存不可用时返回 None"""
+        try:
+            with open(self.path_for(source_path), "rb") as f:
+                return load_ast(f.read(), digest)
+        except (OSError, ASTFormatError):
+            return None
+
+    def store(self, source_path, digest, ast):
+        """保存语法树，返回缓存文件路径 (先写临时文件再替换，中断时不留下不完整的缓存)"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path_for(source_path)
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(dump_ast(ast, digest))
+        os.replace(temp_path, path)
+        return path
@@ -0,0 +1,106 @@
+"""
+Description  : 显式栈驱动的递归执行器与 AST 访问者基类，嵌套深度不受 Python 调用栈限制
+Author       : Hyoung
+Date         : 2026-10-17 14:25:10
+LastEditTime : 2026-10-17 14:25:10
+FilePath     : \\课程设计\\rust-like-compiler\\ast_walker.py
+"""
+
+from types import GeneratorType
+
+
+def run(task):
+    """
+    执行以生成器编写的递归过程 (trampoline)，返回其结果。
+
+    生成器中用 `value = yield 子任务` 代替递归调用：子任务是生成器时压入显式栈执行，
+    执行完毕后把返回值送回父生成器；子任务是普通值时直接送回。
+    子任务抛出的异常在父生成器的 yield 处重新抛出，try/except 与递归写法的语义相同。
+    无论嵌套多深，Python 调用栈的深度都保持不变。
+    """
+    if type(task) is not GeneratorType:
+        return task
+    stack = [task]
+    value = None
+    error = None
+    while True:
+        current = stack[-1]
+        try:
+            if error is None:
+                child = current.send(value)
+            else:
+                exc, error = error, None
+                child = current.throw(exc)
+        except StopIteration as stop:
+            stack.pop()
+            if not stack:
+                return stop.value
+            value = stop.value
+            continue
+        except BaseException as exc:
+            stack.pop()
+            if not stack:
+                raise
+            value, error = None, exc
+            continue
+        if type(child) is GeneratorType:
+            stack.append(child)
+            value = None
+        else:
+            value = child
+
+
+class DispatchTable(dict):
+    """节点类 -> 处理函数。某个节点类第一次出现时由 resolve(节点类) 求出处理函数并缓存"""
+
+    def __init__(self, resolve):
+        super().__init__()
+        self.resolve = resolve
+
+    def __missing__(self, node_class):
+        handler = self[node_class] = self.resolve(node_class)
+        return handler
+
+
+class ASTVisitor:
+    """
+    非递归访问者基类。
+
+    visit_<节点类名> 既可以是普通方法，也可以是生成器方法；访问子节点时写作
+    `value = yield self.visit(child)`，由 walk 在显式栈上执行。
+    没有对应方法的节点交给 generic_visit。
+
+    每个访问者类有自己的调度表 (dispatch)：节点类第一次被访问时沿其 MRO 查找
+    visit_<类名> (如 visit_ExpressionNode 可以处理所有表达式节点)，之后直接查表，
+    不再为每个节点拼接方法名。visit_* 方法须定义在类中，实例属性不参与调度。
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.dispatch = DispatchTable(cls.find_visitor)
+
+    @classmethod
+    def find_visitor(cls, node_class):
+        """node_class 对应的 visit 方法 (未绑定的函数)"""
+        for base in node_class.__mro__:
+            visitor = getattr(cls, "visit_" + base.__name__, None)
+            if visitor is not None:
+                return visitor
+        return cls.generic_visit
+
+    def walk(self, node):
+        """从 node 开始访问整棵子树，返回 node 的访问结果"""
+        return run(self.visit(node))
+
+    def visit(self, node):
+        """调度到 visit_<节点类名>，返回访问结果或待执行的生成器"""
+        if node is None:
+            return None
+        # 按 __class__ 而非 type() 调度，扁平语法树的游标 (flat_ast.FlatNode) 也能访问
+        return self.dispatch[node.__class__](self, node)
+
+    def generic_visit(self, node):
+        return None
+
+
+ASTVisitor.dispatch = DispatchTable(ASTVisitor.find_visitor)
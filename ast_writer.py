@@ -0,0 +1,101 @@
+"""
+Description  : 语法树文本 (.ast) 的流式写入器：显式栈先序遍历，逐行写入文件，可限制输出的深度与宽度
+Author       : Hyoung
+Date         : 2026-10-18 00:42:31
+LastEditTime : 2026-10-18 00:42:31
+FilePath     : \\课程设计\\rust-like-compiler\\ast_writer.py
+"""
+
+import datetime
+import io
+
+from flat_ast import child_nodes
+from parser_nodes import ASTNode
+
+# 写 .ast 文件时的缓冲区大小
+BUFFER_SIZE = 1 << 16
+
+
+def format_attr(value):
+    """
+    属性值的文本。值为语法树节点时只显示节点类名，其内容作为子节点在下方展开，
+    因此每个节点只输出一次，总输出量与节点数成正比。
+    """
+    if isinstance(value, ASTNode):
+        return f"{value.__class__.__name__}(...)"
+    try:
+        return str(value)
+    except RecursionError:
+        return f"{value.__class__.__name__}(...)"
+
+
+def format_line(node, indent):
+    """节点所在的一行：类名与各非列表属性"""
+    line = " " * indent + node.__class__.__name__
+    attrs = []
+    for key in node._fields:
+        value = getattr(node, key)
+        if not isinstance(value, list):
+            attrs.append(f"{key}={format_attr(value)}")
+    if attrs:
+        line += ": " + ", ".join(attrs)
+    return line + "\n"
+
+
+def write_ast(node, out, indent=0, max_depth=None, max_width=None):
+    """
+    把语法树逐行写入文本流 out (显式栈先序遍历)。每个节点下按 _children 顺序输出其全部子节点
+    (child_nodes)，值为节点的属性在节点所在行只显示类名。栈中每层只保存子节点列表与当前位置，
+    额外占用的内存与树的深度成正比，与节点数无关。
+
+    max_depth : 只输出前 max_depth 层子节点 (根节点为第 0 层)，更深的子树以一行 "..." 代替
+    max_width : 每个节点最多输出 max_width 个子节点，其余的以一行 "... 另有 N 个子节点" 代替
+    """
+    if node is None:
+        return
+    write = out.write
+    # 栈中每项: [子节点列表, 下一个下标, 子节点的缩进, 子节点的层数]
+    stack = []
+
+    def enter(node, indent, depth):
+        write(format_line(node, indent))
+        children = list(child_nodes(node))
+        if not children:
+            return
+        if max_depth is not None and depth >= max_depth:
+            write(" " * (indent + 2) + "...\n")
+            return
+        stack.append([children, 0, indent + 2, depth + 1])
+
+    enter(node, indent, 0)
+    while stack:
+        frame = stack[-1]
+        children, index, child_indent, depth = frame
+        if index >= len(children):
+            stack.pop()
+            continue
+        if max_width is not None and index >= max_width:
+            rest = len(children) - index
+            write(" " * child_indent + f"... 另有 {rest} 个子节点\n")
+            stack.pop()
+            continue
+        frame[1] = index + 1
+        enter(children[index], child_indent, depth)
+
+
+def format_ast(node, indent=0, max_depth=None, max_width=None):
+    """格式化AST为文本格式 (与 write_ast 写入的内容相同)"""
+    out = io.StringIO()
+    write_ast(node, out, indent, max_depth, max_width)
+    return out.getvalue()
+
+
+def save_ast_to_file(ast, file_path, max_depth=None, max_width=None):
+    """保存AST到文件 (逐行写入带缓冲的文件，不在内存中拼接整个文本)"""
+    try:
+        with open(file_path, "w", encoding="utf-8", buffering=BUFFER_SIZE) as f:
+            f.write("# 抽象语法树 (Abstract Syntax Tree)\n")
+            f.write("# 生成时间: " + str(datetime.datetime.now()) + "\n\n")
+            write_ast(ast, f, max_depth=max_depth, max_width=max_width)
+    except Exception as e:
+        print(f"保存AST文件时出错: {e}")
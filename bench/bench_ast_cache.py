@@ -0,0 +1,84 @@
+"""
+Description  : 二进制语法树缓存测试：读回缓存与重新词法、语法分析的耗时对比，以及文件大小
+Author       : Hyoung
+Date         : 2026-10-18 00:14:52
+LastEditTime : 2026-10-18 00:14:52
+FilePath     : \\课程设计\\rust-like-compiler\\bench\\bench_ast_cache.py
+"""
+
+# 用法: python bench/bench_ast_cache.py [--functions 100,400,1600] [--statements 20] [--rounds 3]
+#
+# 对合成程序比较：词法分析 + 语法分析、由语法树生成二进制数据 (dump_ast)、
+# 计算源代码摘要并读回语法树 (load_ast，即缓存命中时 main.py --ast-cache 的开销)，
+# 以及二进制数据与 .ast 文本 (format_ast) 的大小。读回的语法树与原语法树格式化结果相同。
+
+import argparse
+import os
+import sys
+import time
+
+# 添加项目根目录到模块搜索路径
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from ast_cache import dump_ast, load_ast, source_digest
+from lexer import Lexer, TokenStream
+from main import format_ast
+from parallel_compiler import myparser
+from program_generator import ProgramGenerator
+
+
+def measure(func, rounds):
+    """返回 (结果, 最快一轮耗时秒数)"""
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return result, best
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="二进制语法树缓存测试")
+    arg_parser.add_argument("--functions", default="100,400,1600", help="函数个数列表")
+    arg_parser.add_argument(
+        "--statements", type=int, default=20, help="每个函数的语句数"
+    )
+    arg_parser.add_argument("--rounds", type=int, default=3, help="每项测量轮数")
+    args = arg_parser.parse_args()
+
+    for functions in (int(n) for n in args.functions.split(",")):
+        text = ProgramGenerator(functions, args.statements).generate()
+        ast, parse_time = measure(
+            lambda: myparser.Parser(
+                TokenStream(Lexer(text).tokenize())
+            ).parse_program(),
+            args.rounds,
+        )
+        data, dump_time = measure(
+            lambda: dump_ast(ast, source_digest(text)), args.rounds
+        )
+        loaded, load_time = measure(
+            lambda: load_ast(data, source_digest(text)), args.rounds
+        )
+        formatted = format_ast(ast)
+        assert format_ast(loaded) == formatted, "读回的语法树与原语法树不同"
+        print(f"\n{functions} 个函数: {len(text)} 字符")
+        print(f"  词法 + 语法分析 {parse_time * 1000:10.1f} ms")
+        print(f"  保存 (dump_ast)  {dump_time * 1000:10.1f} ms")
+        print(
+            f"  读回 (load_ast)  {load_time * 1000:10.1f} ms, "
+            f"为重新分析的 {load_time / parse_time:.0%}"
+        )
+        print(
+            f"  二进制 {len(data) / 1024:.1f} KB, "
+            f".ast 文本 {len(formatted.encode('utf-8')) / 1024:.1f} KB, "
+            f"源代码 {len(text.encode('utf-8')) / 1024:.1f} KB"
+        )
+
+
+if __name__ == "__main__":
+    main()
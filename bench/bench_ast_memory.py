@@ -0,0 +1,112 @@
+"""
+Description  : 语法树节点使用 __slots__ 与使用实例 __dict__ 时的内存占用对比
+Author       : Hyoung
+Date         : 2026-10-17 22:31:50
+LastEditTime : 2026-10-17 22:31:50
+FilePath     : \\课程设计\\rust-like-compiler\\bench\\bench_ast_memory.py
+"""
+
+# 用法: python bench/bench_ast_memory.py [--functions 500,2000] [--statements 20] [--expr-depth 3]
+#
+# 对合成程序做语法分析，再把得到的语法树按各节点类的 _fields 复制两份：一份仍用 __slots__ 节点类，
+# 一份用同名但带实例 __dict__ 的普通类 (改造前的表示)，Token 与 else if 分支的字典共享。
+# 两份副本的列表完全相同，tracemalloc 统计的内存之差即为节点表示方式的差别。
+
+import argparse
+import os
+import sys
+import tracemalloc
+
+# 添加项目根目录到模块搜索路径
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from lexer import Lexer, TokenStream
+from parallel_compiler import myparser
+from parser_nodes import ASTNode
+from program_generator import ProgramGenerator
+
+# 节点类 -> 同名的普通类 (每个实例带 __dict__)
+LEGACY_CLASSES = {}
+
+
+def make_slotted(cls):
+    return cls.__new__(cls)
+
+
+def make_legacy(cls):
+    legacy = LEGACY_CLASSES.get(cls)
+    if legacy is None:
+        legacy = LEGACY_CLASSES[cls] = type(cls.__name__, (), {})
+    return legacy()
+
+
+def copy_tree(root, make):
+    """用 make(节点类) 创建的对象复制整棵语法树 (显式栈)，返回 (副本, 节点数)"""
+    result = [None]
+    stack = [(root, result, 0)]
+    count = 0
+    while stack:
+        node, target, key = stack.pop()
+        copy = make(type(node))
+        count += 1
+        for name in node._fields:
+            value = getattr(node, name)
+            if isinstance(value, list):
+                value = list(value)
+                for index, item in enumerate(value):
+                    if isinstance(item, ASTNode):
+                        stack.append((item, value, index))
+            elif isinstance(value, ASTNode):
+                stack.append((value, copy, name))
+            setattr(copy, name, value)
+        if isinstance(target, list):
+            target[key] = copy
+        else:
+            setattr(target, key, copy)
+    return result[0], count
+
+
+def traced(func):
+    """返回 (结果, func 执行后仍被占用的内存字节数)"""
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    result = func()
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, current - baseline
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="语法树节点内存占用测试")
+    arg_parser.add_argument("--functions", default="500,2000", help="函数个数列表")
+    arg_parser.add_argument(
+        "--statements", type=int, default=20, help="每个函数的语句数"
+    )
+    arg_parser.add_argument("--expr-depth", type=int, default=3, help="表达式最大深度")
+    args = arg_parser.parse_args()
+
+    for functions in (int(n) for n in args.functions.split(",")):
+        text = ProgramGenerator(functions, args.statements, args.expr_depth).generate()
+        tokens = Lexer(text).tokenize()
+        ast, parsed = traced(
+            lambda: myparser.Parser(TokenStream(tokens)).parse_program()
+        )
+        (_, count), slotted = traced(lambda: copy_tree(ast, make_slotted))
+        (_, _), legacy = traced(lambda: copy_tree(ast, make_legacy))
+        print(f"\n{functions} 个函数: {len(tokens)} tokens, {count} 个语法树节点")
+        print(f"  语法分析得到的语法树 {parsed / 1024:10.1f} KB")
+        print(
+            f"  __slots__ 节点      {slotted / 1024:10.1f} KB, "
+            f"{slotted / count:6.1f} bytes/节点"
+        )
+        print(
+            f"  实例 __dict__ 节点  {legacy / 1024:10.1f} KB, "
+            f"{legacy / count:6.1f} bytes/节点"
+        )
+        print(f"  节省 {(legacy - slotted) / legacy:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Description  : .ast 文本写入测试：在内存中拼接整个文本与流式逐行写入的耗时、峰值内存与输出大小对比
+Author       : Hyoung
+Date         : 2026-10-18 01:05:12
+LastEditTime : 2026-10-18 01:05:12
+FilePath     : \\课程设计\\rust-like-compiler\\bench\\bench_ast_writer.py
+"""
+
+# 用法: python bench/bench_ast_writer.py [--depths 200,400,800] [--functions 200,800] [--rounds 3]
+#
+# 两类语法树：while 循环嵌套 depths 层 (深)，以及 functions 个函数的合成程序 (大)。
+# 比较两种写法：
+#   - 拼接:   改造前的 format_ast，先在内存中拼接整个文本再写入文件；
+#             值为节点的属性显示完整的 repr，深层嵌套时输出量随深度平方增长
+#   - 流式:   write_ast 逐行写入带缓冲的文件；值为节点的属性只显示类名、内容作为子节点展开，
+#             输出量与节点数成正比
+# 峰值内存由 tracemalloc 统计 (不含语法树本身)。
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# 添加项目根目录到模块搜索路径
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from ast_writer import BUFFER_SIZE, write_ast
+from lexer import Lexer, TokenStream
+from parallel_compiler import myparser
+from program_generator import ProgramGenerator
+
+
+def legacy_format_children(node):
+    """改造前 format_ast 中逐个节点判断属性名的子节点选择"""
+    fields = node._fields
+    children = []
+    if "declarations" in fields:
+        children = node.declarations
+    elif "statements" in fields:
+        children = node.statements
+    elif "params" in fields and node.params:
+        children.extend(node.params)
+    elif "body" in fields and node.body:
+        children = [node.body]
+    elif "then_block" in fields and node.then_block:
+        children = [node.condition, node.then_block]
+        if node.else_block:
+            children.append(node.else_block)
+    elif "expr" in fields and node.expr:
+        children = [node.expr]
+    elif "left" in fields and node.left:
+        children = [node.left, node.right]
+    return children
+
+
+def legacy_format_line(node, indent):
+    """改造前的节点行：值为节点的属性显示完整的 repr"""
+    attrs = []
+    for key in node._fields:
+        value = getattr(node, key)
+        if not isinstance(value, list):
+            try:
+                attrs.append(f"{key}={value}")
+            except RecursionError:
+                attrs.append(f"{key}={value.__class__.__name__}(...)")
+    line = " " * indent + node.__class__.__name__
+    if attrs:
+        line += ": " + ", ".join(attrs)
+    return line + "\n"
+
+
+def legacy_format_ast(node, indent=0):
+    """改造前的 format_ast：收集全部行后拼接为一个字符串"""
+    lines = []
+    stack = [(node, indent)]
+    while stack:
+        node, indent = stack.pop()
+        if node is None:
+            continue
+        lines.append(legacy_format_line(node, indent))
+        for child in reversed(legacy_format_children(node)):
+            if child is not None:
+                stack.append((child, indent + 2))
+    return "".join(lines)
+
+
+def write_joined(ast, path):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(legacy_format_ast(ast))
+
+
+def write_streaming(ast, path):
+    with open(path, "w", encoding="utf-8", buffering=BUFFER_SIZE) as f:
+        write_ast(ast, f)
+
+
+def measure(func, rounds):
+    """返回 (最快一轮耗时秒数, 峰值内存字节数)"""
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+
+def nested_while(depth):
+    body = "while a < 2 { " * depth + "a = a + 1;" + " }" * depth
+    return f"fn main() {{ let mut a: i32 = 1; {body} }}"
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=".ast 文本写入测试")
+    arg_parser.add_argument("--depths", default="200,400,800", help="while 嵌套层数")
+    arg_parser.add_argument("--functions", default="200,800", help="合成程序函数个数")
+    arg_parser.add_argument("--rounds", type=int, default=3, help="每项测量轮数")
+    args = arg_parser.parse_args()
+
+    cases = [
+        (f"while 嵌套 {depth} 层", nested_while(depth))
+        for depth in map(int, args.depths.split(","))
+    ]
+    cases += [
+        (f"合成程序 {functions} 个函数", ProgramGenerator(functions).generate())
+        for functions in map(int, args.functions.split(","))
+    ]
+    path = os.path.join(tempfile.mkdtemp(), "bench.ast")
+    writers = [
+        ("拼接", lambda ast: write_joined(ast, path)),
+        ("流式", lambda ast: write_streaming(ast, path)),
+    ]
+    for name, text in cases:
+        ast = myparser.Parser(TokenStream(Lexer(text).tokenize())).parse_program()
+        print(f"\n{name}:")
+        for writer_name, writer in writers:
+            elapsed, peak = measure(lambda: writer(ast), args.rounds)
+            size = os.path.getsize(path)
+            print(
+                f"  {writer_name:<6}{elapsed * 1000:10.1f} ms, 峰值内存 "
+                f"{peak / 1024:10.1f} KB, 输出 {size / 1024:10.1f} KB"
+            )
+    os.remove(path)
+    os.rmdir(os.path.dirname(path))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Description  : 扁平语法树 (结构数组) 与对象语法树的构造、遍历耗时与内存占用对比
+Author       : Hyoung
+Date         : 2026-10-17 23:18:40
+LastEditTime : 2026-10-17 23:18:40
+FilePath     : \\课程设计\\rust-like-compiler\\bench\\bench_flat_ast.py
+"""
+
+# 用法: python bench/bench_flat_ast.py [--functions 100,400] [--statements 20] [--expr-depth 3]
+#                                     [--rounds 3]
+#
+# 对同一合成程序分别构造对象语法树与扁平语法树 (FlatASTBuilder 在语法分析时直接编码)，比较：
+#   - 构造：语法分析耗时，以及 tracemalloc 统计的语法树占用内存 (Token 由两者共享，不计入)
+#   - 遍历：按类别统计全部节点 (对象语法树用显式栈遍历，扁平语法树直接扫描 kinds 数组)、
+#           语义分析、中间代码生成 (扁平语法树经游标访问)
+# 两种表示上的语义分析结果与四元式相同。
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from collections import Counter
+
+# 添加项目根目录到模块搜索路径
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from flat_ast import NODE_CLASSES, child_nodes
+from ir_generator import IRGenerator
+from lexer import Lexer, TokenStream
+from parallel_compiler import myparser
+from parse_profiler import pad
+from program_generator import ProgramGenerator
+from semantic_analyzer import SemanticAnalyzer
+
+
+def parse_objects(tokens):
+    return myparser.Parser(TokenStream(tokens)).parse_program()
+
+
+def parse_flat(tokens):
+    builder = myparser.FlatASTBuilder()
+    myparser.Parser(TokenStream(tokens), actions=builder).parse_program()
+    return builder.ast
+
+
+def count_objects(root):
+    """对象语法树：显式栈遍历全部节点，按节点类计数"""
+    counts = Counter()
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        counts[type(node)] += 1
+        stack.extend(child_nodes(node))
+    return counts
+
+
+def count_flat(ast):
+    """扁平语法树：直接统计类别码数组"""
+    return Counter({NODE_CLASSES[code]: n for code, n in Counter(ast.kinds).items()})
+
+
+def analyze(root):
+    return [error.message for error in SemanticAnalyzer().analyze(root)]
+
+
+def generate(root):
+    return [repr(quad) for quad in IRGenerator().generate(root)]
+
+
+def measure(func, value, rounds):
+    """返回 (结果, 最快一轮耗时秒数)"""
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = func(value)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return result, best
+
+
+def traced(func):
+    """返回 (结果, func 执行后仍被占用的内存字节数)"""
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    result = func()
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, current - baseline
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="扁平语法树对比测试")
+    arg_parser.add_argument("--functions", default="100,400", help="函数个数列表")
+    arg_parser.add_argument(
+        "--statements", type=int, default=20, help="每个函数的语句数"
+    )
+    arg_parser.add_argument("--expr-depth", type=int, default=3, help="表达式最大深度")
+    arg_parser.add_argument("--rounds", type=int, default=3, help="每项测量轮数")
+    args = arg_parser.parse_args()
+
+    for functions in (int(n) for n in args.functions.split(",")):
+        text = ProgramGenerator(functions, args.statements, args.expr_depth).generate()
+        tokens = Lexer(text).tokenize()
+        objects, object_memory = traced(lambda: parse_objects(tokens))
+        flat, flat_memory = traced(lambda: parse_flat(tokens))
+        root = flat.node(flat.root)
+        print(f"\n{functions} 个函数: {len(tokens)} tokens, {len(flat)} 个语法树节点")
+        print(
+            f"  内存  对象语法树 {object_memory / 1024:10.1f} KB, "
+            f"扁平语法树 {flat_memory / 1024:10.1f} KB "
+            f"(其中数组 {flat.memory_size() / 1024:.1f} KB), "
+            f"节省 {(object_memory - flat_memory) / object_memory:.1%}"
+        )
+        print(
+            "  "
+            + pad("(ms)", 10, left=True)
+            + pad("对象语法树", 14)
+            + pad("扁平语法树", 14)
+            + pad("比值", 10)
+        )
+        cases = [
+            ("语法分析", parse_objects, tokens, parse_flat, tokens),
+            ("节点计数", count_objects, objects, count_flat, flat),
+            ("语义分析", analyze, objects, analyze, root),
+            ("中间代码", generate, objects, generate, root),
+        ]
+        for name, object_func, object_input, flat_func, flat_input in cases:
+            expected, object_time = measure(object_func, object_input, args.rounds)
+            result, flat_time = measure(flat_func, flat_input, args.rounds)
+            if name != "语法分析":
+                assert result == expected, f"{name}: 两种语法树的结果不同"
+            print(
+                "  " + pad(name, 10, left=True) + f"{object_time * 1000:>14.1f}"
+                f"{flat_time * 1000:>14.1f}{flat_time / object_time:>9.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
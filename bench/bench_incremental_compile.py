@@ -0,0 +1,117 @@
+"""
+Description  : 按函数增量编译的编辑响应时间测试 (只修改一个函数体后重新编译)
+Author       : Hyoung
+Date         : 2026-10-17 16:58:40
+LastEditTime : 2026-10-17 16:58:40
+FilePath     : \\课程设计\\rust-like-compiler\\bench\\bench_incremental_compile.py
+"""
+
+# 用法: python bench/bench_incremental_compile.py [--functions 100,1000,4000] [--edits N]
+#
+# 每次编辑在随机选取的函数体中插入一条语句，先增量重扫描 Token，再分别用完整编译
+# (parse_program + analyze + generate) 和 IncrementalCompiler 得到结果并比较。
+# 增量编译的耗时应主要取决于被修改的函数，而不是文件中的函数个数。
+
+import argparse
+import os
+import random
+import sys
+import time
+
+# 添加项目根目录到模块搜索路径
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from bench_parallel_compile import synthesize
+from incremental_compiler import IncrementalCompiler
+from ir_generator import IRGenerator
+from lexer import Lexer, TokenStream, diff_edit, relex
+from parallel_compiler import myparser
+from semantic_analyzer import SemanticAnalyzer
+from source_map import SourceMap
+
+
+def compile_full(tokens, source_map):
+    """每次都完整执行语法分析、语义分析与中间代码生成"""
+    ast = myparser.Parser(TokenStream(tokens)).parse_program()
+    errors = SemanticAnalyzer().analyze(ast, source_map)
+    quads = IRGenerator().generate(ast)
+    return errors, quads
+
+
+def compile_incremental(compiler, tokens, text, source_map):
+    """只重新编译 Token 切片发生变化的函数"""
+    compiler.parse(tokens, text)
+    errors = compiler.analyze(source_map)
+    quads = compiler.generate()
+    return errors, quads
+
+
+def key(result):
+    """用于比较两种编译方式结果的语义错误与四元式"""
+    errors, quads = result
+    return (
+        [(e.error_type, e.message, e.line, e.col) for e in errors],
+        [tuple(str(item) for item in quad) for quad in quads],
+    )
+
+
+def edit(rng, text):
+    """在随机一个函数的 `let mut s` 语句之后插入一条语句"""
+    anchors = []
+    position = text.find("let mut s: i32 = 0;")
+    while position != -1:
+        anchors.append(position)
+        position = text.find("let mut s: i32 = 0;", position + 1)
+    position = rng.choice(anchors) + len("let mut s: i32 = 0;")
+    statement = f"\n    s = s + {rng.randrange(100)};"
+    return text[:position] + statement + text[position:]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="按函数增量编译的编辑响应时间测试")
+    arg_parser.add_argument(
+        "--functions", default="100,1000,4000", help="函数个数列表 (逗号分隔)"
+    )
+    arg_parser.add_argument("--edits", type=int, default=5, help="每种规模的编辑次数")
+    args = arg_parser.parse_args()
+
+    for count in (int(n) for n in args.functions.split(",")):
+        rng = random.Random(count)
+        text = synthesize(count)
+        tokens = Lexer(text).tokenize()
+        compiler = IncrementalCompiler()
+        compile_incremental(compiler, tokens, text, SourceMap(text))
+
+        full_total = incremental_total = 0.0
+        for _ in range(args.edits):
+            new_text = edit(rng, text)
+            tokens = relex(tokens, new_text, *diff_edit(text, new_text)).apply(tokens)
+            text = new_text
+            source_map = SourceMap(text)
+
+            start = time.perf_counter()
+            expected = compile_full(tokens, source_map)
+            full_total += time.perf_counter() - start
+
+            start = time.perf_counter()
+            result = compile_incremental(compiler, tokens, text, source_map)
+            incremental_total += time.perf_counter() - start
+
+            if key(result) != key(expected):
+                print(f"{count} 个函数: 增量编译结果与完整编译不一致")
+                sys.exit(1)
+
+        full = full_total / args.edits
+        incremental = incremental_total / args.edits
+        print(
+            f"{count:>6} 个函数, {len(tokens):>7} tokens: "
+            f"完整编译 {full * 1000:8.1f} ms, 增量编译 {incremental * 1000:8.1f} ms, "
+            f"加速比 {full / incremental:6.1f}x "
+            f"(复用 {compiler.hits} / 重新解析 {compiler.misses} 个函数)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Description  : 关键字与运算符判定方式的微基准测试 (每个标识符/运算符的耗时)
+Author       : Hyoung
+Date         : 2026-10-17 13:40:51
+LastEditTime : 2026-10-17 13:40:51
+FilePath     : \\课程设计\\rust-like-compiler\\bench\\bench_keyword_dispatch.py
+"""
+
+# 用法: python bench/bench_keyword_dispatch.py [--size KiB] [--repeat N]
+
+import argparse
+import os
+import sys
+import time
+
+# 添加项目根目录到模块搜索路径
+bench_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(bench_dir)
+for path in (root_dir, bench_dir):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from bench_lexer_suite import synthesize
+from lexer import (
+    KEYWORD_SET,
+    KEYWORDS,
+    PUNCTUATOR_DISPATCH,
+    PUNCTUATOR_TYPES,
+    PUNCTUATORS,
+    TT_IDENTIFIER,
+    TT_KEYWORD,
+    Lexer,
+)
+
+
+def classify_by_list(words):
+    """改造前：在关键字列表中线性查找"""
+    count = 0
+    for word in words:
+        if word in KEYWORDS:
+            count += 1
+    return count
+
+
+def classify_by_set(words):
+    """改造后：在关键字哈希集合中查找"""
+    count = 0
+    for word in words:
+        if word in KEYWORD_SET:
+            count += 1
+    return count
+
+
+def match_by_chain(text, pos):
+    """改造前：按运算符表顺序逐个比较 (与原 if 链的比较次数相同)"""
+    for lexeme, token_type in PUNCTUATORS:
+        if text.startswith(lexeme, pos):
+            return token_type
+    return None
+
+
+def match_by_dispatch(text, pos):
+    """改造后：按首字符查表，只比较以该字符开头的候选项"""
+    candidates = PUNCTUATOR_DISPATCH.get(text[pos])
+    if candidates is not None:
+        for lexeme, token_type in candidates:
+            if len(lexeme) == 1 or text.startswith(lexeme, pos):
+                return token_type
+    return None
+
+
+def per_item_ns(func, items, repeat):
+    """返回 func(items) 最快一轮中每项的纳秒数"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(items)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best / len(items) * 1e9
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="关键字与运算符判定微基准")
+    arg_parser.add_argument("--size", type=int, default=256, help="输入大小 (KiB)")
+    arg_parser.add_argument("--repeat", type=int, default=5, help="测量轮数")
+    args = arg_parser.parse_args()
+
+    text = synthesize("ident", args.size * 1024)
+    tokens = Lexer(text).tokenize()
+    words = [t.value for t in tokens if t.type in (TT_IDENTIFIER, TT_KEYWORD)]
+    positions = [
+        t.offset
+        for t in tokens
+        if isinstance(t.value, str) and t.value in PUNCTUATOR_TYPES
+    ]
+    print(
+        f"输入: {len(text) / 1024:.0f} KiB, {len(words)} 个标识符/关键字, "
+        f"{len(positions)} 个运算符/分隔符"
+    )
+
+    list_ns = per_item_ns(classify_by_list, words, args.repeat)
+    set_ns = per_item_ns(classify_by_set, words, args.repeat)
+    print("\n关键字判定 (每个标识符)")
+    print(f"  列表线性查找: {list_ns:6.1f} ns")
+    print(f"  哈希集合:     {set_ns:6.1f} ns ({list_ns / set_ns:.2f}x)")
+
+    chain_ns = per_item_ns(
+        lambda items: [match_by_chain(text, pos) for pos in items],
+        positions,
+        args.repeat,
+    )
+    dispatch_ns = per_item_ns(
+        lambda items: [match_by_dispatch(text, pos) for pos in items],
+        positions,
+        args.repeat,
+    )
+    print("\n运算符判定 (每个运算符/分隔符)")
+    print(f"  顺序比较:     {chain_ns:6.1f} ns")
+    print(f"  首字符分派:   {dispatch_ns:6.1f} ns ({chain_ns / dispatch_ns:.2f}x)")
+
+    start = time.perf_counter()
+    count = len(Lexer(text).tokenize())
+    elapsed = time.perf_counter() - start
+    print(f"\n逐字符词法分析器整体: {count / elapsed:,.0f} tokens/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Description  : 词法分析引擎一致性检查与吞吐量测试
+Author       : Hyoung
+Date         : 2026-10-17 10:12:40
+LastEditTime : 2026-10-17 10:12:40
+FilePath     : \\课程设计\\rust-like-compiler\\bench\\bench_lexer_engines.py
+"""
+
+# 用法: python bench/bench_lexer_engines.py [--repeat N] [--rounds N]
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+# 添加项目根目录到模块搜索路径
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from lexer import LEXER_ENGINES
+
+
+def lex_all(engine, text):
+    """返回 (Token 四元组列表, 错误信息)，用于引擎间逐项比较"""
+    try:
+        tokens = LEXER_ENGINES[engine](text).tokenize()
+    except Exception as e:
+        return None, str(e)
+    return [(t.type, t.value, t.line, t.column) for t in tokens], None
+
+
+def check_equivalence(files):
+    """对 test/*.rs 逐个比较所有引擎的输出，返回不一致的文件列表"""
+    mismatched = []
+    for path in files:
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        expected = lex_all("char", text)
+        for engine in LEXER_ENGINES:
+            if lex_all(engine, text) != expected:
+                mismatched.append((os.path.basename(path), engine))
+    return mismatched
+
+
+def build_corpus(files, repeat):
+    """拼接所有可正常词法分析的测试文件，并重复 repeat 次"""
+    parts = []
+    for path in files:
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        if lex_all("char", text)[1] is None:
+            parts.append(text)
+    return "\n".join(parts * repeat)
+
+
+def measure(engine, text, rounds):
+    """返回 (Token 数, 最快一轮耗时秒数)"""
+    best = None
+    count = 0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        count = len(LEXER_ENGINES[engine](text).tokenize())
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return count, best
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="词法分析引擎对比")
+    arg_parser.add_argument("--repeat", type=int, default=200, help="语料重复次数")
+    arg_parser.add_argument("--rounds", type=int, default=3, help="每个引擎测量轮数")
+    args = arg_parser.parse_args()
+
+    files = sorted(glob.glob(os.path.join(root_dir, "test", "*.rs")))
+
+    mismatched = check_equivalence(files)
+    if mismatched:
+        for name, engine in mismatched:
+            print(f"不一致: {name} ({engine})")
+        sys.exit(1)
+    print(f"一致性检查通过: {len(files)} 个文件, 引擎 {', '.join(LEXER_ENGINES)}")
+
+    text = build_corpus(files, args.repeat)
+    print(f"语料大小: {len(text) / 1024:.1f} KiB")
+    baseline = None
+    for engine in LEXER_ENGINES:
+        count, elapsed = measure(engine, text, args.rounds)
+        rate = count / elapsed
+        if baseline is None:
+            baseline = rate
+        print(
+            f"{engine:>8}: {count} tokens, {elapsed * 1000:.1f} ms, "
+            f"{rate:,.0f} tokens/s ({rate / baseline:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""
+Description  : 词法分析器基准测试套件：合成不同形态的输入，测量吞吐量与内存峰值
+Author       : Hyoung
+Date         : 2026-10-17 13:02:37
+LastEditTime : 2026-10-17 13:02:37
+FilePath     : \\课程设计\\rust-like-compiler\\bench\\bench_lexer_suite.py
+"""
+
+# 用法: python bench/bench_lexer_suite.py [--size KiB] [--shapes ident,number,...]
+#       [--engines char,regex] [--rounds N] [--output 结果.json] [--compare 基线.json]
+#
+# 结果以 JSON 保存 (默认 bench/results/lexer-<时间>.json)，--compare 与之前的
+# 结果逐项比较，吞吐量下降超过 --threshold 时以非零状态退出。
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+# 添加项目根目录到模块搜索路径
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from lexer import KEYWORDS, LEXER_ENGINES
+
+WORDS = [
+    "alpha",
+    "beta",
+    "count",
+    "delta",
+    "index",
+    "total",
+    "value",
+    "result",
+    "buffer",
+    "offset",
+    "matrix",
+    "node",
+]
+OPERATORS = ["+", "-", "*", "/", "%", "==", "!=", "<=", ">=", "<", ">"]
+
+
+def make_identifier(rng):
+    """形如 value_count12 的标识符"""
+    name = rng.choice(WORDS)
+    if rng.random() < 0.6:
+        name += "_" + rng.choice(WORDS)
+    if rng.random() < 0.5:
+        name += str(rng.randrange(100))
+    return name
+
+
+def ident_line(rng):
+    """标识符密集：声明、赋值与调用，夹杂关键字"""
+    kind = rng.randrange(3)
+    if kind == 0:
+        return (
+            f"let mut {make_identifier(rng)}: i32 = "
+            f"{make_identifier(rng)} {rng.choice(OPERATORS)} {make_identifier(rng)};"
+        )
+    if kind == 1:
+        args = ", ".join(make_identifier(rng) for _ in range(rng.randrange(1, 4)))
+        return f"{make_identifier(rng)} = {make_identifier(rng)}({args});"
+    return (
+        f"{rng.choice(['if', 'while'])} {make_identifier(rng)} "
+        f"{rng.choice(OPERATORS)} {make_identifier(rng)} {{ {rng.choice(KEYWORDS)} }}"
+    )
+
+
+def number_line(rng):
+    """数字密集：数组字面量与算术表达式"""
+    if rng.random() < 0.5:
+        items = ", ".join(str(rng.randrange(10**6)) for _ in range(8))
+        return f"let a: [i32; 8] = [{items}];"
+    terms = [str(rng.randrange(10**9)) for _ in range(6)]
+    expr = terms[0]
+    for term in terms[1:]:
+        expr += f" {rng.choice(OPERATORS[:5])} {term}"
+    return f"x = {expr};"
+
+
+def comment_line(rng):
+    """注释密集：行注释、块注释，少量代码"""
+    words = " ".join(rng.choice(WORDS) for _ in range(rng.randrange(4, 12)))
+    kind = rng.randrange(3)
+    if kind == 0:
+        return f"// {words}"
+    if kind == 1:
+        return f"/* {words}\n   {words} */"
+    return f"{make_identifier(rng)} = 1; // {words}"
+
+
+def string_line(rng):
+    """字符串密集：带转义序列的字符串字面量"""
+    parts = []
+    for _ in range(rng.randrange(3, 8)):
+        parts.append(rng.choice(WORDS))
+        if rng.random() < 0.3:
+            parts.append(rng.choice(["\\n", "\\t", '\\"', "\\\\"]))
+    return f'let s = "{" ".join(parts)}";'
+
+
+SHAPES = {
+    "ident": ident_line,
+    "number": number_line,
+    "comment": comment_line,
+    "string": string_line,
+}
+
+
+def synthesize(shape, size, seed=0):
+    """生成约 size 字节 (UTF-8) 的指定形态源代码，相同参数结果相同"""
+    rng = random.Random(f"{shape}:{seed}")
+    make_line = SHAPES[shape]
+    lines = ["fn main() {"]
+    total = len(lines[0]) + 1
+    while total < size:
+        line = "    " + make_line(rng)
+        lines.append(line)
+        total += len(line) + 1
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def measure_speed(engine, text, rounds):
+    """返回 (Token 数, 最快一轮耗时秒数)"""
+    lexer_class = LEXER_ENGINES[engine]
+    best = None
+    count = 0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        count = len(lexer_class(text).tokenize())
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return count, best
+
+
+def measure_peak(engine, text):
+    """词法分析 (含保存完整 Token 列表) 期间的内存分配峰值字节数"""
+    lexer_class = LEXER_ENGINES[engine]
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    tokens = lexer_class(text).tokenize()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del tokens
+    return peak - baseline
+
+
+def run_suite(shapes, engines, size, rounds, seed):
+    results = []
+    for shape in shapes:
+        text = synthesize(shape, size, seed)
+        size_bytes = len(text.encode("utf-8"))
+        for engine in engines:
+            count, elapsed = measure_speed(engine, text, rounds)
+            peak = measure_peak(engine, text)
+            result = {
+                "shape": shape,
+                "engine": engine,
+                "bytes": size_bytes,
+                "tokens": count,
+                "seconds": elapsed,
+                "tokens_per_sec": count / elapsed,
+                "mb_per_sec": size_bytes / elapsed / 1e6,
+                "peak_bytes": peak,
+            }
+            results.append(result)
+            print(
+                f"{shape:>8} {engine:>6}: {count:>8} tokens, "
+                f"{result['tokens_per_sec']:>12,.0f} tokens/s, "
+                f"{result['mb_per_sec']:6.2f} MB/s, "
+                f"峰值 {peak / 1048576:7.2f} MiB"
+            )
+    return results
+
+
+def compare(results, baseline_path, threshold):
+    """与基线结果比较，返回吞吐量下降超过 threshold 的项数"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    previous = {(r["shape"], r["engine"]): r for r in baseline["results"]}
+    regressions = 0
+    print(f"\n与基线比较: {baseline_path}")
+    for result in results:
+        old = previous.get((result["shape"], result["engine"]))
+        if old is None:
+            continue
+        speed = result["tokens_per_sec"] / old["tokens_per_sec"] - 1
+        memory = result["peak_bytes"] / max(old["peak_bytes"], 1) - 1
+        flag = ""
+        if speed < -threshold:
+            flag = "  <- 吞吐量下降"
+            regressions += 1
+        print(
+            f"{result['shape']:>8} {result['engine']:>6}: "
+            f"吞吐量 {speed:+7.1%}, 内存峰值 {memory:+7.1%}{flag}"
+        )
+    return regressions
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="词法分析器基准测试套件")
+    arg_parser.add_argument(
+        "--size", type=int, default=512, help="每种输入的大小 (KiB)"
+    )
+    arg_parser.add_argument(
+        "--shapes", default=",".join(SHAPES), help="输入形态 (逗号分隔)"
+    )
+    arg_parser.add_argument(
+        "--engines", default=",".join(LEXER_ENGINES), help="扫描引擎 (逗号分隔)"
+    )
+    arg_parser.add_argument("--rounds", type=int, default=3, help="每项测量轮数")
+    arg_parser.add_argument("--seed", type=int, default=0, help="输入生成的随机种子")
+    arg_parser.add_argument("--output", help="结果 JSON 文件路径")
+    arg_parser.add_argument("--compare", help="用于比较的基线结果 JSON 文件")
+    arg_parser.add_argument(
+        "--threshold", type=float, default=0.1, help="判定为回退的吞吐量下降比例"
+    )
+    args = arg_parser.parse_args()
+
+    shapes = args.shapes.split(",")
+    engines = args.engines.split(",")
+    for name in shapes:
+        if name not in SHAPES:
+            arg_parser.error(f"未知的输入形态: {name}")
+    for name in engines:
+        if name not in LEXER_ENGINES:
+            arg_parser.error(f"未知的扫描引擎: {name}")
+
+    results = run_suite(shapes, engines, args.size * 1024, args.rounds, args.seed)
+
+    output = args.output
+    if output is None:
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        output = os.path.join(root_dir, "bench", "results", f"lexer-{stamp}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    report = {
+        "benchmark": "lexer",
+        "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "size": args.size * 1024,
+        "seed": args.seed,
+        "rounds": args.rounds,
+        "results": results,
+    }
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n结果已保存到 {output}")
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Description  : 表驱动 LL(1) 分析器与手写递归下降分析器的一致性检查与语法分析速度对比
+Author       : Hyoung
+Date         : 2026-10-17 18:52:09
+LastEditTime : 2026-10-17 18:52:09
+FilePath     : \\课程设计\\rust-like-compiler\\bench\\bench_ll1_parser.py
+"""
+
+# 用法: python bench/bench_ll1_parser.py [--repeat N] [--rounds N] [--functions N]
+#
+# 先逐个比较 test/*.rs 上两种分析器的结果：语法树相同、都报错，或只有一方接受
+# (grammar.txt 与手写分析器实现的语言不一致之处)。再在两者都接受的文件
+# 以及合成的大程序上比较语法分析耗时 (Token 预先切分好，不计词法分析)。
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+# 添加项目根目录到模块搜索路径
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from bench_parallel_compile import synthesize
+from lexer import Lexer, TokenStream
+from ll1_parser import LL1Parser
+from main import format_ast
+from parallel_compiler import myparser
+
+PARSERS = {"递归下降": myparser.Parser, "LL(1) 表驱动": LL1Parser}
+
+
+def parse_with(parser_class, tokens):
+    """返回 (AST 文本, 语法错误信息)"""
+    try:
+        ast = parser_class(TokenStream(tokens)).parse_program()
+    except myparser.ParseError as e:
+        return None, str(e)
+    return format_ast(ast), None
+
+
+def check_corpus(files):
+    """返回 (两者都接受的文件的 Token 列表, 各类结果的文件名列表)"""
+    accepted = []
+    outcomes = {"相同": [], "都报错": [], "只有递归下降接受": [], "只有 LL(1) 接受": []}
+    outcomes["语法树不同"] = []
+    for path in files:
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        try:
+            tokens = Lexer(text).tokenize()
+        except Exception:
+            continue
+        (hand, hand_error), (table, table_error) = (
+            parse_with(parser_class, tokens) for parser_class in PARSERS.values()
+        )
+        name = os.path.basename(path)
+        if hand_error and table_error:
+            outcomes["都报错"].append(name)
+        elif hand_error:
+            outcomes["只有 LL(1) 接受"].append(name)
+        elif table_error:
+            outcomes["只有递归下降接受"].append(f"{name}: {table_error}")
+        elif hand != table:
+            outcomes["语法树不同"].append(name)
+        else:
+            outcomes["相同"].append(name)
+            accepted.append(tokens)
+    return accepted, outcomes
+
+
+def measure(parser_class, inputs, rounds):
+    """依次分析 inputs 中的每个 Token 列表，返回最快一轮耗时秒数"""
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for tokens in inputs:
+            parser_class(TokenStream(tokens)).parse_program()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def report(title, inputs, rounds):
+    count = sum(len(tokens) for tokens in inputs)
+    print(f"\n{title}: {count} tokens")
+    baseline = None
+    for name, parser_class in PARSERS.items():
+        elapsed = measure(parser_class, inputs, rounds)
+        baseline = baseline or elapsed
+        print(
+            f"  {name:<12} {elapsed * 1000:8.1f} ms, {count / elapsed:>11,.0f} tokens/s, "
+            f"相对耗时 {elapsed / baseline:.2f}x"
+        )
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="LL(1) 表驱动分析器对比测试")
+    arg_parser.add_argument("--repeat", type=int, default=20, help="测试集重复次数")
+    arg_parser.add_argument("--rounds", type=int, default=5, help="每项测量轮数")
+    arg_parser.add_argument(
+        "--functions", type=int, default=2000, help="合成程序的函数个数"
+    )
+    args = arg_parser.parse_args()
+
+    files = sorted(glob.glob(os.path.join(root_dir, "test", "*.rs")))
+    accepted, outcomes = check_corpus(files)
+    print(f"test/*.rs 共 {len(files)} 个文件:")
+    for outcome, names in outcomes.items():
+        print(f"  {outcome}: {len(names)}")
+        if outcome not in ("相同", "都报错"):
+            for name in names:
+                print(f"    {name}")
+    if outcomes["语法树不同"]:
+        sys.exit(1)
+
+    report(
+        f"两者都接受的 {len(accepted)} 个文件 x {args.repeat}",
+        accepted * args.repeat,
+        args.rounds,
+    )
+    tokens = Lexer(synthesize(args.functions)).tokenize()
+    report(f"合成程序 ({args.functions} 个函数)", [tokens], args.rounds)
+
+
+if __name__ == "__main__":
+    main()
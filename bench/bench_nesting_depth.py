@@ -0,0 +1,105 @@
+"""
+Description  : 深层嵌套输入的编译耗时测试 (语法分析、语义分析、中间代码生成随嵌套深度的变化)
+Author       : Hyoung
+Date         : 2026-10-17 14:52:36
+LastEditTime : 2026-10-17 14:52:36
+FilePath     : \\课程设计\\rust-like-compiler\\bench\\bench_nesting_depth.py
+"""
+
+# 用法: python bench/bench_nesting_depth.py [--depths 5000,10000,20000,40000] [--shapes parens,while,...]
+#
+# 每种形态在各个深度下的每层耗时应基本不变 (线性)；深度远超 Python 默认递归上限 (1000)
+# 时也不应出现 RecursionError。
+
+import argparse
+import importlib.util
+import os
+import sys
+import time
+
+# 添加项目根目录到模块搜索路径
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from ir_generator import IRGenerator
+from lexer import Lexer
+from semantic_analyzer import SemanticAnalyzer
+
+# 避免与标准库 parser 模块冲突
+spec = importlib.util.spec_from_file_location(
+    "myparser", os.path.join(root_dir, "parser.py")
+)
+myparser = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(myparser)
+
+
+def make_source(shape, depth):
+    """生成嵌套深度为 depth 的源代码"""
+    if shape == "parens":
+        # 括号嵌套: ((((a))))
+        expr = "(" * depth + "a" + ")" * depth
+        return f"fn main() {{ let a: i32 = 1; let x: i32 = {expr}; }}"
+    if shape == "right":
+        # 右结合嵌套的二元运算: a + (a + (a + ...))
+        expr = "a + (" * depth + "a" + ")" * depth
+        return f"fn main() {{ let a: i32 = 1; let x: i32 = {expr}; }}"
+    if shape == "left":
+        # 长运算符链 (左深语法树): a + a + a + ...
+        expr = " + ".join(["a"] * depth)
+        return f"fn main() {{ let a: i32 = 1; let x: i32 = {expr}; }}"
+    if shape == "while":
+        # 循环语句嵌套
+        body = "while a < 2 { " * depth + "a = a + 1;" + " }" * depth
+        return f"fn main() {{ let mut a: i32 = 1; {body} }}"
+    if shape == "block":
+        # 函数表达式块嵌套
+        body = "{ " * depth + "return 1;" + " };" * (depth - 1) + " }"
+        return f"fn f() -> i32 {body} fn main() {{ }}"
+    raise ValueError(shape)
+
+
+SHAPES = ["parens", "right", "left", "while", "block"]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="深层嵌套输入的编译耗时测试")
+    arg_parser.add_argument(
+        "--depths", default="5000,10000,20000,40000", help="嵌套深度列表 (逗号分隔)"
+    )
+    arg_parser.add_argument(
+        "--shapes", default=",".join(SHAPES), help="输入形态 (逗号分隔)"
+    )
+    args = arg_parser.parse_args()
+
+    shapes = args.shapes.split(",")
+    for name in shapes:
+        if name not in SHAPES:
+            arg_parser.error(f"未知的输入形态: {name}")
+
+    print(f"Python 递归上限: {sys.getrecursionlimit()}")
+    for shape in shapes:
+        print(f"\n{shape}")
+        for depth in (int(d) for d in args.depths.split(",")):
+            text = make_source(shape, depth)
+            tokens = Lexer(text).tokenize()
+
+            start = time.perf_counter()
+            ast = myparser.Parser(myparser.TokenStream(iter(tokens))).parse_program()
+            parsed = time.perf_counter()
+            SemanticAnalyzer().analyze(ast)
+            analyzed = time.perf_counter()
+            quads = IRGenerator().generate(ast)
+            generated = time.perf_counter()
+
+            total = generated - start
+            print(
+                f"  深度 {depth:>6}: 语法 {(parsed - start) * 1000:7.0f} ms, "
+                f"语义 {(analyzed - parsed) * 1000:7.0f} ms, "
+                f"中间代码 {(generated - analyzed) * 1000:7.0f} ms "
+                f"({len(quads)} 条), 每层 {total / depth * 1e6:6.1f} us"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Description  : 语法分析在有无记忆化 (packrat) 时的耗时、回溯次数与命中率
+Author       : Hyoung
+Date         : 2026-10-17 20:41:37
+LastEditTime : 2026-10-17 20:41:37
+FilePath     : \\课程设计\\rust-like-compiler\\bench\\bench_packrat.py
+"""
+
+# 用法: python bench/bench_packrat.py [--depths 50,100,200,400] [--functions 2000]
+#
+# Parser(memo=True) 以 (规则, Token 位置) 记忆语句与表达式的结果，推测分析 (mark/backtrack)
+# 回溯后每段 Token 只分析一次。目前的文法不需要回溯，记忆化只有记录 Token 与结果的开销，
+# 此处测量这一开销：嵌套的选择表达式 (作为 let 的初始值) 与合成程序。
+# 每种输入先检查两种方式得到的语法树相同。
+
+import argparse
+import os
+import sys
+import time
+
+# 添加项目根目录到模块搜索路径
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from bench_parallel_compile import synthesize
+from lexer import Lexer, TokenStream
+from main import format_ast
+from parallel_compiler import myparser
+
+
+def nested_if_expr(depth):
+    """let 的初始值为嵌套 depth 层的选择表达式的函数"""
+    opening = "let v: i32 = if a > 0 { a = a - 1; " * depth
+    closing = " } else { a = a + 1; };" * depth
+    return f"fn f(mut a: i32) -> i32 {{ {opening}{closing} return a; }}\n"
+
+
+def if_expr_functions(count):
+    """count 个函数，各以选择表达式作为 let 的初始值"""
+    return "".join(
+        f"fn f{i}(mut a: i32, b: i32) -> i32 {{\n"
+        f"    let mut s: i32 = a * {i % 7} + b;\n"
+        f"    let t: i32 = if s > b {{ s = s - b; }} else {{ s = s + {i % 5}; }};\n"
+        "    return s;\n"
+        "}\n\n"
+        for i in range(count)
+    )
+
+
+def measure(tokens, memo, rounds):
+    """返回 (最快一轮耗时秒数, 语法树文本, 最后一轮的 Parser)"""
+    best = None
+    for _ in range(rounds):
+        parser = myparser.Parser(TokenStream(tokens), memo=memo)
+        start = time.perf_counter()
+        ast = parser.parse_program()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best, format_ast(ast), parser
+
+
+def report(title, text, rounds):
+    tokens = Lexer(text).tokenize()
+    plain, plain_ast, plain_parser = measure(tokens, False, rounds)
+    memo, memo_ast, memo_parser = measure(tokens, True, rounds)
+    if plain_ast != memo_ast:
+        print(f"{title}: 记忆化前后的语法树不一致")
+        sys.exit(1)
+    lookups = memo_parser.memo_hits + memo_parser.memo_misses
+    print(
+        f"{title:<22} {len(tokens):>7} tokens, 回溯 {plain_parser.backtracks:>5} 次: "
+        f"不记忆化 {plain * 1000:8.1f} ms, 记忆化 {memo * 1000:8.1f} ms "
+        f"({plain / memo:5.2f}x), 命中率 {memo_parser.memo_hits / lookups:6.1%} "
+        f"({memo_parser.memo_hits}/{lookups})"
+    )
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="语法分析记忆化 (packrat) 测试")
+    arg_parser.add_argument(
+        "--depths", default="50,100,200,400", help="选择表达式嵌套深度列表 (逗号分隔)"
+    )
+    arg_parser.add_argument(
+        "--functions", type=int, default=2000, help="合成程序的函数个数"
+    )
+    arg_parser.add_argument("--rounds", type=int, default=3, help="每项测量轮数")
+    args = arg_parser.parse_args()
+
+    for depth in (int(n) for n in args.depths.split(",")):
+        report(f"嵌套选择表达式 {depth} 层", nested_if_expr(depth), args.rounds)
+    report(
+        f"选择表达式初始值 {args.functions} 函数",
+        if_expr_functions(args.functions),
+        args.rounds,
+    )
+    report(f"无回溯 {args.functions} 函数", synthesize(args.functions), args.rounds)
+
+
+if __name__ == "__main__":
+    main()
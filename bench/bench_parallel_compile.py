@@ -0,0 +1,162 @@
+"""
+Description  : 按函数并行编译的扩展性测试 (进程数 x 函数个数)
+Author       : Hyoung
+Date         : 2026-10-17 15:48:12
+LastEditTime : 2026-10-17 15:48:12
+FilePath     : \\课程设计\\rust-like-compiler\\bench\\bench_parallel_compile.py
+"""
+
+# 用法: python bench/bench_parallel_compile.py [--workers N] [--functions 1000,4000] [--chain N] [--rounds N]
+#
+# 除合成程序外，还编译一个含 N 个操作数的 a + a + ... 链的程序：语法树嵌套很深，
+# 工作进程以 FlatAST 回传语法树，不受 pickle 递归深度的限制。
+
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# 添加项目根目录到模块搜索路径
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from ir_generator import IRGenerator
+from lexer import TokenBuffer, TokenStream, create_lexer
+from parallel_compiler import compile_parallel, myparser
+from semantic_analyzer import SemanticAnalyzer
+
+
+def make_function(rng, index):
+    """一个带循环、分支和对前面函数调用的函数"""
+    lines = [f"fn f{index}(mut a: i32, b: i32) -> i32 {{"]
+    lines.append("    let mut s: i32 = 0;")
+    for _ in range(rng.randrange(2, 6)):
+        kind = rng.randrange(3)
+        if kind == 0:
+            lines.append(
+                f"    s = s + a * {rng.randrange(1, 9)} - b / {rng.randrange(1, 9)};"
+            )
+        elif kind == 1:
+            lines.append(
+                f"    while a < {rng.randrange(10, 99)} {{ a = a + 1; s = s + a; }}"
+            )
+        else:
+            lines.append(
+                f"    if s > b {{ s = s - b; }} else {{ s = s + {rng.randrange(9)}; }}"
+            )
+    if index:
+        lines.append(f"    s = s + f{rng.randrange(index)}(a, s);")
+    lines.append("    return s;")
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def synthesize(functions, seed=0):
+    """生成包含 functions 个函数 (最后是 main) 的程序，相同参数结果相同"""
+    rng = random.Random(seed)
+    parts = [make_function(rng, index) for index in range(functions)]
+    parts.append("fn main() {\n    let x: i32 = f0(1, 2);\n}")
+    return "\n\n".join(parts) + "\n"
+
+
+def deep_chain(operands):
+    """let 的初始值为 operands 个操作数的加法链，语法树嵌套深度与操作数个数相同"""
+    chain = " + ".join(["a"] * operands)
+    return (
+        f"fn f(a: i32) -> i32 {{\n    let b: i32 = {chain};\n    return b;\n}}\n\n"
+        "fn main() {\n    let x: i32 = f(1);\n}\n"
+    )
+
+
+def compile_serial(tokens):
+    """顺序执行语法分析、类型检查与中间代码生成"""
+    ast = myparser.Parser(TokenStream(tokens.iter_tokens())).parse_program()
+    errors = SemanticAnalyzer().analyze(ast)
+    quads = IRGenerator().generate(ast)
+    return ast, errors, quads
+
+
+def best_of(rounds, func):
+    """返回 (结果, 最快一轮耗时秒数)"""
+    best = None
+    result = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return result, best
+
+
+def key(result):
+    """用于比较并行与顺序编译结果的语义错误与四元式"""
+    _, errors, quads = result
+    return (
+        [(e.error_type, e.message, e.line, e.col) for e in errors],
+        [tuple(str(item) for item in quad) for quad in quads],
+    )
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="按函数并行编译扩展性测试")
+    arg_parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1, help="最大进程数"
+    )
+    arg_parser.add_argument(
+        "--functions", default="1000,4000", help="函数个数列表 (逗号分隔)"
+    )
+    arg_parser.add_argument(
+        "--chain", type=int, default=3000, help="加法链的操作数个数"
+    )
+    arg_parser.add_argument("--rounds", type=int, default=3, help="每项测量轮数")
+    args = arg_parser.parse_args()
+
+    print(f"CPU 核数: {os.cpu_count()}")
+    programs = [
+        (f"{count} 个函数", count, synthesize(count))
+        for count in (int(n) for n in args.functions.split(","))
+    ]
+    programs.append((f"{args.chain} 个操作数的加法链", 2, deep_chain(args.chain)))
+    for title, count, text in programs:
+        tokens = TokenBuffer.from_lexer(create_lexer(text))
+        expected, serial = best_of(args.rounds, lambda: compile_serial(tokens))
+        print(
+            f"\n{title}, {len(tokens)} tokens, {len(expected[2])} 条四元式, "
+            f"顺序编译 {serial * 1000:.0f} ms"
+        )
+        for workers in range(1, args.workers + 1):
+            # 进程池预先创建并预热，测量的是稳定状态下的分发、编译与合并耗时
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(abs, range(workers)))
+                result, elapsed = best_of(
+                    args.rounds,
+                    lambda: compile_parallel(tokens, workers, executor=executor),
+                )
+                # 不回传语法树时只剩四元式与错误的进程间传递
+                lean, lean_elapsed = best_of(
+                    args.rounds,
+                    lambda: compile_parallel(
+                        tokens, workers, executor=executor, keep_ast=False
+                    ),
+                )
+            if (
+                len(result[0].declarations) != len(expected[0].declarations)
+                or key(result) != key(expected)
+                or key(lean) != key(expected)
+            ):
+                print(f"  {workers} 进程: 结果与顺序编译不一致")
+                sys.exit(1)
+            print(
+                f"  {workers:>2} 进程: {elapsed * 1000:7.0f} ms, "
+                f"{count / elapsed:>9,.0f} 函数/s, 加速比 {serial / elapsed:.2f}x; "
+                f"不回传语法树 {lean_elapsed * 1000:7.0f} ms, "
+                f"加速比 {serial / lean_elapsed:.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
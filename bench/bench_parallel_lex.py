@@ -0,0 +1,106 @@
+"""
+Description  : 并行分块词法分析的扩展性测试 (进程数 x 源文件大小)
+Author       : Hyoung
+Date         : 2026-10-17 11:48:05
+LastEditTime : 2026-10-17 11:48:05
+FilePath     : \\课程设计\\rust-like-compiler\\bench\\bench_parallel_lex.py
+"""
+
+# 用法: python bench/bench_parallel_lex.py [--workers N] [--sizes 1,4,16] [--engine regex] [--rounds N]
+
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# 添加项目根目录到模块搜索路径
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from lexer import LEXER_ENGINES, TokenBuffer, create_lexer, lex_parallel
+
+
+def build_corpus(files, size):
+    """拼接可正常词法分析的测试文件，直到大小达到 size 个字符"""
+    parts = []
+    for path in files:
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        try:
+            create_lexer(text).tokenize()
+        except Exception:
+            continue
+        parts.append(text)
+    unit = "\n".join(parts) + "\n"
+    return unit * max(1, size // len(unit))
+
+
+def best_of(rounds, func):
+    """返回 (结果, 最快一轮耗时秒数)"""
+    best = None
+    result = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return result, best
+
+
+def key(tokens):
+    return [(t.type, t.value, t.line, t.column, t.offset) for t in tokens]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="并行词法分析扩展性测试")
+    arg_parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1, help="最大进程数"
+    )
+    arg_parser.add_argument(
+        "--sizes", default="1,4,16", help="源文件大小列表 (MiB, 逗号分隔)"
+    )
+    arg_parser.add_argument(
+        "--engine", default="regex", choices=sorted(LEXER_ENGINES), help="扫描引擎"
+    )
+    arg_parser.add_argument("--rounds", type=int, default=3, help="每项测量轮数")
+    args = arg_parser.parse_args()
+
+    files = sorted(glob.glob(os.path.join(root_dir, "test", "*.rs")))
+    print(f"CPU 核数: {os.cpu_count()}, 引擎: {args.engine}")
+
+    for size_mib in (float(s) for s in args.sizes.split(",")):
+        text = build_corpus(files, int(size_mib * 1024 * 1024))
+        expected, serial = best_of(
+            args.rounds,
+            lambda: TokenBuffer.from_lexer(create_lexer(text, args.engine)),
+        )
+        print(
+            f"\n{len(text) / 1048576:.1f} MiB, {len(expected)} tokens, "
+            f"单进程 {serial * 1000:.0f} ms"
+        )
+        for workers in range(1, args.workers + 1):
+            # 进程池预先创建并预热，测量的是稳定状态下的分块扫描与拼接耗时
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(abs, range(workers)))
+                tokens, elapsed = best_of(
+                    args.rounds,
+                    lambda: lex_parallel(
+                        text, workers, args.engine, min_chunk_size=1, executor=executor
+                    ),
+                )
+            if key(tokens) != key(expected):
+                print(f"  {workers} 进程: 结果与单进程扫描不一致")
+                sys.exit(1)
+            print(
+                f"  {workers:>2} 进程: {elapsed * 1000:7.0f} ms, "
+                f"{len(tokens) / elapsed:>12,.0f} tokens/s, "
+                f"加速比 {serial / elapsed:.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Description  : 以合成程序测试各编译阶段 (词法分析到 MIPS 代码生成) 的耗时随程序规模的变化
+Author       : Hyoung
+Date         : 2026-10-17 21:58:44
+LastEditTime : 2026-10-17 21:58:44
+FilePath     : \\课程设计\\rust-like-compiler\\bench\\bench_pipeline_stages.py
+"""
+
+# 用法: python bench/bench_pipeline_stages.py [--functions 25,50,100,200] [--statements 20]
+#                                            [--expr-depth 3] [--loop-depth 2] [--fan-out 2]
+#                                            [--seed N] [--rounds N] [--until 阶段名]
+#
+# 各规模参数都可以是逗号分隔的列表，对所有组合逐一测试。每个阶段的输入预先由前一阶段得到，
+# 输出各阶段的耗时与每个 Token 的平均耗时 (us/token)：线性扩展时后者基本不变。
+# 目标代码生成的耗时随程序规模平方增长，测试更大的程序时可用 --until 中间代码 跳过该阶段。
+
+import argparse
+import itertools
+import os
+import sys
+import time
+
+# 添加项目根目录到模块搜索路径
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from codegen2mips import MIPSCodeGenerator
+from ir_generator import IRGenerator
+from lexer import Lexer, TokenStream
+from parallel_compiler import myparser
+from program_generator import ProgramGenerator
+from semantic_analyzer import SemanticAnalyzer
+
+# 阶段名 -> 由前一阶段的结果得到本阶段结果的函数
+STAGES = {
+    "词法分析": lambda text: Lexer(text).tokenize(),
+    "语法分析": lambda tokens: myparser.Parser(TokenStream(tokens)).parse_program(),
+    "语义分析": lambda ast: (SemanticAnalyzer().analyze(ast), ast)[1],
+    "中间代码": lambda ast: IRGenerator().generate(ast),
+    "目标代码": lambda quads: MIPSCodeGenerator(quads).gen_asm(),
+}
+
+
+def measure(stage, value, rounds):
+    """返回 (结果, 最快一轮耗时秒数)"""
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = stage(value)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return result, best
+
+
+def parse_list(text):
+    return [int(n) for n in text.split(",")]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="各编译阶段扩展性测试")
+    arg_parser.add_argument("--functions", default="25,50,100,200", help="函数个数")
+    arg_parser.add_argument("--statements", default="20", help="每个函数的语句数")
+    arg_parser.add_argument("--expr-depth", default="3", help="表达式最大深度")
+    arg_parser.add_argument("--loop-depth", default="2", help="循环最大嵌套层数")
+    arg_parser.add_argument("--fan-out", default="2", help="每个函数调用的函数个数")
+    arg_parser.add_argument("--seed", type=int, default=0, help="随机数种子")
+    arg_parser.add_argument("--rounds", type=int, default=3, help="每项测量轮数")
+    arg_parser.add_argument(
+        "--until", choices=list(STAGES), default="目标代码", help="只测试到该阶段为止"
+    )
+    args = arg_parser.parse_args()
+
+    names = list(STAGES)
+    stages = names[: names.index(args.until) + 1]
+
+    configs = itertools.product(
+        parse_list(args.functions),
+        parse_list(args.statements),
+        parse_list(args.expr_depth),
+        parse_list(args.loop_depth),
+        parse_list(args.fan_out),
+    )
+    print(f"{'阶段':<10}" + "".join(f"{name:>16}" for name in stages))
+    for functions, statements, expr_depth, loop_depth, fan_out in configs:
+        text = ProgramGenerator(
+            functions, statements, expr_depth, loop_depth, fan_out, args.seed
+        ).generate()
+        value = text
+        timings = []
+        count = 0
+        for name in stages:
+            value, elapsed = measure(STAGES[name], value, args.rounds)
+            timings.append(elapsed)
+            if name == "词法分析":
+                count = len(value)
+        print(
+            f"\n函数 {functions}, 语句 {statements}, 表达式深度 {expr_depth}, "
+            f"循环嵌套 {loop_depth}, 调用 {fan_out}: "
+            f"{len(text.splitlines())} 行, {count} tokens"
+        )
+        print(f"{'ms':<12}" + "".join(f"{t * 1000:>20.1f}" for t in timings))
+        print(
+            f"{'us/token':<12}" + "".join(f"{t * 1e6 / count:>20.2f}" for t in timings)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Description  : 增量重扫描测试：随机编辑后 relex 与完整扫描的结果一致性与耗时对比
+Author       : Hyoung
+Date         : 2026-10-18 02:14:36
+LastEditTime : 2026-10-18 02:14:36
+FilePath     : \\课程设计\\rust-like-compiler\\bench\\bench_relex.py
+"""
+
+# 用法: python bench/bench_relex.py [--functions 100,1000] [--edits N] [--seed N]
+#
+# 每次编辑都作用于同一个合成程序：插入语句、删除一段文本、修改标识符，或插入非法字符。
+# relex 的结果 (Token 与词法错误) 必须与 recover 模式下完整扫描编辑后文本的结果相同；
+# 插入非法字符时 relex 不抛出异常，而是在 TokenDelta.diagnostics 中报告该词法错误。
+
+import argparse
+import os
+import random
+import sys
+import time
+
+# 添加项目根目录到模块搜索路径
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from bench_parallel_compile import synthesize
+from lexer import Lexer, Token, diff_edit, relex
+
+# 本语言中不能出现在字符串与注释之外的字符
+INVALID_CHARS = "@$~#?`"
+
+
+def random_edit(rng, text):
+    """返回 (编辑种类, 编辑后的文本)"""
+    kind = rng.choice(["insert", "delete", "rename", "invalid"])
+    position = rng.randrange(len(text))
+    if kind == "insert":
+        position = text.find("\n", position) + 1
+        return kind, text[:position] + "    s = s + 1;\n" + text[position:]
+    if kind == "delete":
+        return kind, text[:position] + text[position + rng.randrange(1, 8) :]
+    if kind == "rename":
+        return kind, text[:position] + rng.choice("abxyz_") + text[position + 1 :]
+    return kind, text[:position] + rng.choice(INVALID_CHARS) + text[position:]
+
+
+def token_key(tokens):
+    return [(t.type, t.value, t.line, t.column, t.offset) for t in tokens]
+
+
+def error_key(errors):
+    return [(e.message, e.line, e.col, e.offset) for e in errors]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="增量重扫描测试")
+    arg_parser.add_argument(
+        "--functions", default="100,1000", help="函数个数列表 (逗号分隔)"
+    )
+    arg_parser.add_argument("--edits", type=int, default=200, help="每种规模的编辑次数")
+    arg_parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    args = arg_parser.parse_args()
+
+    for count in (int(n) for n in args.functions.split(",")):
+        rng = random.Random(args.seed)
+        text = synthesize(count)
+        base_tokens = Lexer(text).tokenize()
+        full_total = relex_total = 0.0
+        kinds = {}
+        for _ in range(args.edits):
+            kind, new_text = random_edit(rng, text)
+            kinds[kind] = kinds.get(kind, 0) + 1
+            # apply 会原地平移旧 Token，每次编辑都从未修改的副本开始
+            tokens = [
+                Token(t.type, t.value, t.line, t.column, t.offset) for t in base_tokens
+            ]
+
+            start = time.perf_counter()
+            lexer = Lexer(new_text, recover=True)
+            expected = lexer.tokenize()
+            full_total += time.perf_counter() - start
+
+            start = time.perf_counter()
+            delta = relex(tokens, new_text, *diff_edit(text, new_text))
+            result = delta.apply(tokens)
+            relex_total += time.perf_counter() - start
+
+            if token_key(result) != token_key(expected) or error_key(
+                delta.diagnostics
+            ) != error_key(lexer.diagnostics):
+                print(f"{count} 个函数: {kind} 编辑后 relex 与完整扫描的结果不一致")
+                sys.exit(1)
+
+        full = full_total / args.edits
+        incremental = relex_total / args.edits
+        summary = ", ".join(f"{kind} {n}" for kind, n in sorted(kinds.items()))
+        print(
+            f"{count:>6} 个函数, {len(base_tokens):>7} tokens: "
+            f"完整扫描 {full * 1000:8.2f} ms, relex {incremental * 1000:8.3f} ms, "
+            f"加速比 {full / incremental:7.1f}x ({summary})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Description  : 单遍编译 (语法分析时直接生成四元式) 与先构造语法树再生成中间代码的耗时和内存峰值对比
+Author       : Hyoung
+Date         : 2026-10-17 19:36:25
+LastEditTime : 2026-10-17 19:36:25
+FilePath     : \\课程设计\\rust-like-compiler\\bench\\bench_single_pass.py
+"""
+
+# 用法: python bench/bench_single_pass.py [--functions 100,1000,4000] [--repeat N] [--rounds N]
+#
+# 两遍: Parser(tokens).parse_program() 得到语法树，再由 IRGenerator.generate 遍历生成四元式；
+# 单遍: Parser(tokens, irgen) 在归约时直接调用 IRGenerator 的语法制导翻译方法。
+# 先检查 test/*.rs 与合成程序上两者的四元式完全相同，再比较耗时与 tracemalloc 内存峰值
+# (Token 预先切分好，不计词法分析)。
+
+import argparse
+import glob
+import os
+import sys
+import time
+import tracemalloc
+
+# 添加项目根目录到模块搜索路径
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from bench_parallel_compile import synthesize
+from ir_generator import IRGenerator
+from lexer import Lexer, TokenStream
+from parallel_compiler import myparser
+
+
+def compile_two_pass(tokens):
+    ast = myparser.Parser(TokenStream(tokens)).parse_program()
+    return IRGenerator().generate(ast)
+
+
+def compile_single_pass(tokens):
+    irgen = IRGenerator()
+    myparser.Parser(TokenStream(tokens), irgen).parse_program()
+    return irgen.quads
+
+
+MODES = {"两遍": compile_two_pass, "单遍": compile_single_pass}
+
+
+def check_corpus(files):
+    """返回两者都能编译的文件的 Token 列表；四元式不同时退出"""
+    accepted = []
+    for path in files:
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        try:
+            tokens = Lexer(text).tokenize()
+            expected = compile_two_pass(tokens)
+        except Exception:
+            # 词法或语法错误：单遍编译同样在该处停止，不比较
+            continue
+        if compile_single_pass(tokens) != expected:
+            print(f"{os.path.basename(path)}: 单遍编译的四元式与两遍编译不一致")
+            sys.exit(1)
+        accepted.append(tokens)
+    return accepted
+
+
+def measure(compile_tokens, inputs, rounds):
+    """返回 (最快一轮耗时秒数, 内存分配峰值字节数)"""
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for tokens in inputs:
+            compile_tokens(tokens)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    for tokens in inputs:
+        compile_tokens(tokens)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak - baseline
+
+
+def report(title, inputs, rounds):
+    count = sum(len(tokens) for tokens in inputs)
+    print(f"\n{title}: {count} tokens")
+    baseline = None
+    for name, compile_tokens in MODES.items():
+        elapsed, peak = measure(compile_tokens, inputs, rounds)
+        baseline = baseline or (elapsed, peak)
+        print(
+            f"  {name} {elapsed * 1000:8.1f} ms ({elapsed / baseline[0]:.2f}x), "
+            f"内存峰值 {peak / 1024:9.1f} KB ({peak / baseline[1]:.2f}x)"
+        )
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="单遍编译与两遍编译对比测试")
+    arg_parser.add_argument(
+        "--functions", default="100,1000,4000", help="合成程序的函数个数列表 (逗号分隔)"
+    )
+    arg_parser.add_argument("--repeat", type=int, default=20, help="测试集重复次数")
+    arg_parser.add_argument("--rounds", type=int, default=5, help="每项测量轮数")
+    args = arg_parser.parse_args()
+
+    files = sorted(glob.glob(os.path.join(root_dir, "test", "*.rs")))
+    accepted = check_corpus(files)
+    print(f"test/*.rs 共 {len(files)} 个文件，{len(accepted)} 个编译成功且四元式相同")
+    report(
+        f"test/*.rs 中的 {len(accepted)} 个文件 x {args.repeat}",
+        accepted * args.repeat,
+        args.rounds,
+    )
+
+    for count in (int(n) for n in args.functions.split(",")):
+        tokens = Lexer(synthesize(count)).tokenize()
+        if compile_single_pass(tokens) != compile_two_pass(tokens):
+            print(f"{count} 个函数: 单遍编译的四元式与两遍编译不一致")
+            sys.exit(1)
+        report(f"合成程序 ({count} 个函数)", [tokens], args.rounds)
+
+
+if __name__ == "__main__":
+    main()
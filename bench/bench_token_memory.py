@@ -0,0 +1,98 @@
+"""
+Description  : Token 表示方式的内存占用对比 (每个 Token 的字节数)
+Author       : Hyoung
+Date         : 2026-10-17 11:05:12
+LastEditTime : 2026-10-17 11:05:12
+FilePath     : \\课程设计\\rust-like-compiler\\bench\\bench_token_memory.py
+"""
+
+# 用法: python bench/bench_token_memory.py [--repeat N]
+
+import argparse
+import glob
+import os
+import sys
+import tracemalloc
+
+# 添加项目根目录到模块搜索路径
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from lexer import RegexLexer, Token, TokenBuffer
+from source_map import SourceMap
+
+
+class LegacyToken:
+    """改造前的 Token 表示：普通类，每个实例带 __dict__"""
+
+    def __init__(self, type, value, line, column):
+        self.type = type
+        self.value = value
+        self.line = line
+        self.column = column
+
+
+def build_corpus(repeat):
+    """拼接所有可正常词法分析的测试文件，并重复 repeat 次"""
+    parts = []
+    for path in sorted(glob.glob(os.path.join(root_dir, "test", "*.rs"))):
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        try:
+            RegexLexer(text).tokenize()
+        except Exception:
+            continue
+        parts.append(text)
+    return "\n".join(parts * repeat)
+
+
+def traced_bytes(build):
+    """返回 build() 的结果保持存活时新增的内存字节数"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Token 内存占用对比")
+    arg_parser.add_argument("--repeat", type=int, default=100, help="语料重复次数")
+    args = arg_parser.parse_args()
+
+    text = build_corpus(args.repeat)
+    # 先取出原始字段，只统计各种表示方式自身的开销 (值对象在各方案间共享)
+    rows = [
+        (t.type, t.value, t.line, t.column, t.offset)
+        for t in RegexLexer(text).tokenize()
+    ]
+    count = len(rows)
+    print(f"语料大小: {len(text) / 1024:.1f} KiB, {count} tokens")
+
+    cases = [
+        ("LegacyToken (__dict__)", lambda: [LegacyToken(*r[:4]) for r in rows]),
+        ("Token (__slots__)", lambda: [Token(*r) for r in rows]),
+        ("TokenBuffer (arrays)", lambda: TokenBuffer(Token(*r) for r in rows)),
+        # 只保存偏移量，行列号由 SourceMap 换算 (计入行首索引本身的开销)
+        (
+            "TokenBuffer + SourceMap",
+            lambda: TokenBuffer((Token(*r) for r in rows), SourceMap(text)),
+        ),
+    ]
+    baseline = None
+    for name, build in cases:
+        result, size = traced_bytes(build)
+        per_token = size / count
+        if baseline is None:
+            baseline = per_token
+        print(
+            f"{name:>24}: {size / 1024:10.1f} KiB, "
+            f"{per_token:6.1f} bytes/token ({per_token / baseline:.2f}x)"
+        )
+        del result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Description  : 访问者调度开销测试：按类缓存的调度表与每个节点拼接方法名 + getattr 的对比
+Author       : Hyoung
+Date         : 2026-10-17 23:41:27
+LastEditTime : 2026-10-17 23:41:27
+FilePath     : \\课程设计\\rust-like-compiler\\bench\\bench_visitor_dispatch.py
+"""
+
+# 用法: python bench/bench_visitor_dispatch.py [--functions 200] [--statements 20] [--rounds 5]
+#
+# 对合成程序的语法树比较两种调度方式：
+#   - 调度表: ASTVisitor.visit 按节点类查 dispatch 表 (当前实现)
+#   - getattr: 每个节点拼接 "visit_" + 类名再 getattr (改造前的实现，由 LegacyDispatch 复现)
+# 测试项：对全部节点逐个调用空的 visit_* (只含调度开销，输出 ns/节点)、语义分析与中间代码生成。
+
+import argparse
+import os
+import sys
+import time
+
+# 添加项目根目录到模块搜索路径
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from ast_walker import ASTVisitor
+from flat_ast import NODE_CLASSES, child_nodes
+from ir_generator import IRGenerator
+from lexer import Lexer, TokenStream
+from parallel_compiler import myparser
+from parse_profiler import pad
+from program_generator import ProgramGenerator
+from semantic_analyzer import SemanticAnalyzer
+
+
+class LegacyDispatch:
+    """改造前的调度方式：每个节点拼接方法名并 getattr"""
+
+    def visit(self, node):
+        if node is None:
+            return None
+        visitor = getattr(self, "visit_" + type(node).__name__, self.generic_visit)
+        return visitor(node)
+
+
+def visit_nothing(self, node):
+    return None
+
+
+# 每个节点类都有空 visit 方法的访问者，只测量调度本身
+NullVisitor = type(
+    "NullVisitor",
+    (ASTVisitor,),
+    {"visit_" + cls.__name__: visit_nothing for cls in NODE_CLASSES},
+)
+LegacyNullVisitor = type("LegacyNullVisitor", (LegacyDispatch, NullVisitor), {})
+LegacySemanticAnalyzer = type(
+    "LegacySemanticAnalyzer", (LegacyDispatch, SemanticAnalyzer), {}
+)
+LegacyIRGenerator = type("LegacyIRGenerator", (LegacyDispatch, IRGenerator), {})
+
+
+def all_nodes(root):
+    nodes = []
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        nodes.append(node)
+        stack.extend(child_nodes(node))
+    return nodes
+
+
+def visit_all(visitor_class):
+    def run(nodes):
+        visit = visitor_class().visit
+        for node in nodes:
+            visit(node)
+
+    return run
+
+
+def analyze(analyzer_class):
+    return lambda root: [e.message for e in analyzer_class().analyze(root)]
+
+
+def generate(generator_class):
+    return lambda root: [repr(quad) for quad in generator_class().generate(root)]
+
+
+def measure(func, value, rounds):
+    """返回 (结果, 最快一轮耗时秒数)"""
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = func(value)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return result, best
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="访问者调度开销测试")
+    arg_parser.add_argument("--functions", type=int, default=200, help="函数个数")
+    arg_parser.add_argument(
+        "--statements", type=int, default=20, help="每个函数的语句数"
+    )
+    arg_parser.add_argument("--rounds", type=int, default=5, help="每项测量轮数")
+    args = arg_parser.parse_args()
+
+    text = ProgramGenerator(args.functions, args.statements).generate()
+    ast = myparser.Parser(TokenStream(Lexer(text).tokenize())).parse_program()
+    nodes = all_nodes(ast)
+    print(f"{args.functions} 个函数, {len(nodes)} 个语法树节点\n")
+    print(
+        pad("", 14, left=True)
+        + pad("getattr (ms)", 14)
+        + pad("调度表 (ms)", 14)
+        + pad("ns/节点", 18)
+        + pad("加速", 9)
+    )
+    cases = [
+        ("空访问", visit_all(LegacyNullVisitor), visit_all(NullVisitor), nodes),
+        ("语义分析", analyze(LegacySemanticAnalyzer), analyze(SemanticAnalyzer), ast),
+        ("中间代码", generate(LegacyIRGenerator), generate(IRGenerator), ast),
+    ]
+    for name, legacy, cached, value in cases:
+        expected, before = measure(legacy, value, args.rounds)
+        result, after = measure(cached, value, args.rounds)
+        assert result == expected, f"{name}: 两种调度方式的结果不同"
+        per_node = f"{before * 1e9 / len(nodes):.0f} -> {after * 1e9 / len(nodes):.0f}"
+        print(
+            pad(name, 14, left=True)
+            + f"{before * 1000:>14.2f}{after * 1000:>14.2f}"
+            + pad(per_node, 18)
+            + f"{before / after:>8.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
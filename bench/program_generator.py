@@ -0,0 +1,274 @@
+"""
+Description  : 可复现的大规模合成程序生成器，用于压力测试与各编译阶段的扩展性测试
+Author       : Hyoung
+Date         : 2026-10-17 21:32:06
+LastEditTime : 2026-10-17 21:32:06
+FilePath     : \\课程设计\\rust-like-compiler\\bench\\program_generator.py
+"""
+
+# 用法: python bench/program_generator.py [--functions N] [--statements N] [--expr-depth N]
+#                                         [--loop-depth N] [--fan-out N] [--seed N] [-o 文件]
+#
+# 生成的程序只使用本语言子集 (i32、let mut、赋值、if/else、while、for、loop/break、函数调用)，
+# 能通过语义分析：变量先声明后使用、都被读取，只调用前面定义的函数，除数为非零常数，
+# while 与 loop 都由计数器控制。相同参数与种子总是得到相同的程序。
+
+import argparse
+import os
+import random
+import sys
+
+COMPARE_OPERATORS = ["<", "<=", ">", ">=", "==", "!="]
+
+
+class ProgramGenerator:
+    """
+    functions    : 函数个数 (另加一个 main)
+    statements   : 每个函数的语句数 (包括循环体、分支中的语句)
+    expr_depth   : 表达式语法树的最大深度 (0 为单个变量、数字或调用)
+    loop_depth   : 循环的最大嵌套层数
+    fan_out      : 每个函数调用的不同函数个数 (从前面定义的函数中随机选取)
+    """
+
+    def __init__(
+        self,
+        functions=100,
+        statements=20,
+        expr_depth=3,
+        loop_depth=2,
+        fan_out=2,
+        seed=0,
+    ):
+        self.functions = functions
+        self.statements = statements
+        self.expr_depth = expr_depth
+        self.loop_depth = loop_depth
+        self.fan_out = fan_out
+        self.seed = seed
+
+    def generate(self):
+        """返回生成的源代码"""
+        self.rng = random.Random(self.seed)
+        self.arity = []  # 各函数的参数个数
+        parts = [self.function(index) for index in range(self.functions)]
+        parts.append(self.main_function())
+        return "\n\n".join(parts) + "\n"
+
+    # --- 函数 ---
+    def function(self, index):
+        rng = self.rng
+        arity = rng.randint(1, 3)
+        self.arity.append(arity)
+        params = [f"p{i}" for i in range(arity)]
+        signature = ", ".join(f"{name}: i32" for name in params)
+        self.begin_function(rng.sample(range(index), min(self.fan_out, index)))
+        self.scopes = [[[name, False] for name in params]]
+        self.declare("s", "0")
+        while self.budget > 0:
+            self.statement(0, 0)
+        # 保证每个被选中的函数都至少调用一次
+        for callee in self.pending:
+            self.emit(f"s = s + {self.call(callee)};")
+        self.fold_unused()
+        self.emit("return s;")
+        return f"fn f{index}({signature}) -> i32 {{\n" + "\n".join(self.lines) + "\n}"
+
+    def main_function(self):
+        count = self.functions
+        self.begin_function(list(range(max(0, count - self.fan_out), count)))
+        self.scopes = [[]]
+        self.declare("s", "0")
+        for callee in self.pending:
+            self.emit(f"s = s + {self.call(callee)};")
+        self.fold_unused()
+        return "fn main() {\n" + "\n".join(self.lines) + "\n}"
+
+    def begin_function(self, callees):
+        self.lines = []
+        self.indent = 1
+        self.names = 0  # 已生成的局部变量个数，变量名在函数内不重复 (不产生遮蔽警告)
+        self.budget = self.statements
+        self.callees = callees
+        self.pending = list(callees)
+
+    # --- 作用域与变量 ---
+    def emit(self, line):
+        self.lines.append("    " * self.indent + line)
+
+    def new_name(self, prefix):
+        self.names += 1
+        return f"{prefix}{self.names}"
+
+    def declare(self, name, value):
+        self.emit(f"let mut {name}: i32 = {value};")
+        self.scopes[-1].append([name, False])
+
+    def variable(self, assignable=False):
+        """随机选取一个可见变量并标记为已使用；assignable 时只选 let mut 声明的变量"""
+        candidates = [
+            entry
+            for scope in self.scopes
+            for entry in scope
+            if not assignable or entry[0][0] in "sv"
+        ]
+        entry = self.rng.choice(candidates)
+        entry[1] = True
+        return entry[0]
+
+    def fold_unused(self):
+        """把当前作用域中尚未读取的变量累加到 s，避免未使用变量警告"""
+        for entry in self.scopes[-1]:
+            if not entry[1] and entry[0] != "s":
+                entry[1] = True
+                self.emit(f"s = s + {entry[0]};")
+
+    def open_block(self, header, scope=()):
+        self.emit(header + " {")
+        self.indent += 1
+        self.scopes.append([[name, False] for name in scope])
+
+    def close_block(self):
+        self.fold_unused()
+        self.scopes.pop()
+        self.indent -= 1
+        self.emit("}")
+
+    def body(self, loop_level, nesting):
+        """语句块内最多 3 条语句，受剩余语句数限制"""
+        for _ in range(self.rng.randint(1, 3)):
+            if self.budget <= 0:
+                break
+            self.statement(loop_level, nesting)
+
+    # --- 语句 ---
+    def statement(self, loop_level, nesting):
+        rng = self.rng
+        self.budget -= 1
+        kind = rng.random()
+        if kind < 0.3:
+            self.declare(self.new_name("v"), self.expression(self.expr_depth))
+        elif kind < 0.55:
+            value = self.expression(self.expr_depth)
+            self.emit(f"{self.variable(assignable=True)} = {value};")
+        elif kind < 0.65 and self.callees:
+            callee = self.pending.pop() if self.pending else rng.choice(self.callees)
+            self.emit(f"s = s + {self.call(callee)};")
+        elif kind < 0.8 and nesting < self.loop_depth + 2:
+            self.if_statement(loop_level, nesting + 1)
+        elif loop_level < self.loop_depth:
+            self.loop_statement(loop_level + 1, nesting + 1)
+        else:
+            self.emit(f"s = s + {self.expression(self.expr_depth)};")
+
+    def if_statement(self, loop_level, nesting):
+        self.open_block(f"if {self.condition()}")
+        self.body(loop_level, nesting)
+        self.close_block()
+        if self.budget > 0 and self.rng.random() < 0.5:
+            # else 接在 then 分支的 '}' 之后
+            self.lines[-1] += " else {"
+            self.indent += 1
+            self.scopes.append([])
+            self.body(loop_level, nesting)
+            self.close_block()
+
+    def loop_statement(self, loop_level, nesting):
+        rng = self.rng
+        limit = rng.randint(2, 10)
+        kind = rng.randrange(3)
+        if kind == 1:
+            index = self.new_name("i")
+            self.open_block(f"for {index} in 0..{self.expression(0)}", [index])
+            self.body(loop_level, nesting)
+            self.close_block()
+            return
+        # while 与 loop 由计数器控制循环次数
+        counter = self.new_name("c")
+        self.declare(counter, "0")
+        self.scopes[-1][-1][1] = True
+        if kind == 0:
+            self.open_block(f"while {counter} < {limit}")
+        else:
+            self.open_block("loop")
+            self.emit(f"if {counter} > {limit} {{ break; }}")
+        self.body(loop_level, nesting)
+        self.emit(f"{counter} = {counter} + 1;")
+        self.close_block()
+
+    # --- 表达式 ---
+    def condition(self):
+        depth = max(0, self.expr_depth - 1)
+        operator = self.rng.choice(COMPARE_OPERATORS)
+        return f"{self.expression(depth)} {operator} {self.expression(depth)}"
+
+    def expression(self, depth):
+        """左侧子树深度为 depth - 1 (保证达到指定深度)，右侧随机"""
+        if depth <= 0:
+            return self.operand()
+        rng = self.rng
+        left = self.expression(depth - 1)
+        operator = rng.choice("+-*/%")
+        if operator in "/%":
+            # 除数取非零常数
+            return f"{left} {operator} {rng.randint(1, 9)}"
+        right = self.expression(rng.randrange(depth))
+        if " " in right and (operator != "+" or rng.random() < 0.5):
+            right = f"({right})"
+        return f"{left} {operator} {right}"
+
+    def operand(self):
+        rng = self.rng
+        kind = rng.random()
+        if kind < 0.1 and self.callees:
+            return self.call(rng.choice(self.callees))
+        if kind < 0.4:
+            return str(rng.randint(0, 99))
+        return self.variable()
+
+    def call(self, callee):
+        args = ", ".join(self.argument() for _ in range(self.arity[callee]))
+        return f"f{callee}({args})"
+
+    def argument(self):
+        if self.rng.random() < 0.3:
+            return str(self.rng.randint(0, 99))
+        return self.variable()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="合成程序生成器")
+    arg_parser.add_argument("--functions", type=int, default=100, help="函数个数")
+    arg_parser.add_argument(
+        "--statements", type=int, default=20, help="每个函数的语句数"
+    )
+    arg_parser.add_argument("--expr-depth", type=int, default=3, help="表达式最大深度")
+    arg_parser.add_argument(
+        "--loop-depth", type=int, default=2, help="循环最大嵌套层数"
+    )
+    arg_parser.add_argument(
+        "--fan-out", type=int, default=2, help="每个函数调用的函数个数"
+    )
+    arg_parser.add_argument("--seed", type=int, default=0, help="随机数种子")
+    arg_parser.add_argument("-o", "--output", help="输出文件 (默认输出到标准输出)")
+    args = arg_parser.parse_args()
+
+    text = ProgramGenerator(
+        args.functions,
+        args.statements,
+        args.expr_depth,
+        args.loop_depth,
+        args.fan_out,
+        args.seed,
+    ).generate()
+    if args.output is None:
+        sys.stdout.write(text)
+        return
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write(text)
+    print(
+        f"已生成 {args.output}: {len(text.splitlines())} 行, {os.path.getsize(args.output)} 字节"
+    )
+
+
+if __name__ == "__main__":
+    main()
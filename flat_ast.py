@@ -0,0 +1,298 @@
+"""
+Description  : 扁平语法树 (结构数组)：节点类别码、字段编码与 Token 等常量分别存放在紧凑数组中，以游标遍历
+Author       : Hyoung
+Date         : 2026-10-17 23:02:15
+LastEditTime : 2026-10-17 23:02:15
+FilePath     : \\课程设计\\rust-like-compiler\\flat_ast.py
+"""
+
+from array import array
+
+import parser_nodes
+from parser_nodes import ASTNode
+
+# 节点类别码 -> 节点类 (parser_nodes 中定义的全部节点类，按定义顺序)
+NODE_CLASSES = [
+    cls
+    for cls in vars(parser_nodes).values()
+    if isinstance(cls, type) and issubclass(cls, ASTNode)
+]
+CLASS_CODES = {cls: code for code, cls in enumerate(NODE_CLASSES)}
+
+# 保存子节点列表的属性 (值为 None 时编码为 -1)
+LIST_FIELDS = {
+    "declarations",
+    "params",
+    "statements",
+    "args",
+    "elements",
+    "items",
+    "tuple_types",
+}
+# 保存字典列表的属性 -> 字典的键 (else if 分支: {'condition': 条件, 'block': 语句块})
+PAIR_FIELDS = {"else_if_parts": ("condition", "block")}
+
+# 字段的编码方式
+CHILD, SCALAR, LIST, PAIRS = range(4)
+
+
+def field_layout(cls):
+    """节点类各字段的 (属性名, 编码方式)"""
+    layout = []
+    for name in cls._fields:
+        if name in PAIR_FIELDS:
+            layout.append((name, PAIRS))
+        elif name in LIST_FIELDS:
+            layout.append((name, LIST))
+        elif name in cls._children:
+            layout.append((name, CHILD))
+        else:
+            layout.append((name, SCALAR))
+    return tuple(layout)
+
+
+FIELD_LAYOUTS = [field_layout(cls) for cls in NODE_CLASSES]
+
+
+class FlatAST:
+    """
+    扁平语法树。节点 i 的类别码为 kinds[i]，字段按 _fields 顺序编码在 slots[starts[i]:] 中：
+    子节点为其下标 (>= 0)，None 为 -1，其他值 (Token、类型名、数值等) 为 -2 - 常量表下标；
+    列表先记元素个数，再依次记各元素；else if 分支每项记条件与语句块两个值。
+    子节点总是先于父节点加入，根节点为 root。
+
+    由 from_tree 从对象语法树转换，或由语法分析器的 FlatASTBuilder 在归约时直接构造；
+    to_tree 还原为对象语法树 (ast_cache 据此把语法树保存为二进制文件并读回)。
+    node(i) 返回节点 i 的游标 (FlatNode)，语义分析与中间代码生成可以像对象语法树一样遍历。
+    """
+
+    def __init__(self):
+        self.kinds = array("B")  # 节点类别码
+        self.starts = array("i")  # 节点字段编码的起始位置
+        self.slots = array("i")  # 字段编码
+        self.constants = []  # 常量表
+        self.constant_codes = {}  # 常量 -> 编码 (相同的常量只保存一次)
+        self.root = -1
+
+    def __len__(self):
+        return len(self.kinds)
+
+    @classmethod
+    def from_tree(cls, root):
+        """转换对象语法树 (显式栈后序遍历，嵌套深度不受 Python 调用栈限制)"""
+        flat = cls()
+        indices = {}  # id(节点对象) -> 下标
+        stack = [(root, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if expanded:
+                indices[id(node)] = flat.add(node, indices)
+                continue
+            stack.append((node, True))
+            for child in reversed(list(child_nodes(node))):
+                stack.append((child, False))
+        flat.root = indices[id(root)]
+        return flat
+
+    # --- 编码 ---
+    def add(self, node, indices=None):
+        """
+        编码一个节点并返回其下标。子节点可以是已编码节点的下标，也可以是节点对象：
+        在 indices (id(节点对象) -> 下标) 中找到时直接引用，否则先编码该节点。
+        """
+        codes = []
+        for name, kind in FIELD_LAYOUTS[CLASS_CODES[type(node)]]:
+            value = getattr(node, name)
+            if kind == SCALAR:
+                codes.append(self.constant(value))
+            elif kind == CHILD:
+                codes.append(self.child(value, indices))
+            elif value is None:
+                codes.append(-1)
+            elif kind == LIST:
+                codes.append(len(value))
+                codes.extend(self.child(item, indices) for item in value)
+            else:
+                codes.append(len(value))
+                for part in value:
+                    codes.extend(
+                        self.child(part.get(key), indices) for key in PAIR_FIELDS[name]
+                    )
+        index = len(self.kinds)
+        self.kinds.append(CLASS_CODES[type(node)])
+        self.starts.append(len(self.slots))
+        self.slots.extend(codes)
+        return index
+
+    def child(self, value, indices):
+        if type(value) is int:
+            return value
+        if isinstance(value, ASTNode):
+            if indices is not None:
+                index = indices.get(id(value))
+                if index is not None:
+                    return index
+            return self.add(value, indices)
+        # 子节点位置上的非节点值 (如类型名 "i32")
+        return self.constant(value)
+
+    def constant(self, value):
+        if value is None:
+            return -1
+        # 字符串、数值按值共享，Token 等对象按身份共享 (常量表保持引用，id 不会被复用)
+        if type(value) in (str, int, bool, float):
+            key = (type(value), value)
+        else:
+            key = id(value)
+        code = self.constant_codes.get(key)
+        if code is None:
+            code = self.constant_codes[key] = -2 - len(self.constants)
+            self.constants.append(value)
+        return code
+
+    # 推测分析失败时撤销之后加入的节点
+    def checkpoint(self):
+        return len(self.kinds), len(self.slots), len(self.constants)
+
+    def rollback(self, checkpoint):
+        nodes, slots, constants = checkpoint
+        del self.kinds[nodes:]
+        del self.starts[nodes:]
+        del self.slots[slots:]
+        if len(self.constants) > constants:
+            del self.constants[constants:]
+            limit = -2 - constants
+            self.constant_codes = {
+                key: code for key, code in self.constant_codes.items() if code > limit
+            }
+
+    # --- 解码 ---
+    def node(self, index):
+        """节点 index 的游标"""
+        return FlatNode(self, index)
+
+    def decode(self, code):
+        if code >= 0:
+            return FlatNode(self, code)
+        if code == -1:
+            return None
+        return self.constants[-2 - code]
+
+    def field(self, index, name):
+        """节点 index 的属性 name 的值：子节点为游标，列表为游标列表"""
+        slots = self.slots
+        position = self.starts[index]
+        for field_name, kind in FIELD_LAYOUTS[self.kinds[index]]:
+            code = slots[position]
+            position += 1
+            if field_name == name:
+                if kind == SCALAR or kind == CHILD or code < 0:
+                    return self.decode(code)
+                if kind == LIST:
+                    return [self.decode(c) for c in slots[position : position + code]]
+                keys = PAIR_FIELDS[name]
+                return [
+                    dict(zip(keys, map(self.decode, slots[p : p + len(keys)])))
+                    for p in range(position, position + code * len(keys), len(keys))
+                ]
+            if kind == LIST and code > 0:
+                position += code
+            elif kind == PAIRS and code > 0:
+                position += code * len(PAIR_FIELDS[field_name])
+        raise AttributeError(name)
+
+    def to_tree(self):
+        """还原为 parser_nodes 节点对象组成的语法树 (按下标顺序构造，子节点总先于父节点)"""
+        objects = []
+        slots = self.slots
+        starts = self.starts
+        # 负编码直接作为下标：negative[-1] 为 None，negative[-2 - k] 为常量 k
+        negative = self.constants[::-1] + [None]
+        for index, code in enumerate(self.kinds):
+            cls = NODE_CLASSES[code]
+            node = cls.__new__(cls)
+            position = starts[index]
+            for name, kind in FIELD_LAYOUTS[code]:
+                value = slots[position]
+                position += 1
+                if value < 0:
+                    value = negative[value]
+                elif kind == CHILD:
+                    value = objects[value]
+                elif kind == LIST:
+                    end = position + value
+                    value = [
+                        objects[c] if c >= 0 else negative[c]
+                        for c in slots[position:end]
+                    ]
+                    position = end
+                elif kind == PAIRS:
+                    keys = PAIR_FIELDS[name]
+                    end = position + value * len(keys)
+                    value = [
+                        {
+                            key: objects[c] if c >= 0 else negative[c]
+                            for key, c in zip(keys, slots[p : p + len(keys)])
+                        }
+                        for p in range(position, end, len(keys))
+                    ]
+                    position = end
+                setattr(node, name, value)
+            objects.append(node)
+        return objects[self.root] if objects else None
+
+    def memory_size(self):
+        """数组本身占用的字节数 (不含常量表中的对象)"""
+        return sum(
+            len(a) * a.itemsize for a in (self.kinds, self.starts, self.slots)
+        ) + 8 * len(self.constants)
+
+
+class FlatNode:
+    """
+    扁平语法树节点的游标。按属性名读取字段 (子节点仍为游标)，__class__ 为对应的节点类，
+    因此 isinstance 判断、visit_<节点类名> 调度与节点类的 __repr__ 都与对象语法树相同。
+    游标不缓存，每次读取属性都从数组解码。
+    """
+
+    __slots__ = ("_ast", "_index")
+
+    def __init__(self, ast, index):
+        self._ast = ast
+        self._index = index
+
+    @property
+    def __class__(self):
+        return NODE_CLASSES[self._ast.kinds[self._index]]
+
+    @property
+    def _fields(self):
+        return self.__class__._fields
+
+    @property
+    def _children(self):
+        return self.__class__._children
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return self._ast.field(self._index, name)
+
+    def __repr__(self):
+        return self.__class__.__repr__(self)
+
+
+def child_nodes(node):
+    """按 _children 顺序产生 node 的子节点对象 (列表逐项展开)"""
+    for name in node._children:
+        value = getattr(node, name)
+        if isinstance(value, list):
+            for item in value:
+                if isinstance(item, dict):
+                    for key in PAIR_FIELDS[name]:
+                        if isinstance(item.get(key), ASTNode):
+                            yield item[key]
+                elif isinstance(item, ASTNode):
+                    yield item
+        elif isinstance(value, ASTNode):
+            yield value
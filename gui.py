@@ -99,7 +99,9 @@ except ImportError as e:
 # 导入编译器相关模块
 try:
     # 使用相对导入
-    from lexer import Lexer
+    from lexer import Lexer, diff_edit, relex
+    from source_map import SourceMap
+    from ast_writer import format_ast
 
     # 明确使用本地的parser模块，避免与标准库冲突
     sys.modules.pop("parser", None)  # 移除可能已导入的标准库parser模块
@@ -109,12 +111,13 @@ try:
         "myparser", os.path.join(current_dir, "parser.py")
     )
     myparser = importlib.util.module_from_spec(spec)
+    # 登记模块，增量编译器与这里使用同一个 parser 模块 (同一个 ParseError)
+    sys.modules["myparser"] = myparser
     spec.loader.exec_module(myparser)
 
-    from ir_generator import IRGenerator
+    from incremental_compiler import IncrementalCompiler
     from codegen2mips import MIPSCodeGenerator
     from parser_nodes import ASTNode  # 导入ASTNode基类
-    from semantic_analyzer import SemanticAnalyzer  # 导入语义分析器
 
     print("编译器模块导入成功")
 except ImportError as e:
@@ -839,60 +842,16 @@ class CustomTitleBar(QWidget):
             event.accept()
 
 
-# 格式化AST为文本格式
-def format_ast(node, indent=0):
-    if node is None:
-        return ""
-
-    result = " " * indent + f"{node.__class__.__name__}"
-
-    # 收集非列表类型的属性用于显示
-    attrs = {}
-    for key, value in node.__dict__.items():
-        if not isinstance(value, list) and not key.startswith("_"):
-            attrs[key] = value
-
-    if attrs:
-        result += ": " + ", ".join(f"{k}={v}" for k, v in attrs.items())
-
-    result += "\n"
-
-    # 检查不同类型的子节点属性
-    children = []
-    if hasattr(node, "declarations"):
-        children = node.declarations
-    elif hasattr(node, "statements"):
-        children = node.statements
-    elif hasattr(node, "children"):
-        children = node.children
-    elif hasattr(node, "params") and node.params:
-        children.extend(node.params)
-    elif hasattr(node, "body") and node.body:
-        children = [node.body]
-    elif hasattr(node, "then_block") and node.then_block:
-        children = [node.condition, node.then_block]
-        if node.else_block:
-            children.append(node.else_block)
-    elif hasattr(node, "expr") and node.expr:
-        children = [node.expr]
-    elif hasattr(node, "left") and node.left:
-        children = [node.left, node.right]
-
-    # 递归处理子节点
-    if children:
-        for child in children:
-            if child is not None:  # 确保子节点不为空
-                result += format_ast(child, indent + 2)
-
-    return result
-
-
 # 主窗口类
 class CompilerGUI(QMainWindow):
     def __init__(self):
         super().__init__()
         self.current_file_path = None  # 跟踪当前文件路径
         self.drag_position = None  # 用于窗口拖拽
+        self.token_cache = None  # 上一次编译的 (源代码, Token 列表)，用于增量词法分析
+        self.source_map = None  # 上一次编译的源代码位置索引，用于错误定位
+        # 按函数缓存语法树、语义分析结果与四元式，编辑后只重新编译修改过的函数
+        self.incremental = IncrementalCompiler()
         self.initUI()
 
     def initUI(self):
@@ -925,6 +884,7 @@ class CompilerGUI(QMainWindow):
 
         # 连接树节点展开/折叠信号
         self.ast_tree_expanded_items = set()  # 用于跟踪展开的节点
+        self.current_ast = None  # 树形视图中显示的语法树 (保存时格式化为 .ast 文本)
 
         # 设置状态栏样式
         _, ui_fonts = get_best_font_family()
@@ -1809,25 +1769,13 @@ class CompilerGUI(QMainWindow):
             QMessageBox.critical(self, "错误", f"保存目标代码失败: {str(e)}")
 
     def get_ast_text(self):
-        """获取AST树的文本表示"""
-
-        def tree_to_text(item, indent=0):
-            text = "  " * indent + item.text(0) + "\n"
-            for i in range(item.childCount()):
-                text += tree_to_text(item.child(i), indent + 1)
-            return text
-
-        if self.ast_tree.topLevelItemCount() == 0:
+        """获取AST树的文本表示 (与命令行输出的 .ast 文件格式相同)"""
+        if self.current_ast is None:
             return "# AST为空\n"
 
         result = "# Rust-like语言语法树 (AST)\n"
         result += "# Generated by Rust-like Compiler\n\n"
-
-        for i in range(self.ast_tree.topLevelItemCount()):
-            item = self.ast_tree.topLevelItem(i)
-            result += tree_to_text(item)
-
-        return result
+        return result + format_ast(self.current_ast)
 
     def get_ir_text(self):
         """获取中间代码的文本表示"""
@@ -1870,6 +1818,7 @@ class CompilerGUI(QMainWindow):
         # 清空之前的结果
         self.token_table.setRowCount(0)
         self.ast_tree.clear()
+        self.current_ast = None
         self.ir_table.setRowCount(0)
         self.target_code.clear()
 
@@ -1883,39 +1832,37 @@ class CompilerGUI(QMainWindow):
             self.statusBar().showMessage("错误: 请输入代码后再编译")
             return
 
+        self.source_map = SourceMap(source_code)
         try:
-            # 词法分析
-            self.log_compilation_stage("词法分析")
-            lexer = Lexer(source_code)
-            tokens = lexer.tokenize()
-
-            # 更新词法分析结果表
-            self.token_table.setRowCount(0)  # 清空表格
-            for i, token in enumerate(tokens):
-                self.token_table.insertRow(i)
-                self.token_table.setItem(i, 0, QTableWidgetItem(token.type))
-                self.token_table.setItem(i, 1, QTableWidgetItem(token.value))
-                self.token_table.setItem(i, 2, QTableWidgetItem(str(token.line)))
-                self.token_table.setItem(i, 3, QTableWidgetItem(str(token.column)))
-
-            # 语法分析
-            self.log_compilation_stage("语法分析")
-            parser_lexer = Lexer(source_code)
-            irgen = IRGenerator()
-            parser = myparser.Parser(parser_lexer, irgen)
-            ast = parser.parse_program()
+            # 词法分析：只重新扫描相对上一次编译发生变化的部分
+            self.log_compilation_stage("词法分析/语法分析")
+            tokens = []
+            lexical_errors = self.lex_source(source_code, tokens)
+            self.show_tokens(tokens)
+            if lexical_errors:
+                # 一次显示全部词法错误，不再进行语法分析
+                self.show_errors_in_output(lexical_errors)
+                self.statusBar().showMessage(
+                    f"编译失败: {len(lexical_errors)} 个词法错误"
+                )
+                return
+            hits, misses = self.incremental.hits, self.incremental.misses
+            ast = self.incremental.parse(tokens, source_code)
 
             # 确保AST不为空
             if ast is None:
                 raise Exception("语法分析生成的AST为空")
 
             self.log_to_console("语法分析成功，生成AST.\n")
+            self.log_to_console(
+                f"增量编译: 复用 {self.incremental.hits - hits} 个函数, "
+                f"重新解析 {self.incremental.misses - misses} 个函数\n"
+            )
             self.log_to_console("AST根节点: " + ast.__class__.__name__ + "\n")
 
             # 语义分析
             self.log_compilation_stage("语义分析")
-            semantic_analyzer = SemanticAnalyzer()
-            semantic_errors = semantic_analyzer.analyze(ast)
+            semantic_errors = self.incremental.analyze(self.source_map)
 
             # 显示错误和警告在输出框中
             self.show_errors_in_output(semantic_errors)
@@ -1944,6 +1891,7 @@ class CompilerGUI(QMainWindow):
             # 只更新AST树形视图
             self.ast_tree.clear()
             root_item = self.build_ast_tree(ast, self.ast_tree)
+            self.current_ast = ast
 
             # 只展开前几层，而不是所有节点
             self.expand_to_level(root_item, 3)  # 展开到第3层
@@ -1957,8 +1905,7 @@ class CompilerGUI(QMainWindow):
 
             # 中间代码生成
             self.log_compilation_stage("中间代码生成")
-            irgen.generate(ast)
-            ir_quads = irgen.quads
+            ir_quads = self.incremental.generate()
 
             # 更新中间代码表
             self.ir_table.setRowCount(0)  # 清空表格
@@ -2064,23 +2011,63 @@ class CompilerGUI(QMainWindow):
 
             import traceback
 
+    def lex_source(self, source_code, tokens):
+        """
+        对源代码做词法分析，结果追加到 tokens，返回词法错误列表。
+        若缓存了上一次编译的 Token，只重新扫描编辑位置附近直到 Token 流重新同步。
+        """
+        cache = self.token_cache
+        # 有词法错误时不缓存，缓存的 Token 中没有 ERROR Token，
+        # 增量扫描报告的 (编辑区域附近的) 词法错误即为全部错误
+        self.token_cache = None
+        if cache is not None:
+            old_text, old_tokens = cache
+            delta = relex(old_tokens, source_code, *diff_edit(old_text, source_code))
+            tokens.extend(delta.apply(old_tokens))
+            diagnostics = delta.diagnostics
+        else:
+            lexer = Lexer(source_code, recover=True)
+            tokens.extend(lexer.iter_tokens())
+            diagnostics = lexer.diagnostics
+        if diagnostics:
+            return diagnostics
+        self.token_cache = (source_code, tokens)
+        return []
+
+    def show_tokens(self, tokens):
+        """更新词法分析结果表"""
+        self.token_table.setRowCount(0)  # 清空表格
+        for i, token in enumerate(tokens):
+            self.token_table.insertRow(i)
+            self.token_table.setItem(i, 0, QTableWidgetItem(token.type))
+            self.token_table.setItem(i, 1, QTableWidgetItem(token.value))
+            self.token_table.setItem(i, 2, QTableWidgetItem(str(token.line)))
+            self.token_table.setItem(i, 3, QTableWidgetItem(str(token.column)))
+
     def format_detailed_parse_error(self, parse_error, source_code):
         """格式化详细的解析错误信息"""
         error_str = str(parse_error)
+        source_map = self.source_map
+        if source_map is None or source_map.text is not source_code:
+            source_map = SourceMap(source_code)
 
-        # 尝试从错误信息中提取行号和列号
+        # 优先使用错误记录的偏移量，否则从错误信息中提取行号和列号
         import re
 
-        location_match = re.search(r"L(\d+)C(\d+)", error_str)
+        location = None
+        if getattr(parse_error, "offset", None) is not None:
+            location = source_map.position(parse_error.offset)
+        else:
+            location_match = re.search(r"L(\d+)C(\d+)", error_str)
+            if location_match:
+                location = (int(location_match.group(1)), int(location_match.group(2)))
 
-        if location_match:
-            line_num = int(location_match.group(1))
-            col_num = int(location_match.group(2))
+        if location:
+            line_num, col_num = location
 
             # 获取错误行的内容
-            lines = source_code.split("\n")
-            if 1 <= line_num <= len(lines):
-                error_line = lines[line_num - 1]
+            if 1 <= line_num <= len(source_map):
+                error_line = source_map.line_text(line_num)
 
                 # 构建详细错误信息
                 detailed_info = f'<span style="color: #666;">位置: 第{line_num}行第{col_num}列</span><br/>'
@@ -2431,67 +2418,21 @@ class CompilerGUI(QMainWindow):
         else:
             main_label = "📦 " + main_label
 
-        # 提前收集所有子节点
+        # 提前收集所有子节点：按节点类声明的 _children 顺序，列表属性逐项展开
         children = []
-
-        # 检查集合类型的子节点
-        if hasattr(node, "children") and node.children:
-            children.extend(node.children)
-        if hasattr(node, "declarations") and node.declarations:
-            children.extend(node.declarations)
-        if hasattr(node, "statements") and node.statements:
-            children.extend(node.statements)
-        if hasattr(node, "items") and node.items:  # FunctionExprNode
-            children.extend(node.items)
-        if hasattr(node, "params") and node.params:
-            children.extend(node.params)
-        if hasattr(node, "tuple_types") and node.tuple_types:
-            children.extend(node.tuple_types)
-        if hasattr(node, "else_if_parts") and node.else_if_parts:
-            for part in node.else_if_parts:
-                if isinstance(part, dict):
-                    if "condition" in part:
-                        children.append(part["condition"])
-                    if "block" in part:
-                        children.append(part["block"])
-        if hasattr(node, "args") and node.args:  # 函数调用参数
-            children.extend(node.args)
-
-        # 检查单个子节点 - 这些应该作为子树展开，不是属性
-        single_child_attrs = [
-            "body",
-            "condition",
-            "then_block",
-            "else_block",
-            "expr",
-            "init_expr",
-            "array_type",
-            "ref_type",
-            "left",
-            "right",
-            "operand",
-            "callee",
-            "target",  # 赋值目标
-            "value",  # 赋值值
-            "init",  # 初始化表达式
-            "update",  # 更新表达式
-            "var_internal_decl",  # 变量内部声明
-            "var_type",  # 变量类型
-            "assignable_element",  # 赋值元素
-            "name_internal",  # 参数名内部
-            "param_type",  # 参数类型
-            "then_expr_block",  # if表达式的then块
-            "else_expr_block",  # if表达式的else块
-            "iterable",  # for循环的可迭代对象
-            "start_expr",  # 范围开始表达式
-            "end_expr",  # 范围结束表达式
-        ]
-
-        for attr in single_child_attrs:
-            if hasattr(node, attr):
-                child = getattr(node, attr)
-                if child is not None and isinstance(child, ASTNode):
-                    children.append(child)
+        for attr in node._children:
+            child = getattr(node, attr)
+            if isinstance(child, list):
+                for part in child:
+                    if isinstance(part, dict):
+                        # else if 分支: {'condition': 条件, 'block': 语句块}
+                        for key in ("condition", "block"):
+                            if part.get(key) is not None:
+                                children.append(part[key])
+                    elif isinstance(part, ASTNode):
+                        children.append(part)
+            elif isinstance(child, ASTNode):
+                children.append(child)
 
         # 如果有任何子节点，添加折叠指示符和子节点计数
         if children:
@@ -2598,22 +2539,11 @@ class CompilerGUI(QMainWindow):
 
         # 收集节点的属性（排除AST子节点）
         attrs = {}
-        for key, value in node.__dict__.items():
+        for key in node._fields:
+            value = getattr(node, key)
             if (
-                not isinstance(value, list)
-                and not key.startswith("_")
-                and key not in single_child_attrs
-                and key
-                not in [
-                    "children",
-                    "declarations",
-                    "statements",
-                    "params",
-                    "tuple_types",
-                    "else_if_parts",
-                    "items",
-                    "args",
-                ]
+                key not in node._children
+                and not isinstance(value, list)
                 and not isinstance(value, ASTNode)
             ):  # 排除AST节点
                 attrs[key] = value
@@ -2735,7 +2665,12 @@ class CompilerGUI(QMainWindow):
                 prefix = "错误"
                 color = "#e74c3c"  # 红色
 
-            location = f"第{error.line}行" if error.line else "未知位置"
+            if error.line and error.col:
+                location = f"第{error.line}行第{error.col}列"
+            elif error.line:
+                location = f"第{error.line}行"
+            else:
+                location = "未知位置"
 
             # 构建HTML格式的错误信息
             error_line = f'<span style="color: {color};">{icon} {prefix} ({location}): {error.message}</span>'
@@ -2798,17 +2733,21 @@ class CompilerGUI(QMainWindow):
         # 提取行号信息
         import re
 
-        match = re.search(r"第(\d+)行", line_text)
+        match = re.search(r"第(\d+)行(?:第(\d+)列)?", line_text)
         if match:
             line_number = int(match.group(1))
-            # 跳转到代码编辑器的对应行
-            self.goto_line(line_number)
+            column = int(match.group(2)) if match.group(2) else 1
+            # 跳转到代码编辑器的对应位置
+            self.goto_line(line_number, column)
 
-    def goto_line(self, line_number):
-        """跳转到代码编辑器的指定行"""
+    def goto_line(self, line_number, column=1):
+        """跳转到代码编辑器的指定行 (及列)"""
+        source_code = self.code_editor.toPlainText()
+        source_map = self.source_map
+        if source_map is None or source_map.text != source_code:
+            source_map = SourceMap(source_code)
         cursor = self.code_editor.textCursor()
-        cursor.movePosition(cursor.Start)
-        cursor.movePosition(cursor.Down, cursor.MoveAnchor, line_number - 1)
+        cursor.setPosition(source_map.offset_of(line_number, column))
         self.code_editor.setTextCursor(cursor)
         self.code_editor.centerCursor()
         self.code_editor.setFocus()
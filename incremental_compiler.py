@@ -0,0 +1,226 @@
+"""
+Description  : 按函数粒度的增量编译：以各函数 Token 切片的哈希为键缓存语法树、
+               语义分析结果与四元式，编辑后只重新编译内容发生变化的函数
+Author       : Hyoung
+Date         : 2026-10-17 16:32:08
+LastEditTime : 2026-10-17 16:32:08
+FilePath     : \\课程设计\\rust-like-compiler\\incremental_compiler.py
+"""
+
+import copy
+from hashlib import blake2b
+
+from ast_walker import run
+from ir_generator import GeneratedName, IRGenerator, Quadruple
+from lexer import TT_KEYWORD, TT_LBRACE, TT_RBRACE, TokenStream
+from parallel_compiler import myparser, renumber
+from parser_nodes import ProgramNode
+from semantic_analyzer import SemanticAnalyzer
+
+
+def split_function_tokens(tokens):
+    """
+    返回 Token 列表中各个顶层函数的起始下标 (花括号深度为 0 的 fn 关键字)，
+    与 parallel_compiler.split_functions 相同，只是作用于 Token 对象列表
+    """
+    if not tokens or tokens[0].type != TT_KEYWORD or tokens[0].value != "fn":
+        return []
+    starts = []
+    depth = 0
+    for index, token in enumerate(tokens):
+        if token.type == TT_LBRACE:
+            depth += 1
+        elif token.type == TT_RBRACE:
+            depth -= 1
+            if depth < 0:
+                # 多余的右花括号：顺序分析在此之前已经停止
+                break
+        elif depth == 0 and token.type == TT_KEYWORD and token.value == "fn":
+            starts.append(index)
+    return starts
+
+
+def slice_key(text, first, boundary):
+    """
+    函数 Token 切片的缓存键：切片覆盖的源代码文本及首个 Token 的列号。
+    从 Token 起点开始的词法分析结果只取决于这段文本，因此键相同即切片中各 Token 的
+    类型、值、列号以及相对首个 Token 的行号与偏移量都相同；函数整体上下平移
+    (上方插入或删除若干行) 时键不变。文本的切片与哈希都在 C 层完成，
+    比逐个 Token 组成元组快得多。
+    """
+    return first.column, text[first.offset : boundary.offset]
+
+
+def numbering_slots(quads):
+    """
+    找出四元式中需要平移编号的操作数 (IRGenerator 生成的临时变量与标签，即 GeneratedName)，
+    返回 [(四元式下标, ((字段下标, 前缀, 编号), ...))]；
+    列表类型的字段前缀为 None，平移时交给 renumber 处理
+    """
+    slots = []
+    for index, quad in enumerate(quads):
+        fields = []
+        for field, value in enumerate(quad):
+            if isinstance(value, GeneratedName):
+                fields.append((field, value[0], int(value[1:])))
+            elif isinstance(value, list):
+                fields.append((field, None, 0))
+        if fields:
+            slots.append((index, tuple(fields)))
+    return slots
+
+
+class CachedFunction:
+    """一个函数的缓存项"""
+
+    def __init__(self, tokens, decl, stopped):
+        self.tokens = tokens  # 语法树引用的 Token 所在的切片
+        self.decl = decl  # FunctionDeclNode
+        self.stopped = stopped  # 函数之后不是 fn，顺序分析在此停止
+        self.semantic_key = None  # 上一次语义分析时的全局函数表摘要
+        self.errors = []  # (错误, 相对行号, 相对偏移量)
+        self.quads = None  # 函数内从 0 编号的四元式
+        self.slots = None  # 需要平移编号的操作数位置 (见 numbering_slots)
+        self.temp_count = 0
+        self.label_count = 0
+        self.numbered = None  # (临时变量基数, 标签基数, 平移编号后的四元式)
+
+    def rebase(self, tokens):
+        """切片内容相同但位置不同时，把新 Token 的位置写回语法树引用的旧 Token"""
+        old_first, new_first = self.tokens[0], tokens[0]
+        if old_first.offset == new_first.offset and old_first.line == new_first.line:
+            # 内容相同的切片整体平移，首个 Token 未动则全部未动
+            # (增量词法分析原地平移的旧 Token 与新列表中的是同一个对象)
+            return
+        for old, new in zip(self.tokens, tokens):
+            old.line = new.line
+            old.column = new.column
+            old.offset = new.offset
+
+
+class IncrementalCompiler:
+    """
+    按函数缓存的编译器前端 (供 GUI 在每次编辑后重新编译使用)。
+    parse、analyze、generate 依次调用，结果与顺序执行 parse_program、
+    SemanticAnalyzer.analyze 和 IRGenerator.generate 完全一致：
+    - 语法树：Token 切片的键命中时直接复用上一次的 FunctionDeclNode
+    - 语义分析：函数的检查结果还取决于它之前声明的函数，
+      因此另以之前各函数签名的摘要为键，两者都未变时复用诊断信息
+    - 中间代码：按函数生成并缓存，临时变量与标签按函数顺序平移编号
+    """
+
+    def __init__(self):
+        self.cache = {}  # 切片键 -> CachedFunction
+        self.functions = []  # 本次编译按顺序的各函数缓存项
+        self.hits = 0  # 复用语法树的函数数 (累计)
+        self.misses = 0  # 重新解析的函数数 (累计)
+
+    def parse(self, tokens, text):
+        """
+        语法分析，返回 ProgramNode；语法错误时抛出与 parse_program 相同的 ParseError
+        :param tokens: text 的完整 Token 列表 (以 EOF 结尾，offset 有效)
+        :param text: 源代码
+        """
+        self.functions = []
+        starts = split_function_tokens(tokens)
+        if starts:
+            starts.append(len(tokens) - 1)
+        used = set()
+        cache = {}
+        for start, stop in zip(starts, starts[1:]):
+            part = tokens[start:stop]
+            key = slice_key(text, tokens[start], tokens[stop])
+            entry = self.cache.get(key)
+            if entry is not None and id(entry) not in used:
+                entry.rebase(part)
+                self.hits += 1
+            else:
+                # 未命中，或同一程序中出现了完全相同的函数 (语法树不能共用)
+                parser = myparser.Parser(TokenStream(tokens[start : stop + 1]))
+                decl = run(parser.parse_function_decl())
+                entry = CachedFunction(
+                    part, decl, parser.current_token is not tokens[stop]
+                )
+                self.misses += 1
+            used.add(id(entry))
+            cache[key] = entry
+            self.functions.append(entry)
+            if entry.stopped:
+                break
+        # 只保留本次程序中的函数，被删除或修改前的旧版本随之释放
+        self.cache = cache
+        return ProgramNode([entry.decl for entry in self.functions])
+
+    def analyze(self, source_map=None):
+        """对最近一次 parse 的结果做语义分析，返回错误列表"""
+        analyzer = SemanticAnalyzer()
+        global_scope = analyzer.symbol_table.scopes[0]
+        digest = blake2b(digest_size=16)
+        errors = []
+        for entry in self.functions:
+            symbol = analyzer.function_symbol(entry.decl)
+            # 与同名的先前函数冲突时，诊断信息中包含其所在行
+            previous = global_scope.get(symbol.name)
+            key = (digest.digest(), previous and previous.line)
+
+            first = entry.tokens[0]
+            if entry.semantic_key != key:
+                analyzer.walk(entry.decl)
+                entry.errors = [
+                    (
+                        error,
+                        None if error.line is None else error.line - first.line,
+                        None if error.offset is None else error.offset - first.offset,
+                    )
+                    for error in analyzer.symbol_table.errors
+                ]
+                analyzer.symbol_table.clear_errors()
+                entry.semantic_key = key
+            else:
+                analyzer.declare_functions([symbol])
+
+            for error, line, offset in entry.errors:
+                error = copy.copy(error)
+                if line is not None:
+                    error.line = first.line + line
+                if offset is not None:
+                    error.offset = first.offset + offset
+                if source_map is not None:
+                    error.locate(source_map)
+                errors.append(error)
+
+            digest.update(repr((symbol.name, symbol.type, symbol.param_types)).encode())
+        return errors
+
+    def generate(self):
+        """为最近一次 parse 的结果生成中间代码，返回四元式列表"""
+        quads = []
+        temp_base = label_base = 0
+        for entry in self.functions:
+            if entry.quads is None:
+                irgen = IRGenerator()
+                entry.quads = irgen.generate(entry.decl)
+                entry.slots = numbering_slots(entry.quads)
+                entry.temp_count = irgen.temp_count
+                entry.label_count = irgen.label_count
+                entry.numbered = None
+            numbered = entry.numbered
+            if numbered is None or numbered[:2] != (temp_base, label_base):
+                # 前面函数的临时变量或标签个数变了，只改写记录下来的操作数
+                function_quads = list(entry.quads)
+                for index, fields in entry.slots:
+                    quad = list(function_quads[index])
+                    for field, prefix, number in fields:
+                        if prefix == "t":
+                            quad[field] = GeneratedName(f"t{number + temp_base}")
+                        elif prefix == "L":
+                            quad[field] = GeneratedName(f"L{number + label_base}")
+                        else:
+                            quad[field] = renumber(quad[field], temp_base, label_base)
+                    function_quads[index] = Quadruple._make(quad)
+                numbered = (temp_base, label_base, function_quads)
+                entry.numbered = numbered
+            quads.extend(numbered[2])
+            temp_base += entry.temp_count
+            label_base += entry.label_count
+        return quads
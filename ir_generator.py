@@ -14,6 +14,7 @@ from collections import namedtuple
 # 确保你的 parser_nodes 和 lexer 文件在 Python 路径中
 from parser_nodes import *
 from lexer import *  # 导入 TT_* 常量
+from ast_walker import ASTVisitor
 
 # 定义四元式结构
 # op: 操作符 (字符串)
@@ -23,9 +24,25 @@ from lexer import *  # 导入 TT_* 常量
 Quadruple = namedtuple("Quadruple", ["op", "arg1", "arg2", "result"])
 
 
-class IRGenerator:
+class GeneratedName(str):
+    """
+    由 new_temp / new_label 生成的临时变量名与标签名。
+    与普通字符串相等、输出相同，用于区分同名的用户变量 (如名为 t0、L1 的变量)，
+    并行编译与增量编译只对这类操作数重新编号。
+    """
+
+    __slots__ = ()
+
+
+class IRGenerator(ASTVisitor):
     """
     通过访问 AST 节点生成四元式中间代码。
+    含子节点的 visit 方法是生成器，由 ASTVisitor.walk 在显式栈上执行，
+    因此嵌套再深也不会耗尽 Python 调用栈。
+
+    四元式由下方的语法制导翻译方法 (binary、if_begin 等) 生成：visit 方法求出子节点的值后
+    调用它们；单遍编译时 (Parser(lexer, irgen)) 语法分析器在归约相应产生式时直接调用，
+    不构造语法树，两种方式生成的四元式完全相同。
     """
 
     def __init__(self):
@@ -38,13 +55,13 @@ class IRGenerator:
 
     def new_temp(self):
         """生成一个新的唯一的临时变量名"""
-        temp_name = f"t{self.temp_count}"
+        temp_name = GeneratedName(f"t{self.temp_count}")
         self.temp_count += 1
         return temp_name
 
     def new_label(self):
         """生成一个新的唯一的标签名"""
-        label_name = f"L{self.label_count}"
+        label_name = GeneratedName(f"L{self.label_count}")
         self.label_count += 1
         return label_name
 
@@ -83,67 +100,297 @@ class IRGenerator:
         self.temp_count = 0
         self.label_count = 0
         self.loop_stack = []
-        self.visit(node)
+        self.walk(node)
         return self.quads
 
-    # --- 访问者方法 ---
-    def visit(self, node):
-        """调度到特定节点类型的访问方法 (Visitor Pattern)"""
-        if node is None:
+    # --- 语法制导翻译 ---
+    # 以下方法的参数是子结构已经翻译得到的值 (常量、变量名或临时变量名)，
+    # 表达式方法返回结果所在的操作数，语句方法返回 None。
+    # 控制结构分为若干步，在子结构之间生成跳转与标签，各步之间以 begin 返回的上下文传递标签。
+    # 方法名与参数同 parser.ASTBuilder 一一对应，语法分析器对两者的调用方式完全相同。
+
+    # 二元运算符 Token 类型 -> 四元式操作符
+    BINARY_OPS = {
+        TT_PLUS: "ADD",
+        TT_MINUS: "SUB",
+        TT_MUL: "MUL",
+        TT_DIV: "DIV",
+        TT_MOD: "MOD",  # 添加对模运算的支持
+        TT_EQ: "EQ",
+        TT_NE: "NE",
+        TT_LT: "LT",
+        TT_LTE: "LTE",
+        TT_GT: "GT",
+        TT_GTE: "GTE",
+        # TODO: 添加逻辑运算符 (AND, OR) 的处理，可能涉及短路求值和跳转
+    }
+
+    def program(self, declarations):
+        return None
+
+    def function_begin(self, name_token, params, return_type):
+        # 操作符, 函数名, 参数个数, None
+        self.emit("FUNC_BEGIN", name_token.value, len(params), None)
+
+    def function_end(self, name_token, params, return_type, body):
+        # （可选）如果函数声明了非 void 返回类型但没有显式 return，可能需要添加隐式 return 或报错
+        # 简化处理：仅添加结束标记
+        self.emit("FUNC_END", name_token.value, None, None)
+
+    def block(self, statements):
+        # 此处简化为语句块不返回值
+        return None
+
+    def function_expr(self, statements):
+        # 语法分析器生成的函数表达式块只包含语句，块的值为空
+        return None
+
+    def empty_statement(self):
+        # 空语句不生成代码
+        return None
+
+    def let_decl(self, var_internal, var_type):
+        # 没有初始化表达式的声明不生成代码
+        return None
+
+    def let_init(self, var_internal, var_type, value):
+        # 将初始值赋给变量
+        self.emit("ASSIGN", value, None, var_internal.name.value)
+
+    def assign(self, name_token, value):
+        self.emit("ASSIGN", value, None, name_token.value)
+
+    def return_statement(self, value=None):
+        # 操作符, 返回值(或None), None, None
+        self.emit("RETURN", value, None, None)
+
+    def expr_statement(self, value):
+        # 表达式的结果被忽略（例如，调用函数只为了副作用）
+        return None
+
+    def break_statement(self):
+        if not self.loop_stack:
+            print("严重错误: Break 在循环外 (IR 生成阶段)")  # 语义分析应已捕获
+            return
+        break_label = self.loop_stack[-1][1]  # 获取 break 跳转目标 (end_label)
+        self.emit("GOTO", None, None, break_label)
+
+    def continue_statement(self):
+        if not self.loop_stack:
+            print("严重错误: Continue 在循环外 (IR 生成阶段)")  # 语义分析应已捕获
+            return
+        # 获取 continue 跳转目标 (start_label 或 increment_label)
+        self.emit("GOTO", None, None, self.loop_stack[-1][0])
+
+    def number(self, token):
+        # 数字常量直接返回其值
+        return token.value
+
+    def identifier(self, token):
+        # 标识符（变量）返回其名称
+        return token.value
+
+    def binary(self, left, op_token, right):
+        ir_op = self.BINARY_OPS.get(op_token.type)
+        if ir_op is None:
+            print(f"错误: 未处理的二元运算符 {op_token.value}")
+            return None  # 表示错误或未知结果
+        # 结果存入新的临时变量，返回其名称
+        result_temp = self.new_temp()
+        self.emit(ir_op, left, right, result_temp)
+        return result_temp
+
+    def unary(self, op_token, operand):
+        result_temp = self.new_temp()
+        if op_token.type == TT_MINUS:
+            # 一元负号
+            self.emit("NEG", operand, None, result_temp)  # NEG: 取负操作
+        # elif op_token.type == TT_NOT: # 假设有逻辑非
+        #     self.emit('NOT', operand, None, result_temp)
+        else:
+            print(f"错误: 未处理的一元运算符 {op_token.value}")
             return None
-        method_name = "visit_" + type(node).__name__
-        # 获取对应节点类型的 visit 方法，如果找不到，则使用 generic_visit
-        visitor = getattr(self, method_name, self.generic_visit)
-        # print(f"Visiting: {type(node).__name__} with {visitor.__name__}") # 调试信息
-        return visitor(node)
+        return result_temp
+
+    def call(self, name_token, args):
+        return self.emit_call(name_token.value, args)
+
+    def emit_call(self, func_name, args):
+        """实参逆序压栈后调用，返回值存入新的临时变量"""
+        for arg_val in reversed(args):
+            self.emit("PARAM", arg_val, None, None)
+        result_temp = self.new_temp()
+        self.emit("CALL", func_name, len(args), result_temp)
+        return result_temp
+
+    # if 语句的上下文为 [当前条件为假时的跳转目标, 整个 if-else 结构结束后的标签]
+    def if_begin(self, condition):
+        label_after_then = self.new_label()  # if 为 false 时跳转的目标
+        label_after_if_else = self.new_label()  # 整个 if-else 结构结束后的目标
+        self.emit("IF_FALSE_GOTO", condition, None, label_after_then)
+        return [label_after_then, label_after_if_else]
+
+    def if_then_end(self, context, has_else):
+        # then 块结束后无条件跳转到 if-else 结束处 (如果后面有 else/else if)
+        if has_else:
+            self.emit("GOTO", None, None, context[1])
+
+    def else_if_begin(self, context):
+        # 放置上一个 false 跳转的目标标签
+        self.emit("LABEL", None, None, context[0])
+
+    def else_if_condition(self, context, condition):
+        # 创建下一个 false 跳转标签
+        context[0] = self.new_label()
+        self.emit("IF_FALSE_GOTO", condition, None, context[0])
+
+    def else_if_end(self, context):
+        # else if 块结束后无条件跳转到 if-else 结束处
+        self.emit("GOTO", None, None, context[1])
+
+    def else_begin(self, context):
+        # 放置最后一个 false 跳转的目标标签，else 块自然执行到结束处，无需 GOTO
+        self.emit("LABEL", None, None, context[0])
+        context[0] = None
+
+    def if_end(self, context, condition, then_block, else_if_parts, else_block):
+        if context[0] is not None:
+            self.emit("LABEL", None, None, context[0])
+        # 放置整个 if-else 结构结束后的标签
+        self.emit("LABEL", None, None, context[1])
+
+    def while_begin(self):
+        # 循环开始（条件判断前）和循环结束的标签入栈，
+        # continue 跳转到 label_loop_start, break 跳转到 label_loop_end
+        label_loop_start = self.new_label()
+        label_loop_end = self.new_label()
+        self.loop_stack.append((label_loop_start, label_loop_end))
+        self.emit("LABEL", None, None, label_loop_start)
+        return label_loop_start, label_loop_end
+
+    def while_condition(self, context, condition):
+        # 如果条件为假，跳转到循环结束标签
+        self.emit("IF_FALSE_GOTO", condition, None, context[1])
+
+    def while_end(self, context, condition, body):
+        # 循环体结束后，无条件跳转回循环开始处进行下一次条件判断
+        self.emit("GOTO", None, None, context[0])
+        self.emit("LABEL", None, None, context[1])
+        self.loop_stack.pop()
+
+    # for 循环展开为 while 循环:
+    # let mut iter_var = start;
+    # while iter_var < end {
+    #     let var = iter_var;
+    #     { body }
+    #     iter_var = iter_var + 1;
+    # }
+    # 上下文为 [迭代计数器, 循环开始标签, 递增标签, 循环结束标签]
+    def for_begin(self):
+        return [self.new_temp()]  # 用作迭代计数器
+
+    def for_range(self, context, var_internal, start, end):
+        loop_counter_temp = context[0]
+        self.emit("ASSIGN", start, None, loop_counter_temp)
+        label_loop_start = self.new_label()
+        label_loop_end = self.new_label()
+        label_increment = self.new_label()  # continue 跳转到增量的地方
+        self.loop_stack.append((label_increment, label_loop_end))
+        context += [label_loop_start, label_increment, label_loop_end]
+
+        self.emit("LABEL", None, None, label_loop_start)
+        # 条件判断: iter_var < end
+        condition_temp = self.new_temp()
+        self.emit("LT", loop_counter_temp, end, condition_temp)
+        self.emit("IF_FALSE_GOTO", condition_temp, None, label_loop_end)
+        # 在循环体内 "声明" 循环变量 (实际是赋值)
+        self.emit("ASSIGN", loop_counter_temp, None, var_internal.name.value)
+
+    def for_end(self, context, var_internal, start, end, body):
+        loop_counter_temp, label_loop_start, label_increment, label_loop_end = context
+        # continue 跳转点: 递增计数器，跳转回循环开始
+        self.emit("LABEL", None, None, label_increment)
+        self.emit("ADD", loop_counter_temp, 1, loop_counter_temp)
+        self.emit("GOTO", None, None, label_loop_start)
+        self.emit("LABEL", None, None, label_loop_end)
+        self.loop_stack.pop()
+
+    def loop_begin(self):
+        # 无条件循环 loop { body }，continue 跳转目标是循环开始
+        label_loop_start = self.new_label()
+        label_loop_end = self.new_label()  # break 跳转目标
+        self.loop_stack.append((label_loop_start, label_loop_end))
+        self.emit("LABEL", None, None, label_loop_start)
+        return label_loop_start, label_loop_end
+
+    def loop_end(self, context, body):
+        self.emit("GOTO", None, None, context[0])  # 无条件跳回开始
+        self.emit("LABEL", None, None, context[1])
+        self.loop_stack.pop()
+
+    # 选择表达式的上下文为 (else 标签, 结束标签, 结果临时变量)
+    def if_expr_begin(self, condition):
+        then_label = self.new_label()
+        else_label = self.new_label()
+        end_label = self.new_label()
+        self.emit("IF_FALSE_GOTO", condition, None, else_label)
+        self.emit("LABEL", None, None, then_label)
+        return [else_label, end_label, None]
+
+    def if_expr_else(self, context, then_value):
+        result_temp = self.new_temp()
+        context[2] = result_temp
+        self.emit("ASSIGN", then_value, None, result_temp)
+        self.emit("GOTO", None, None, context[1])
+        self.emit("LABEL", None, None, context[0])
+
+    def if_expr_end(self, context, condition, then_value, else_value):
+        self.emit("ASSIGN", else_value, None, context[2])
+        self.emit("LABEL", None, None, context[1])
+        return context[2]
+
+    # 语法分析器推测分析失败回溯时，撤销此后生成的四元式
+    def checkpoint(self):
+        return len(self.quads), self.temp_count, self.label_count, list(self.loop_stack)
+
+    def rollback(self, checkpoint):
+        count, self.temp_count, self.label_count, loop_stack = checkpoint
+        del self.quads[count:]
+        self.loop_stack[:] = loop_stack
+
+    # --- 访问者方法 ---
+    # visit(node) 由 ASTVisitor 提供：按调度表调用 visit_<节点类名>，找不到时使用 generic_visit
 
     def generic_visit(self, node):
         """处理未明确实现 visit 方法的 AST 节点"""
         # print(f"警告: 没有为 {type(node).__name__} 节点类型实现特定的 visit 方法。")
-        # 默认行为：递归访问子节点（如果它们是 ASTNode 或列表）
+        # 默认行为：按节点类声明的 _children 顺序递归访问子节点（ASTNode 或其列表）
         if isinstance(node, ASTNode):
-            for attr_name in vars(node):
-                if attr_name.startswith("_"):
-                    continue  # 跳过内部属性
+            for attr_name in node._children:
                 attr_value = getattr(node, attr_name)
                 if isinstance(attr_value, list):
                     for item in attr_value:
                         if isinstance(item, ASTNode):
-                            self.visit(item)
+                            yield self.visit(item)
                 elif isinstance(attr_value, ASTNode):
-                    self.visit(attr_value)
+                    yield self.visit(attr_value)
         return None  # 通常，通用访问不返回 IR 值
 
     # --- 程序结构 ---
     def visit_ProgramNode(self, node: ProgramNode):
         for decl in node.declarations:
-            self.visit(decl)
+            yield self.visit(decl)
 
     def visit_FunctionDeclNode(self, node: FunctionDeclNode):
-        func_name = node.name  # 使用修改后的 name 属性，它已经是字符串了
-        param_count = len(node.params)
-        self.emit(
-            "FUNC_BEGIN", func_name, param_count, None
-        )  # 操作符, 函数名, 参数个数, None
-
-        # （可选）为参数生成 PARAM_DECL 四元式，如果后端需要
-        # for param in node.params:
-        #     param_name = param.name_internal.name.value
-        #     self.emit('PARAM_DECL', param_name, None, None)
-
+        self.function_begin(node.token, node.params, node.return_type)
         # 访问函数体
-        self.visit(node.body)
-
-        # 确保函数有结束标记
-        # （可选）如果函数声明了非 void 返回类型但没有显式 return，可能需要添加隐式 return 或报错
-        # 简化处理：仅添加结束标记
-
-        self.emit("FUNC_END", func_name, None, None)
+        yield self.visit(node.body)
+        self.function_end(node.token, node.params, node.return_type, node.body)
 
     def visit_BlockNode(self, node: BlockNode):
         # 顺序访问块内的所有语句
         for stmt in node.statements:
-            self.visit(stmt)
+            yield self.visit(stmt)
         # 如果要支持 Rust 风格的块表达式返回值：
         # 需要检查最后一条语句是否是表达式且无分号，
         # 如果是，则其结果是块的结果（需要解析器配合标记）
@@ -155,32 +402,26 @@ class IRGenerator:
         pass
 
     def visit_LetDeclNode(self, node: LetDeclNode):
-        var_name = node.var_internal_decl.name.value
-        # 可选：发出声明四元式，如果目标代码需要显式声明
-        # self.emit('DECLARE', var_name, type_info, None)
-
         if node.init_expr:
             # 计算初始化表达式的值，结果可能是常量或临时变量
-            init_value = self.visit(node.init_expr)
-            # 将初始值赋给变量
-            self.emit("ASSIGN", init_value, None, var_name)
+            init_value = yield self.visit(node.init_expr)
+            self.let_init(node.var_internal_decl, node.var_type, init_value)
 
     def visit_AssignNode(self, node: AssignNode):
         # 1. 计算右侧表达式的值
-        rhs_value = self.visit(node.expr)
+        rhs_value = yield self.visit(node.expr)
 
         # 2. 处理左侧可赋值元素
         if isinstance(node.assignable_element, IdentifierNode):
-            # 简单变量赋值，通过token.value获取变量名
-            lvalue_name = node.assignable_element.token.value
-            self.emit("ASSIGN", rhs_value, None, lvalue_name)
+            # 简单变量赋值
+            self.assign(node.assignable_element.token, rhs_value)
 
         elif isinstance(node.assignable_element, ArrayAccessNode):
             # 数组元素赋值 a[i] = val
-            array_ref = self.visit(
+            array_ref = yield self.visit(
                 node.assignable_element.array_expr
             )  # 数组名或基址临时变量
-            index_val = self.visit(
+            index_val = yield self.visit(
                 node.assignable_element.index_expr
             )  # 索引值或临时变量
             # 需要特定指令或地址计算
@@ -190,7 +431,7 @@ class IRGenerator:
 
         elif isinstance(node.assignable_element, TupleAccessNode):
             # 元组元素赋值 t.0 = val
-            tuple_ref = self.visit(
+            tuple_ref = yield self.visit(
                 node.assignable_element.tuple_expr
             )  # 元组名或基址临时变量
             index_val = int(node.assignable_element.index_token.value)  # 直接索引值
@@ -207,81 +448,34 @@ class IRGenerator:
         return_value = None
         if node.expr:
             # 计算返回值表达式
-            return_value = self.visit(node.expr)
-        # 发出返回四元式
-        self.emit(
-            "RETURN", return_value, None, None
-        )  # 操作符, 返回值(或None), None, None
+            return_value = yield self.visit(node.expr)
+        self.return_statement(return_value)
 
     def visit_ExprStatementNode(self, node: ExprStatementNode):
         # 计算表达式，但忽略其结果（例如，调用函数只为了副作用）
-        self.visit(node.expr)
+        yield self.visit(node.expr)
 
     # --- 表达式 ---
     def visit_NumberNode(self, node: NumberNode):
-        # 数字常量直接返回其值
-        return node.value
+        return self.number(node.token)
 
     def visit_BooleanLiteralNode(self, node: BooleanLiteralNode):
         # 布尔常量返回其值 (True/False) 或整数表示 (1/0)
         return 1 if node.value else 0  # 使用 1/0 便于条件跳转
 
     def visit_IdentifierNode(self, node: IdentifierNode):
-        # 标识符（变量）返回其名称
-        return node.token.value
+        return self.identifier(node.token)
 
     def visit_BinaryOpNode(self, node: BinaryOpNode):
         # 1. 计算左操作数
-        left_operand = self.visit(node.left)
+        left_operand = yield self.visit(node.left)
         # 2. 计算右操作数
-        right_operand = self.visit(node.right)
-        # 3. 创建一个新的临时变量来存储结果
-        result_temp = self.new_temp()
-
-        # 4. 映射词法单元类型到四元式操作符
-        op_map = {
-            TT_PLUS: "ADD",
-            TT_MINUS: "SUB",
-            TT_MUL: "MUL",
-            TT_DIV: "DIV",
-            TT_MOD: "MOD",  # 添加对模运算的支持
-            TT_EQ: "EQ",
-            TT_NE: "NE",
-            TT_LT: "LT",
-            TT_LTE: "LTE",
-            TT_GT: "GT",
-            TT_GTE: "GTE",
-            # TODO: 添加逻辑运算符 (AND, OR) 的处理，可能涉及短路求值和跳转
-        }
-        ir_op = op_map.get(node.op_token.type)
-
-        if ir_op:
-            # 5. 发出计算四元式
-            self.emit(ir_op, left_operand, right_operand, result_temp)
-            # 6. 返回存储结果的临时变量名
-            return result_temp
-        else:
-            print(f"错误: 未处理的二元运算符 {node.op_token.value}")
-            return None  # 表示错误或未知结果
+        right_operand = yield self.visit(node.right)
+        return self.binary(left_operand, node.op_token, right_operand)
 
     def visit_UnaryOpNode(self, node: UnaryOpNode):
-        # 1. 计算操作数
-        operand = self.visit(node.expr)
-        # 2. 创建临时变量存结果
-        result_temp = self.new_temp()
-
-        # 3. 根据操作符发出四元式
-        if node.op_token.type == TT_MINUS:
-            # 一元负号
-            self.emit("NEG", operand, None, result_temp)  # NEG: 取负操作
-        # elif node.op_token.type == TT_NOT: # 假设有逻辑非
-        #     self.emit('NOT', operand, None, result_temp)
-        else:
-            print(f"错误: 未处理的一元运算符 {node.op_token.value}")
-            return None
-
-        # 4. 返回结果临时变量
-        return result_temp
+        operand = yield self.visit(node.expr)
+        return self.unary(node.op_token, operand)
 
     def visit_FunctionCallNode(self, node: FunctionCallNode):
         # 从函数表达式获取函数名
@@ -289,187 +483,64 @@ class IRGenerator:
             func_name = node.func_expr.token.value
         else:
             func_name = str(node.func_expr)
-        arg_values = [self.visit(arg) for arg in node.args]
-        for arg_val in reversed(arg_values):
-            self.emit("PARAM", arg_val, None, None)
-        result_temp = self.new_temp()
-        self.emit("CALL", func_name, len(arg_values), result_temp)
-        return result_temp
+        arg_values = []
+        for arg in node.args:
+            arg_values.append((yield self.visit(arg)))
+        return self.emit_call(func_name, arg_values)
 
     # --- 控制流 ---
     def visit_IfNode(self, node: IfNode):
-        # --- 处理主 if ---
-        # 1. 计算条件表达式
-        condition_result = self.visit(node.condition)
-        # 2. 创建标签
-        label_after_then = self.new_label()  # if 为 false 时跳转的目标
-        label_after_if_else = self.new_label()  # 整个 if-else 结构结束后的目标
-
-        # 3. 发出条件跳转
-        self.emit("IF_FALSE_GOTO", condition_result, None, label_after_then)
-        # 4. 访问 then 块
-        self.visit(node.then_block)
-        # 5. then 块结束后无条件跳转到 if-else 结束处 (如果后面有 else/else if)
-        if node.else_if_parts or node.else_block:
-            self.emit("GOTO", None, None, label_after_if_else)
-
-        # --- 处理 else if ---
-        current_false_label = label_after_then  # 第一个 false 跳转目标
-        for i, part in enumerate(node.else_if_parts):
-            # 放置上一个 false 跳转的目标标签
-            self.emit("LABEL", None, None, current_false_label)
-            # 计算 else if 的条件
-            elseif_cond_result = self.visit(part["condition"])
-            # 创建下一个 false 跳转标签
-            next_false_label = self.new_label()
-            # 发出条件跳转
-            self.emit("IF_FALSE_GOTO", elseif_cond_result, None, next_false_label)
-            # 访问 else if 块
-            self.visit(part["block"])
-            # else if 块结束后无条件跳转到 if-else 结束处
-            self.emit("GOTO", None, None, label_after_if_else)
-            # 更新当前 false 跳转目标为下一个
-            current_false_label = next_false_label
-
-        # --- 处理 else ---
-        # 放置最后一个 false 跳转的目标标签
-        self.emit("LABEL", None, None, current_false_label)
+        condition_result = yield self.visit(node.condition)
+        context = self.if_begin(condition_result)
+        yield self.visit(node.then_block)
+        self.if_then_end(context, bool(node.else_if_parts or node.else_block))
+        for part in node.else_if_parts:
+            self.else_if_begin(context)
+            elseif_cond_result = yield self.visit(part["condition"])
+            self.else_if_condition(context, elseif_cond_result)
+            yield self.visit(part["block"])
+            self.else_if_end(context)
         if node.else_block:
-            # 访问 else 块
-            self.visit(node.else_block)
-            # else 块自然执行到 if-else 结束处，无需 GOTO
-
-        # 放置整个 if-else 结构结束后的标签
-        self.emit("LABEL", None, None, label_after_if_else)
+            self.else_begin(context)
+            yield self.visit(node.else_block)
+        self.if_end(
+            context,
+            node.condition,
+            node.then_block,
+            node.else_if_parts,
+            node.else_block,
+        )
 
     def visit_WhileNode(self, node: WhileNode):
-        # 1. 创建循环开始（条件判断前）和循环结束的标签
-        label_loop_start = self.new_label()
-        label_loop_end = self.new_label()
-
-        # 2. 将标签入栈，供 break/continue 使用
-        # (continue 跳转到 label_loop_start, break 跳转到 label_loop_end)
-        self.loop_stack.append((label_loop_start, label_loop_end))
-
-        # 3. 放置循环开始标签
-        self.emit("LABEL", None, None, label_loop_start)
-        # 4. 计算循环条件
-        condition_result = self.visit(node.condition)
-        # 5. 如果条件为假，跳转到循环结束标签
-        self.emit("IF_FALSE_GOTO", condition_result, None, label_loop_end)
-        # 6. 访问循环体
-        self.visit(node.body)
-        # 7. 循环体结束后，无条件跳转回循环开始处进行下一次条件判断
-        self.emit("GOTO", None, None, label_loop_start)
-        # 8. 放置循环结束标签
-        self.emit("LABEL", None, None, label_loop_end)
-
-        # 9. 循环结束，将标签出栈
-        self.loop_stack.pop()
+        context = self.while_begin()
+        condition_result = yield self.visit(node.condition)
+        self.while_condition(context, condition_result)
+        yield self.visit(node.body)
+        self.while_end(context, node.condition, node.body)
 
     def visit_ForNode(self, node: ForNode):
-        # 语法：for var in start..end { body }
-        # desugar 成 while 循环:
-        # let mut iter_var = start;
-        # let end_val = end;
-        # while iter_var < end_val {
-        #     let var = iter_var; // shadowing or direct use
-        #     { body }
-        #     iter_var = iter_var + 1;
-        # }
-
-        # 1. 获取循环变量名 (内部用，不直接暴露给 body，除非 body 里重声明)
-        loop_counter_temp = self.new_temp()  # 用作迭代计数器
-        loop_var_name = node.var_internal_decl.name.value  # 用户指定的变量名
-
-        # 2. 计算起始值和结束值
-        start_val = self.visit(node.iterable.start_expr)
-        end_val = self.visit(node.iterable.end_expr)
-
-        # 3. 初始化计数器
-        self.emit("ASSIGN", start_val, None, loop_counter_temp)
-
-        # 4. 创建循环标签
-        label_loop_start = self.new_label()
-        label_loop_end = self.new_label()
-
-        # 5. 循环标签入栈
-        self.loop_stack.append(
-            (label_loop_start, label_loop_end)
-        )  # continue 回到增量前，break 跳出
-
-        label_increment = self.new_label()  # continue 跳转到增量的地方
-        self.loop_stack[-1] = (label_increment, label_loop_end)  # 更新 continue 目标
-
-        # 6. 循环开始标签
-        self.emit("LABEL", None, None, label_loop_start)
-
-        # 7. 条件判断: iter_var < end_val
-        condition_temp = self.new_temp()
-        self.emit("LT", loop_counter_temp, end_val, condition_temp)  # t = counter < end
-        self.emit(
-            "IF_FALSE_GOTO", condition_temp, None, label_loop_end
-        )  # if !t goto end
-
-        # 8. 在循环体内 "声明" 循环变量 (实际是赋值)
-        self.emit("ASSIGN", loop_counter_temp, None, loop_var_name)
-
-        # 9. 访问循环体
-        self.visit(node.body)
-
-        # 10. continue 跳转点: 递增计数器
-        self.emit("LABEL", None, None, label_increment)
-        self.emit(
-            "ADD", loop_counter_temp, 1, loop_counter_temp
-        )  # counter = counter + 1
-
-        # 11. 跳转回循环开始
-        self.emit("GOTO", None, None, label_loop_start)
-
-        # 12. 循环结束标签
-        self.emit("LABEL", None, None, label_loop_end)
-
-        # 13. 循环标签出栈
-        self.loop_stack.pop()
+        # 语法：for var in start..end { body }，展开为以临时变量计数的 while 循环
+        context = self.for_begin()
+        start_val = yield self.visit(node.iterable.start_expr)
+        end_val = yield self.visit(node.iterable.end_expr)
+        self.for_range(context, node.var_internal_decl, start_val, end_val)
+        yield self.visit(node.body)
+        self.for_end(context, node.var_internal_decl, start_val, end_val, node.body)
 
     def visit_LoopNode(self, node: LoopNode):
-        # 无条件循环 loop { body }
-        label_loop_start = self.new_label()
-        label_loop_end = self.new_label()  # break 跳转目标
-
-        # continue 跳转目标是循环开始
-        self.loop_stack.append((label_loop_start, label_loop_end))
-
-        self.emit("LABEL", None, None, label_loop_start)
-        self.visit(node.body)
-        self.emit("GOTO", None, None, label_loop_start)  # 无条件跳回开始
-        self.emit("LABEL", None, None, label_loop_end)
-
-        self.loop_stack.pop()
+        context = self.loop_begin()
+        yield self.visit(node.body)
+        self.loop_end(context, node.body)
 
     def visit_BreakNode(self, node: BreakNode):
-        if not self.loop_stack:
-            print("严重错误: Break 在循环外 (IR 生成阶段)")  # 语义分析应已捕获
-            return
         # PDF 7.4: break <expr>; 允许带值跳出 loop 表达式
         # 当前简化：不处理 break 的返回值
-        if node.expr:
+        if node.expr and self.loop_stack:
             print("警告: 当前 IR 生成器忽略 break 表达式的值。")
-            # 如果需要处理：
-            # break_value = self.visit(node.expr)
-            # self.emit('SET_LOOP_RETVAL', break_value, None, None) # 假设有指令
-
-        break_label = self.loop_stack[-1][1]  # 获取 break 跳转目标 (end_label)
-        self.emit("GOTO", None, None, break_label)
+        self.break_statement()
 
     def visit_ContinueNode(self, node: ContinueNode):
-        if not self.loop_stack:
-            print("严重错误: Continue 在循环外 (IR 生成阶段)")  # 语义分析应已捕获
-            return
-        continue_label = self.loop_stack[-1][
-            0
-        ]  # 获取 continue 跳转目标 (start_label 或 increment_label)
-        self.emit("GOTO", None, None, continue_label)
+        self.continue_statement()
 
     # --- 7.1 函数表达式块 ---
     def visit_FunctionExprNode(self, node: FunctionExprNode):
@@ -477,49 +548,30 @@ class IRGenerator:
         for i, item in enumerate(node.items):
             # 最后一项是表达式，作为返回值
             if i == len(node.items) - 1 and isinstance(item, ExpressionNode):
-                result = self.visit(item)
+                result = yield self.visit(item)
                 return result
             else:
-                self.visit(item)
+                yield self.visit(item)
 
         # 如果没有最后的表达式，则返回空
         return None
 
     # --- 7.3 选择表达式 ---
     def visit_IfExprNode(self, node: IfExprNode):
-        # 生成条件判断的中间代码
-        condition_temp = self.visit(node.condition)
-
-        # 创建标签
-        then_label = self.new_label()
-        else_label = self.new_label()
-        end_label = self.new_label()
-
-        # 生成条件跳转代码
-        self.emit("IF_FALSE_GOTO", condition_temp, None, else_label)
-
-        # 生成then部分代码
-        self.emit("LABEL", None, None, then_label)
-        then_result = self.visit(node.then_expr_block)
-        result_temp = self.new_temp()
-        self.emit("ASSIGN", then_result, None, result_temp)
-        self.emit("GOTO", None, None, end_label)
-
-        # 生成else部分代码
-        self.emit("LABEL", None, None, else_label)
-        else_result = self.visit(node.else_expr_block)
-        self.emit("ASSIGN", else_result, None, result_temp)
-
-        # 结束标签
-        self.emit("LABEL", None, None, end_label)
-
-        return result_temp
+        condition_temp = yield self.visit(node.condition)
+        context = self.if_expr_begin(condition_temp)
+        then_result = yield self.visit(node.then_expr_block)
+        self.if_expr_else(context, then_result)
+        else_result = yield self.visit(node.else_expr_block)
+        return self.if_expr_end(context, node.condition, then_result, else_result)
 
     # --- 复合类型相关 (需要根据目标架构细化) ---
 
     def visit_ArrayLiteralNode(self, node: ArrayLiteralNode):
         # [1, 2, 3]
-        element_values = [self.visit(elem) for elem in node.elements]
+        element_values = []
+        for elem in node.elements:
+            element_values.append((yield self.visit(elem)))
         array_size = len(element_values)
         # IR 需要表示数组的创建和初始化
         # 可能是分配内存 + 循环赋值，或者一个高级指令
@@ -530,8 +582,8 @@ class IRGenerator:
 
     def visit_ArrayAccessNode(self, node: ArrayAccessNode):
         # a[i] (作为右值读取)
-        array_ref = self.visit(node.array_expr)
-        index_val = self.visit(node.index_expr)
+        array_ref = yield self.visit(node.array_expr)
+        index_val = yield self.visit(node.index_expr)
         result_temp = self.new_temp()
         # 简化：使用占位指令
         self.emit(
@@ -541,7 +593,9 @@ class IRGenerator:
 
     def visit_TupleLiteralNode(self, node: TupleLiteralNode):
         # (1, true, c)
-        element_values = [self.visit(elem) for elem in node.elements]
+        element_values = []
+        for elem in node.elements:
+            element_values.append((yield self.visit(elem)))
         tuple_size = len(element_values)
         tuple_ref = self.new_temp()
         # 简化：使用占位指令
@@ -550,7 +604,7 @@ class IRGenerator:
 
     def visit_TupleAccessNode(self, node: TupleAccessNode):
         # t.0 (作为右值读取)
-        tuple_ref = self.visit(node.tuple_expr)
+        tuple_ref = yield self.visit(node.tuple_expr)
         index_val = int(node.index_token.value)  # 元组索引是字面量
         result_temp = self.new_temp()
         # 简化：使用占位指令
@@ -6,30 +6,48 @@ LastEditTime : 2025-08-18 17:36:26
 FilePath     : \\课程设计\\rust-like-compiler\\lexer.py
 """
 
+import os
 import re
+import sys
+from array import array
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from source_map import SourceMap
+from symbol_table import CompilerError
 
 
 class Token:
     """Token 类表示词法分析器生成的单个 Token"""
 
-    def __init__(self, type, value, line, column):
+    # 不使用实例 __dict__，大文件中每个 Token 可节省约一百字节
+    __slots__ = ("type", "value", "line", "column", "offset")
+
+    def __init__(self, type, value, line, column, offset=None):
         """
         初始化 Token 实例
         :param type: Token 类型
         :param value: Token 值
         :param line: Token 所在行号
         :param column: Token 所在列号
+        :param offset: Token 起始字符在源代码中的偏移量
         """
-        # Token 的类型、值、行号和列号
+        # Token 的类型、值、行号、列号和偏移量
         self.type = type
         self.value = value
         self.line = line
         self.column = column
+        self.offset = offset
 
     def __repr__(self):
         """返回 Token 的字符串表示"""
         return f"Token({self.type}, {repr(self.value)}, L{self.line}C{self.column})"
 
+    def __reduce__(self):
+        """按构造参数序列化 (进程间传递语法树时比默认的 __slots__ 状态快得多)"""
+        return Token, (self.type, self.value, self.line, self.column, self.offset)
+
 
 # --- Token 类型常量 ---
 TT_KEYWORD = "KEYWORD"
@@ -62,6 +80,7 @@ TT_DOT = "DOT"  # .
 TT_DOTDOT = "DOTDOT"  # ..
 TT_AMPERSAND = "AMPERSAND"  # &
 TT_COMMENT = "COMMENT"  # 注释
+TT_ERROR = "ERROR"  # 词法错误 (recover 模式下代替异常)
 TT_EOF = "EOF"  # 文件结束
 
 KEYWORDS = [
@@ -82,14 +101,22 @@ KEYWORDS = [
     "false",
     "bool",
 ]
+# 关键字判定用的哈希集合 (列表的 in 是线性查找)
+KEYWORD_SET = frozenset(KEYWORDS)
 
 
 class Lexer:
-    """Lexer 类用于将源代码转换为 Token 列表"""
+    """
+    Lexer 类用于将源代码转换为 Token 列表。
+    recover=True 时遇到词法错误不抛出异常，而是记录到 diagnostics
+    并返回 ERROR Token 后继续扫描，一遍即可报告全部词法错误。
+    """
 
-    def __init__(self, text):
+    def __init__(self, text, recover=False):
 
         self.text = text
+        self.recover = recover
+        self.diagnostics = []  # recover 模式下收集的词法错误 (CompilerError)
         self.pos = 0
         self.current_char = self.text[self.pos] if self.pos < len(self.text) else None
         self.line = 1
@@ -104,6 +131,13 @@ class Lexer:
         self.column += 1
         self.current_char = self.text[self.pos] if self.pos < len(self.text) else None
 
+    def seek(self, pos, line, column):
+        """从指定位置 (及其行列号) 继续扫描，pos 必须位于两个 Token 之间"""
+        self.pos = pos
+        self.line = line
+        self.column = column
+        self.current_char = self.text[pos] if pos < len(self.text) else None
+
     def peek(self, lookahead=1):
         """查看下一个字符，不移动指针"""
         peek_pos = self.pos + lookahead
@@ -140,34 +174,40 @@ class Lexer:
         """处理数字 Token"""
         result = ""
         start_col = self.column
-        while self.current_char is not None and self.current_char.isdigit():
+        start_pos = self.pos
+        while self.current_char is not None and self.current_char.isdecimal():
             result += self.current_char
             self.advance()
-        return Token(TT_NUMBER, int(result), self.line, start_col)
+        return Token(TT_NUMBER, int(result), self.line, start_col, start_pos)
 
     def identifier(self):
         """处理标识符或关键字 Token"""
-        result = ""
         start_col = self.column
+        start_pos = self.pos
         while self.current_char is not None and (
             self.current_char.isalnum() or self.current_char == "_"
         ):
-            result += self.current_char
             self.advance()
-        if result in KEYWORDS:
-            return Token(TT_KEYWORD, result, self.line, start_col)
+        # 标识符文本驻留，同名标识符共享同一个字符串对象
+        result = sys.intern(self.text[start_pos : self.pos])
+        if result in KEYWORD_SET:
+            return Token(TT_KEYWORD, result, self.line, start_col, start_pos)
         else:
-            return Token(TT_IDENTIFIER, result, self.line, start_col)
+            return Token(TT_IDENTIFIER, result, self.line, start_col, start_pos)
 
     def string(self):
         """处理字符串字面量"""
+        start_line = self.line
         start_col = self.column
+        start_pos = self.pos
         self.advance()  # 跳过开头的引号
         string_value = ""
         while self.current_char is not None and self.current_char != '"':
             # 处理转义字符
             if self.current_char == "\\":
                 self.advance()
+                if self.current_char is None:
+                    break
                 if self.current_char == "n":
                     string_value += "\n"
                 elif self.current_char == "t":
@@ -186,10 +226,16 @@ class Lexer:
 
         # 检查是否正常结束（遇到结束引号）
         if self.current_char != '"':
-            raise Exception(f"Unterminated string at L{self.line}C{start_col}")
+            return self.error_token(
+                "Unterminated string",
+                self.text[start_pos : self.pos],
+                start_line,
+                start_col,
+                start_pos,
+            )
 
         self.advance()  # 跳过结束的引号
-        return Token(TT_STRING, string_value, self.line, start_col)
+        return Token(TT_STRING, string_value, self.line, start_col, start_pos)
 
     def get_next_token(self):
         """获取下一个 Token"""
@@ -203,116 +249,956 @@ class Lexer:
                 self.skip_comment()
                 continue
             start_col = self.column
+            start_pos = self.pos
 
             # 处理字符串字面量
             if self.current_char == '"':
                 return self.string()
 
-            # 多字符操作符优先
-            if self.current_char == "=" and self.peek() == "=":
-                self.advance()
-                self.advance()
-                return Token(TT_EQ, "==", self.line, start_col)
-            if self.current_char == ">" and self.peek() == "=":
-                self.advance()
-                self.advance()
-                return Token(TT_GTE, ">=", self.line, start_col)
-            if self.current_char == "<" and self.peek() == "=":
-                self.advance()
-                self.advance()
-                return Token(TT_LTE, "<=", self.line, start_col)
-            if self.current_char == "!" and self.peek() == "=":
-                self.advance()
-                self.advance()
-                return Token(TT_NE, "!=", self.line, start_col)
-            if self.current_char == "-" and self.peek() == ">":
-                self.advance()
-                self.advance()
-                return Token(TT_ARROW, "->", self.line, start_col)
-            if self.current_char == "." and self.peek() == ".":
-                self.advance()
-                self.advance()
-                return Token(TT_DOTDOT, "..", self.line, start_col)
-            # 单字符操作符和分隔符
-            if self.current_char == "=":
-                self.advance()
-                return Token(TT_ASSIGN, "=", self.line, start_col)
-            if self.current_char == "+":
-                self.advance()
-                return Token(TT_PLUS, "+", self.line, start_col)
-            if self.current_char == "-":
-                self.advance()
-                return Token(TT_MINUS, "-", self.line, start_col)
-            if self.current_char == "*":
-                self.advance()
-                return Token(TT_MUL, "*", self.line, start_col)
-            if self.current_char == "/":
-                self.advance()
-                return Token(TT_DIV, "/", self.line, start_col)
-            if self.current_char == "%":
-                self.advance()
-                return Token(TT_MOD, "%", self.line, start_col)
-            if self.current_char == ">":
-                self.advance()
-                return Token(TT_GT, ">", self.line, start_col)
-            if self.current_char == "<":
-                self.advance()
-                return Token(TT_LT, "<", self.line, start_col)
-            if self.current_char == "(":
-                self.advance()
-                return Token(TT_LPAREN, "(", self.line, start_col)
-            if self.current_char == ")":
-                self.advance()
-                return Token(TT_RPAREN, ")", self.line, start_col)
-            if self.current_char == "{":
-                self.advance()
-                return Token(TT_LBRACE, "{", self.line, start_col)
-            if self.current_char == "}":
-                self.advance()
-                return Token(TT_RBRACE, "}", self.line, start_col)
-            if self.current_char == "[":
-                self.advance()
-                return Token(TT_LBRACKET, "[", self.line, start_col)
-            if self.current_char == "]":
-                self.advance()
-                return Token(TT_RBRACKET, "]", self.line, start_col)
-            if self.current_char == ";":
-                self.advance()
-                return Token(TT_SEMICOLON, ";", self.line, start_col)
-            if self.current_char == ":":
-                self.advance()
-                return Token(TT_COLON, ":", self.line, start_col)
-            if self.current_char == ",":
-                self.advance()
-                return Token(TT_COMMA, ",", self.line, start_col)
-            if self.current_char == ".":
-                self.advance()
-                return Token(TT_DOT, ".", self.line, start_col)
-            if self.current_char == "&":
-                self.advance()
-                return Token(TT_AMPERSAND, "&", self.line, start_col)
-            # 数字
-            if self.current_char.isdigit():
+            # 运算符和分隔符：按首字符查表，候选项按最长匹配排列
+            candidates = PUNCTUATOR_DISPATCH.get(self.current_char)
+            if candidates is not None:
+                for lexeme, token_type in candidates:
+                    if len(lexeme) == 1 or self.text.startswith(lexeme, self.pos):
+                        for _ in lexeme:
+                            self.advance()
+                        return Token(
+                            token_type, lexeme, self.line, start_col, start_pos
+                        )
+            # 数字 (isdecimal 与正则 \d 相同：² 等上标满足 isdigit 但不能由 int 转换)
+            if self.current_char.isdecimal():
                 return self.number()
             # 标识符/关键字
             if self.current_char.isalpha() or self.current_char == "_":
                 return self.identifier()
             # 未知字符
-            raise Exception(
-                f"Unknown character: {self.current_char} at L{self.line}C{self.column}"
+            token = self.error_token(
+                f"Unknown character: {self.current_char}",
+                self.current_char,
+                self.line,
+                self.column,
+                self.pos,
             )
+            self.advance()
+            return token
         # 文件结束
-        return Token(TT_EOF, None, self.line, self.column)
+        return Token(TT_EOF, None, self.line, self.column, self.pos)
 
-    def tokenize(self):
-        """将整个源代码转换为 Token 列表"""
-        tokens = []
+    def error_token(self, message, lexeme, line, column, offset):
+        """
+        报告词法错误：默认抛出异常；recover 模式下记录诊断信息，
+        返回覆盖出错词素的 ERROR Token。
+        """
+        if not self.recover:
+            raise Exception(f"{message} at L{line}C{column}")
+        self.diagnostics.append(
+            CompilerError("lexical", message, line, column, offset=offset)
+        )
+        return Token(TT_ERROR, lexeme, line, column, offset)
+
+    def iter_tokens(self):
+        """惰性地逐个产生 Token，最后一个为 EOF"""
         token = self.get_next_token()
         while token.type != TT_EOF:
-            tokens.append(token)
+            yield token
             token = self.get_next_token()
-        tokens.append(token)  # EOF
-        return tokens
+        yield token  # EOF
+
+    def tokenize(self):
+        """将整个源代码转换为 Token 列表"""
+        return list(self.iter_tokens())
+
+
+class TokenStream:
+    """
+    带有限前瞻缓冲区的 Token 流。
+    从任意 Token 迭代器 (如 Lexer.iter_tokens()) 按需拉取 Token，
+    只缓存尚未消费的前瞻 Token，因此内存占用与源文件大小无关。
+    on_token 回调在每个 Token 第一次被拉取时调用，供语法分析之外的消费者
+    (如 GUI 的词法分析结果表) 共享同一遍词法分析。
+    推测分析时用 mark/reset/release 回退：只在 mark 与 release 之间记录消费过的 Token。
+    """
+
+    def __init__(self, tokens, lookahead=2, on_token=None):
+        self._source = iter(tokens)
+        self._buffer = deque()  # 已拉取但尚未消费的 Token
+        self.lookahead = lookahead  # 最大前瞻距离
+        self.on_token = on_token
+        self._last = None  # 最近从源中拉取的 Token
+        self._history = None  # mark 之后消费过的 Token (未在记录时为 None)
+        self._cursor = 0  # 下一个要消费的 Token 在 _history 中的下标
+        self._marks = 0  # 尚未 release 的 mark 个数
+
+    def _pull(self):
+        """从源中拉取一个 Token，源耗尽后重复返回 EOF"""
+        last = self._last
+        if last is not None and last.type == TT_EOF:
+            return last
+        token = next(self._source, None)
+        if token is None:
+            # 源在 EOF 之前结束 (例如词法错误后)，补一个 EOF
+            if last is None:
+                token = Token(TT_EOF, None, 1, 1, 0)
+            else:
+                token = Token(TT_EOF, None, last.line, last.column, last.offset)
+        self._last = token
+        if self.on_token is not None:
+            self.on_token(token)
+        return token
+
+    def next(self):
+        """消费并返回下一个 Token"""
+        if self._buffer:
+            return self._buffer.popleft()
+        return self._pull()
+
+    # 兼容 Lexer 的拉取接口
+    get_next_token = next
+
+    def peek(self, k=1):
+        """查看之后第 k 个 Token (k=1 为下一个)，不消费"""
+        if k > self.lookahead:
+            raise ValueError(f"前瞻距离 {k} 超过缓冲区大小 {self.lookahead}")
+        buffer = self._buffer
+        while len(buffer) < k:
+            buffer.append(self._pull())
+        return buffer[k - 1]
+
+    # --- 回溯 ---
+    # 记录期间 next 与 peek 换成按下标读取 _history 的版本，回退与前进都只需修改 _cursor；
+    # 没有 mark 时仍使用类中的方法，不增加开销。
+
+    @property
+    def position(self):
+        """下一个要消费的 Token 相对于最外层 mark 处的位置 (仅在 mark 与 release 之间有效)"""
+        return self._cursor
+
+    def mark(self):
+        """开始 (或嵌套) 记录之后消费的 Token，返回当前位置；与 release 成对调用"""
+        if self._history is None:
+            self._history = []
+            self._cursor = 0
+            self.next = self.get_next_token = self._next_recorded
+            self.peek = self._peek_recorded
+        self._marks += 1
+        return self._cursor
+
+    def reset(self, position):
+        """回到 position (mark 或 position 得到的位置)，可以向前也可以向后"""
+        self._cursor = position
+
+    def release(self):
+        """结束一次 mark；最外层结束后，回退而尚未重新消费的 Token 放回前瞻缓冲区"""
+        self._marks -= 1
+        if self._marks == 0:
+            self._buffer.extendleft(reversed(self._history[self._cursor :]))
+            self._history = None
+            del self.next, self.get_next_token, self.peek
+
+    def _next_recorded(self):
+        history = self._history
+        cursor = self._cursor
+        self._cursor = cursor + 1
+        if cursor < len(history):
+            return history[cursor]
+        token = self._buffer.popleft() if self._buffer else self._pull()
+        history.append(token)
+        return token
+
+    def _peek_recorded(self, k=1):
+        ahead = self._cursor + k - 1 - len(self._history)
+        if ahead < 0:
+            return self._history[ahead]
+        return TokenStream.peek(self, ahead + 1)
+
+    def drain(self):
+        """消费并丢弃剩余的全部 Token (仍会触发 on_token 回调)"""
+        self._buffer.clear()
+        while self._pull().type != TT_EOF:
+            pass
+
+
+# --- 增量词法分析 ---
+def diff_edit(old_text, new_text):
+    """
+    求出把 old_text 变为 new_text 的单个文本编辑。
+    :return: (offset, removed, inserted) 即在 offset 处删除 removed 个字符并插入 inserted
+    """
+    limit = min(len(old_text), len(new_text))
+    # 公共前缀长度：对切片做二分比较，逐段比较在 C 层完成
+    low, high = 0, limit
+    while low < high:
+        mid = (low + high + 1) // 2
+        if old_text[:mid] == new_text[:mid]:
+            low = mid
+        else:
+            high = mid - 1
+    prefix = low
+    # 公共后缀长度 (不与前缀重叠)
+    low, high = 0, limit - prefix
+    while low < high:
+        mid = (low + high + 1) // 2
+        if old_text[len(old_text) - mid :] == new_text[len(new_text) - mid :]:
+            low = mid
+        else:
+            high = mid - 1
+    suffix = low
+    removed = len(old_text) - prefix - suffix
+    return prefix, removed, new_text[prefix : len(new_text) - suffix]
+
+
+def first_token_at(tokens, offset, low=0):
+    """返回第一个起始偏移量 >= offset 的 Token 下标 (tokens 按偏移量有序)"""
+    high = len(tokens)
+    while low < high:
+        mid = (low + high) // 2
+        if tokens[mid].offset < offset:
+            low = mid + 1
+        else:
+            high = mid
+    return low
+
+
+class TokenDelta:
+    """
+    一次增量重扫描的结果：tokens[start:stop] 被替换为 new_tokens，
+    stop 之后的旧 Token 内容不变，只需平移位置。
+    diagnostics 为 new_tokens 中 ERROR Token 对应的词法错误 (CompilerError)。
+    """
+
+    def __init__(
+        self,
+        start,
+        stop,
+        new_tokens,
+        offset_delta=0,
+        line_delta=0,
+        column_delta=0,
+        same_line_count=0,
+        diagnostics=(),
+    ):
+        self.start = start
+        self.stop = stop
+        self.new_tokens = new_tokens
+        self.offset_delta = offset_delta  # 偏移量平移
+        self.line_delta = line_delta  # 行号平移
+        self.column_delta = column_delta  # 同步点所在行的列号平移
+        self.same_line_count = same_line_count  # 与同步点同一行的后续 Token 数
+        self.diagnostics = list(diagnostics)  # 重新扫描部分的词法错误
+
+    def apply(self, tokens):
+        """返回编辑后的 Token 列表，stop 之后的 Token 被原地平移"""
+        tail = tokens[self.stop :]
+        offset_delta = self.offset_delta
+        line_delta = self.line_delta
+        if offset_delta or line_delta:
+            for token in tail:
+                token.offset += offset_delta
+                token.line += line_delta
+        if self.column_delta:
+            for token in tail[: self.same_line_count]:
+                token.column += self.column_delta
+        return tokens[: self.start] + self.new_tokens + tail
+
+    def __repr__(self):
+        return (
+            f"TokenDelta([{self.start}:{self.stop}] -> {len(self.new_tokens)} tokens, "
+            f"offset{self.offset_delta:+d}, line{self.line_delta:+d})"
+        )
+
+
+def relex(tokens, text, offset, removed, inserted):
+    """
+    编辑后增量重扫描，只重新扫描编辑位置附近直到 Token 流重新同步。
+    以 recover 模式扫描：词法错误不抛出异常，以 ERROR Token 代替并记录在 TokenDelta.diagnostics。
+    :param tokens: 编辑前的完整 Token 列表 (以 EOF 结尾，offset 有效)
+    :param text: 编辑后的源代码
+    :param offset: 编辑位置
+    :param removed: 删除的字符数
+    :param inserted: 插入的文本
+    :return: TokenDelta
+    """
+    shift = len(inserted) - removed
+    edit_end = offset + len(inserted)  # 编辑区域在新文本中的结束位置
+
+    # 重启点：编辑位置之前最近的 Token 起点 (Token 之间的扫描状态总是干净的)。
+    # 插入的文本可能与前一个 Token 合并，因此从起点严格小于 offset 的 Token 开始；
+    # 多行字符串的行号记录的是结束行，不能作为重启点。
+    start = first_token_at(tokens, offset) - 1
+    while start >= 0 and tokens[start].type == TT_STRING:
+        start -= 1
+    lexer = Lexer(text, recover=True)
+    if start >= 0:
+        restart = tokens[start]
+        lexer.seek(restart.offset, restart.line, restart.column)
+    else:
+        start = 0
+
+    new_tokens = []
+    search_from = start
+    while True:
+        token = lexer.get_next_token()
+        if token.offset >= edit_end and token.type not in (TT_STRING, TT_ERROR):
+            # 编辑区域之后，若旧 Token 流中同一位置有相同的 Token 即已同步
+            # (不在 ERROR Token 处同步，使每个词法错误都对应 new_tokens 中的 Token)
+            old_offset = token.offset - shift
+            stop = first_token_at(tokens, old_offset, search_from)
+            search_from = stop
+            if stop < len(tokens):
+                old = tokens[stop]
+                if (
+                    old.offset == old_offset
+                    and old.type == token.type
+                    and old.value == token.value
+                ):
+                    break
+        new_tokens.append(token)
+        if token.type == TT_EOF:
+            # 未能同步 (旧 Token 流不完整)，替换剩余全部旧 Token
+            return TokenDelta(
+                start, len(tokens), new_tokens, diagnostics=lexer.diagnostics
+            )
+
+    # 同步点所在行中后续 Token 的列号也随编辑平移
+    same_line_count = 0
+    column_delta = token.column - old.column
+    if column_delta:
+        for old_token in tokens[stop:]:
+            if text.find("\n", token.offset, old_token.offset + shift) != -1:
+                break
+            same_line_count += 1
+    return TokenDelta(
+        start,
+        stop,
+        new_tokens,
+        shift,
+        token.line - old.line,
+        column_delta,
+        same_line_count,
+        lexer.diagnostics,
+    )
+
+
+# --- 紧凑 Token 存储 ---
+# Token 类型编码表，类型在 TokenBuffer 中以 1 字节整数存储
+TOKEN_TYPES = (
+    TT_KEYWORD,
+    TT_IDENTIFIER,
+    TT_NUMBER,
+    TT_STRING,
+    TT_ASSIGN,
+    TT_PLUS,
+    TT_MINUS,
+    TT_MUL,
+    TT_DIV,
+    TT_MOD,
+    TT_EQ,
+    TT_GT,
+    TT_GTE,
+    TT_LT,
+    TT_LTE,
+    TT_NE,
+    TT_LPAREN,
+    TT_RPAREN,
+    TT_LBRACE,
+    TT_RBRACE,
+    TT_LBRACKET,
+    TT_RBRACKET,
+    TT_SEMICOLON,
+    TT_COLON,
+    TT_COMMA,
+    TT_ARROW,
+    TT_DOT,
+    TT_DOTDOT,
+    TT_AMPERSAND,
+    TT_COMMENT,
+    TT_EOF,
+    TT_ERROR,
+)
+TOKEN_TYPE_CODES = {tt: code for code, tt in enumerate(TOKEN_TYPES)}
+
+
+class TokenBuffer:
+    """
+    结构数组 (struct-of-arrays) 形式的 Token 序列。
+    类型编码、偏移量、行号、列号分别存放在 array 中，值列表只保存
+    驻留后的字符串或整数引用，每个 Token 约占 21 字节。
+    给出 source_map 时不再保存行列号，位置只占 4 字节偏移量，
+    行列号在访问时由 SourceMap 二分换算。
+    按下标或迭代访问时才临时构造 Token 对象。
+    """
+
+    def __init__(self, tokens=(), source_map=None):
+        self.source_map = source_map
+        self.types = array("B")
+        self.offsets = array("i")
+        if source_map is None:
+            self.lines = array("i")
+            self.columns = array("i")
+        else:
+            self.lines = self.columns = None
+        # 位置与偏移量换算结果不一致的 Token (多行字符串记录的是结束行)
+        self.positions = {}
+        self.values = []
+        self.diagnostics = []  # recover 模式下扫描时记录的词法错误 (CompilerError)
+        for token in tokens:
+            self.append(token)
+
+    @classmethod
+    def from_lexer(cls, lexer, source_map=None):
+        """一遍扫描 lexer，直接填充缓冲区 (并带上 lexer 记录的词法错误)"""
+        buffer = cls(lexer.iter_tokens(), source_map)
+        buffer.diagnostics.extend(getattr(lexer, "diagnostics", ()))
+        return buffer
+
+    def append(self, token):
+        """追加一个 Token"""
+        value = token.value
+        if isinstance(value, str):
+            value = sys.intern(value)
+        if self.source_map is None:
+            self.lines.append(token.line)
+            self.columns.append(token.column)
+        elif token.type == TT_STRING:
+            position = (token.line, token.column)
+            if self.source_map.position(token.offset) != position:
+                self.positions[len(self.types)] = position
+        self.types.append(TOKEN_TYPE_CODES[token.type])
+        self.offsets.append(-1 if token.offset is None else token.offset)
+        self.values.append(value)
+
+    def extend(self, other):
+        """拼接另一个 TokenBuffer (数组整体复制，仅用于不带 SourceMap 的缓冲区)"""
+        self.types.extend(other.types)
+        self.offsets.extend(other.offsets)
+        self.lines.extend(other.lines)
+        self.columns.extend(other.columns)
+        self.values.extend(other.values)
+        self.diagnostics.extend(other.diagnostics)
+
+    def slice(self, start, stop):
+        """第 start 到 stop-1 个 Token 组成的新缓冲区 (仅用于不带 SourceMap 的缓冲区)"""
+        part = TokenBuffer()
+        part.types = self.types[start:stop]
+        part.offsets = self.offsets[start:stop]
+        part.lines = self.lines[start:stop]
+        part.columns = self.columns[start:stop]
+        part.values = self.values[start:stop]
+        return part
+
+    def __len__(self):
+        return len(self.types)
+
+    def __getitem__(self, index):
+        offset = self.offsets[index]
+        if self.source_map is None:
+            line = self.lines[index]
+            column = self.columns[index]
+        else:
+            if index < 0:
+                index += len(self.types)
+            position = self.positions.get(index)
+            if position is None:
+                position = self.source_map.position(offset)
+            line, column = position
+        return Token(
+            TOKEN_TYPES[self.types[index]],
+            self.values[index],
+            line,
+            column,
+            None if offset < 0 else offset,
+        )
+
+    def __iter__(self):
+        for index in range(len(self.types)):
+            yield self[index]
+
+    def iter_tokens(self):
+        """与 Lexer 相同的拉取接口，可直接交给 Parser 或 TokenStream"""
+        return iter(self)
+
+    def nbytes(self):
+        """数组与值列表本身占用的字节数 (不含共享的值对象)"""
+        size = sys.getsizeof(self.values) + sys.getsizeof(self.positions)
+        for column in (self.types, self.offsets, self.lines, self.columns):
+            if column is not None:
+                size += column.itemsize * len(column)
+        return size
+
+
+# --- 表驱动扫描 ---
+# 运算符与分隔符表，多字符运算符排在前面以保证最长匹配
+PUNCTUATORS = [
+    ("==", TT_EQ),
+    (">=", TT_GTE),
+    ("<=", TT_LTE),
+    ("!=", TT_NE),
+    ("->", TT_ARROW),
+    ("..", TT_DOTDOT),
+    ("=", TT_ASSIGN),
+    ("+", TT_PLUS),
+    ("-", TT_MINUS),
+    ("*", TT_MUL),
+    ("/", TT_DIV),
+    ("%", TT_MOD),
+    (">", TT_GT),
+    ("<", TT_LT),
+    ("(", TT_LPAREN),
+    (")", TT_RPAREN),
+    ("{", TT_LBRACE),
+    ("}", TT_RBRACE),
+    ("[", TT_LBRACKET),
+    ("]", TT_RBRACKET),
+    (";", TT_SEMICOLON),
+    (":", TT_COLON),
+    (",", TT_COMMA),
+    (".", TT_DOT),
+    ("&", TT_AMPERSAND),
+]
+PUNCTUATOR_TYPES = dict(PUNCTUATORS)
+# 首字符分派表：首字符 -> 以该字符开头的 (运算符, Token 类型)，多字符运算符在前
+PUNCTUATOR_DISPATCH = {}
+for _lexeme, _token_type in PUNCTUATORS:
+    PUNCTUATOR_DISPATCH.setdefault(_lexeme[0], []).append((_lexeme, _token_type))
+PUNCTUATOR_DISPATCH = {
+    char: tuple(candidates) for char, candidates in PUNCTUATOR_DISPATCH.items()
+}
+del _lexeme, _token_type
+
+# 字符串字面量中支持的转义序列，其余 \x 原样保留
+STRING_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "\\": "\\", '"': '"'}
+
+# 主正则：可选的前导空白 + 一个词素，每个命名分组对应一类词素，由 lastgroup 分派
+MASTER_PATTERN = re.compile(
+    r"\s*(?:"
+    r"(?P<COMMENT>//[^\n]*|/\*.*?(?:\*/|\Z))"
+    r"|(?P<WORD>[A-Za-z_]\w*)"
+    r"|(?P<NUMBER>\d+)"
+    r"|(?P<PUNCT>" + "|".join(re.escape(p) for p, _ in PUNCTUATORS) + r")"
+    r'|(?P<STRING>"(?:[^"\\]|\\.)*")'
+    r"|(?P<UWORD>[^\W\d]\w*)"
+    r")",
+    re.DOTALL,
+)
+WHITESPACE_PATTERN = re.compile(r"\s*")
+ESCAPE_PATTERN = re.compile(r"\\(.)", re.DOTALL)
+
+
+class RegexLexer(Lexer):
+    """
+    基于单个主正则的表驱动词法分析器。
+    与 Lexer 产生完全相同的 Token 序列，但每个 Token 只做一次正则匹配，
+    行列号由预先建立的换行偏移索引二分得到，而不是逐字符维护。
+    """
+
+    def __init__(self, text, recover=False):
+        super().__init__(text, recover)
+        self.source_map = SourceMap(text)
+        self.line_starts = self.source_map.line_starts
+        self._tokens = self._scan()
+
+    def position(self, offset):
+        """将字符偏移量换算为 (行号, 列号)"""
+        return self.source_map.position(offset)
+
+    def _scan(self):
+        """逐个产生 Token 的生成器，遇到无法匹配的字符时报告词法错误"""
+        text = self.text
+        intern = sys.intern
+        line_starts = self.line_starts
+        num_lines = len(line_starts)
+        # 当前行号及其所在区间 [line_start, next_line_start)，跨行时才二分查找
+        line = 1
+        line_start = 0
+        next_line_start = line_starts[1] if num_lines > 1 else len(text) + 1
+        expected = 0
+        while True:
+            for m in MASTER_PATTERN.finditer(text, expected):
+                if m.start() != expected:
+                    # finditer 跳过了无法匹配的字符
+                    break
+                expected = m.end()
+                kind = m.lastgroup
+                if kind == "COMMENT":
+                    continue
+                pos = m.start(kind)
+                if pos >= next_line_start:
+                    line = bisect_right(line_starts, pos)
+                    line_start = line_starts[line - 1]
+                    next_line_start = (
+                        line_starts[line] if line < num_lines else len(text) + 1
+                    )
+                column = pos - line_start + 1
+                self.pos = expected
+                if kind == "WORD":
+                    value = intern(m.group(kind))
+                    if value in KEYWORD_SET:
+                        yield Token(TT_KEYWORD, value, line, column, pos)
+                    else:
+                        yield Token(TT_IDENTIFIER, value, line, column, pos)
+                elif kind == "PUNCT":
+                    value = intern(m.group(kind))
+                    yield Token(PUNCTUATOR_TYPES[value], value, line, column, pos)
+                elif kind == "NUMBER":
+                    yield Token(TT_NUMBER, int(m.group(kind)), line, column, pos)
+                elif kind == "STRING":
+                    value = text[pos + 1 : expected - 1]
+                    if "\\" in value:
+                        value = ESCAPE_PATTERN.sub(
+                            lambda e: STRING_ESCAPES.get(e.group(1), e.group(0)), value
+                        )
+                    # 与逐字符扫描一致：多行字符串取结束引号所在行
+                    end_line = bisect_right(line_starts, expected - 1)
+                    yield Token(TT_STRING, value, end_line, column, pos)
+                elif text[pos].isalpha():
+                    # 非 ASCII 标识符：首字符须满足 isalpha()
+                    yield Token(TT_IDENTIFIER, intern(m.group(kind)), line, column, pos)
+                else:
+                    expected = pos
+                    break
+
+            pos = WHITESPACE_PATTERN.match(text, expected).end()
+            self.pos = pos
+            if pos >= len(text):
+                break
+            # 无法匹配：报告错误 (recover 模式下跳过出错部分继续扫描)
+            error_line, error_column = self.position(pos)
+            if text[pos] == '"':
+                yield self.error_token(
+                    "Unterminated string", text[pos:], error_line, error_column, pos
+                )
+                expected = len(text)
+            else:
+                yield self.error_token(
+                    f"Unknown character: {text[pos]}",
+                    text[pos],
+                    error_line,
+                    error_column,
+                    pos,
+                )
+                expected = pos + 1
+        # 文件结束，之后重复返回 EOF
+        self.current_char = None
+        line, column = self.position(pos)
+        while True:
+            yield Token(TT_EOF, None, line, column, pos)
+
+    def get_next_token(self):
+        """获取下一个 Token"""
+        return next(self._tokens)
+
+
+# --- 字节扫描 (内存映射输入) ---
+# 与 MASTER_PATTERN 相同的词素划分，但作用于 UTF-8 字节串。
+# 标识符、数字、运算符只允许 ASCII (与 grammar.txt 中的 <ID>/<NUM> 一致)，
+# 非 ASCII 字节只会出现在字符串字面量和注释内部。
+BYTES_MASTER_PATTERN = re.compile(
+    rb"[ \t\n\r\f\v\x1c-\x1f]*(?:"
+    rb"(?P<COMMENT>//[^\n]*|/\*.*?(?:\*/|\Z))"
+    rb"|(?P<WORD>[A-Za-z_]\w*)"
+    rb"|(?P<NUMBER>[0-9]+)"
+    rb"|(?P<PUNCT>"
+    + b"|".join(re.escape(p.encode("ascii")) for p, _ in PUNCTUATORS)
+    + rb")"
+    rb'|(?P<STRING>"(?:[^"\\]|\\.)*")'
+    rb")",
+    re.DOTALL,
+)
+BYTES_WHITESPACE_PATTERN = re.compile(rb"[ \t\n\r\f\v\x1c-\x1f]*")
+NON_ASCII_PATTERN = re.compile(rb"[\x80-\xff]")
+
+
+class MappedLexer(Lexer):
+    """
+    直接在字节缓冲区 (mmap.mmap、bytes 等) 上扫描的词法分析器。
+    不需要先把整个文件解码成 str：ASCII 词素直接从字节切片得到，
+    只有字符串字面量内部才按 UTF-8 解码。行起始索引随扫描进度逐步扩展，
+    因此得到第一个 Token 的开销与文件大小无关。
+    列号按字符计算 (与 Lexer 一致)，Token.offset 为字节偏移量。
+    """
+
+    def __init__(self, buffer, recover=False):
+        self.text = buffer
+        self.recover = recover
+        self.diagnostics = []
+        self.pos = 0
+        self.current_char = None
+        self.line = 1
+        self.column = 1
+        self.line_starts = [0]  # 已扫描到的行起始字节偏移量
+        self._tokens = self._scan()
+
+    def _extend_lines(self, offset):
+        """扩展行起始索引直到覆盖 offset，返回 offset 所在行号"""
+        buffer = self.text
+        line_starts = self.line_starts
+        while True:
+            newline = buffer.find(b"\n", line_starts[-1])
+            if newline == -1 or newline >= offset:
+                break
+            line_starts.append(newline + 1)
+        return len(line_starts)
+
+    def _column(self, line_start, offset):
+        """行内字节偏移换算为字符列号"""
+        if NON_ASCII_PATTERN.search(self.text, line_start, offset) is None:
+            return offset - line_start + 1
+        return len(self.text[line_start:offset].decode("utf-8", "replace")) + 1
+
+    def _char_at(self, offset):
+        """解码 offset 处的单个字符 (用于错误信息)"""
+        return self.text[offset : offset + 4].decode("utf-8", "replace")[0]
+
+    def _scan(self):
+        """逐个产生 Token 的生成器，遇到无法匹配的字节时报告词法错误"""
+        buffer = self.text
+        size = len(buffer)
+        intern = sys.intern
+        # 字节词素到驻留字符串的缓存，同一标识符只解码一次
+        lexemes = {}
+        line_starts = self.line_starts
+        line = 1
+        line_start = 0
+        next_line_start = 0  # 首个 Token 时计算
+        line_is_ascii = True
+        expected = 0
+        while True:
+            for m in BYTES_MASTER_PATTERN.finditer(buffer, expected):
+                if m.start() != expected:
+                    break
+                expected = m.end()
+                kind = m.lastgroup
+                if kind == "COMMENT":
+                    continue
+                pos = m.start(kind)
+                if pos >= next_line_start:
+                    line = self._extend_lines(pos + 1)
+                    line_start = line_starts[line - 1]
+                    newline = buffer.find(b"\n", line_start)
+                    next_line_start = size + 1 if newline == -1 else newline + 1
+                    line_is_ascii = (
+                        NON_ASCII_PATTERN.search(buffer, line_start, next_line_start)
+                        is None
+                    )
+                if line_is_ascii:
+                    column = pos - line_start + 1
+                else:
+                    column = self._column(line_start, pos)
+                self.pos = expected
+                if kind == "WORD" or kind == "PUNCT":
+                    raw = m.group(kind)
+                    value = lexemes.get(raw)
+                    if value is None:
+                        value = lexemes[raw] = intern(raw.decode("ascii"))
+                    if kind == "PUNCT":
+                        yield Token(PUNCTUATOR_TYPES[value], value, line, column, pos)
+                    elif value in KEYWORD_SET:
+                        yield Token(TT_KEYWORD, value, line, column, pos)
+                    else:
+                        yield Token(TT_IDENTIFIER, value, line, column, pos)
+                elif kind == "NUMBER":
+                    yield Token(TT_NUMBER, int(m.group(kind)), line, column, pos)
+                else:
+                    value = buffer[pos + 1 : expected - 1].decode("utf-8")
+                    if "\\" in value:
+                        value = ESCAPE_PATTERN.sub(
+                            lambda e: STRING_ESCAPES.get(e.group(1), e.group(0)), value
+                        )
+                    # 与逐字符扫描一致：多行字符串取结束引号所在行
+                    end_line = self._extend_lines(expected)
+                    yield Token(TT_STRING, value, end_line, column, pos)
+
+            pos = BYTES_WHITESPACE_PATTERN.match(buffer, expected).end()
+            self.pos = pos
+            if pos >= size:
+                break
+            # 无法匹配：报告错误 (recover 模式下跳过出错部分继续扫描)
+            error_line = self._extend_lines(pos + 1)
+            error_column = self._column(line_starts[error_line - 1], pos)
+            if buffer[pos : pos + 1] == b'"':
+                yield self.error_token(
+                    "Unterminated string",
+                    buffer[pos:].decode("utf-8", "replace"),
+                    error_line,
+                    error_column,
+                    pos,
+                )
+                expected = size
+            else:
+                char = self._char_at(pos)
+                yield self.error_token(
+                    f"Unknown character: {char}", char, error_line, error_column, pos
+                )
+                # 非法的 UTF-8 字节 (解码为替换字符) 只跳过一个字节
+                expected = pos + (1 if char == "\ufffd" else len(char.encode("utf-8")))
+        line = self._extend_lines(pos + 1)
+        column = self._column(line_starts[line - 1], pos)
+        # 文件结束，之后重复返回 EOF
+        while True:
+            yield Token(TT_EOF, None, line, column, pos)
+
+    def get_next_token(self):
+        """获取下一个 Token"""
+        return next(self._tokens)
+
+
+# 可选的扫描引擎
+LEXER_ENGINES = {
+    "char": Lexer,
+    "regex": RegexLexer,
+}
+
+
+def create_lexer(text, engine="char", recover=False):
+    """按名称创建词法分析器 ('char' 为逐字符扫描, 'regex' 为主正则扫描)"""
+    if engine not in LEXER_ENGINES:
+        raise ValueError(f"未知的词法分析引擎: {engine}")
+    return LEXER_ENGINES[engine](text, recover)
+
+
+# --- 并行分块扫描 ---
+# 注释与字符串字面量：分块点不能落在其中
+SPLIT_BARRIER_PATTERN = re.compile(
+    r'//[^\n]*|/\*.*?(?:\*/|\Z)|"(?:[^"\\]|\\.)*"', re.DOTALL
+)
+# 顶层函数定义的起始行，优先在此处分块
+TOP_LEVEL_FN_PATTERN = re.compile(r"\n(?=fn\b)")
+# 块末尾的错误 Token 可能被分块点切断 (如未闭合的字符串)
+ERROR_CODE = TOKEN_TYPE_CODES[TT_ERROR]
+
+
+def split_source(text, parts):
+    """
+    把源代码切分为约 parts 个块，切分点为注释与字符串之外的换行符之后，
+    优先选择顶层 fn 所在行。每个块都从行首开始，因此块内列号无需修正。
+    :return: 各块的起始偏移量列表 (首项为 0)
+    """
+    barrier_starts = []
+    barrier_ends = []
+    for match in SPLIT_BARRIER_PATTERN.finditer(text):
+        barrier_starts.append(match.start())
+        barrier_ends.append(match.end())
+
+    def blocked_until(pos):
+        """pos 落在注释或字符串内部时返回其结束位置，否则返回 None"""
+        index = bisect_right(barrier_starts, pos) - 1
+        if index >= 0 and pos < barrier_ends[index]:
+            return barrier_ends[index]
+        return None
+
+    starts = [0]
+    step = len(text) // parts
+    for part in range(1, parts):
+        target = max(part * step, starts[-1])
+        limit = target + step
+        # 先在本块范围内寻找顶层 fn，找不到再退回到最近的换行符
+        point = None
+        for pattern_pos in (
+            match.start()
+            for match in TOP_LEVEL_FN_PATTERN.finditer(text, target, limit)
+        ):
+            if blocked_until(pattern_pos) is None:
+                point = pattern_pos
+                break
+        if point is None:
+            pos = target
+            while True:
+                pos = text.find("\n", pos)
+                if pos == -1:
+                    break
+                end = blocked_until(pos)
+                if end is None:
+                    point = pos
+                    break
+                pos = end
+        if point is None or point + 1 >= len(text):
+            break
+        if point + 1 > starts[-1]:
+            starts.append(point + 1)
+    return starts
+
+
+def _lex_chunk(chunk, engine, keep_eof, offset_base, line_base, recover=False):
+    """工作进程：扫描一个块并修正为全文位置，以紧凑的 TokenBuffer 形式传回"""
+    buffer = TokenBuffer()
+    lexer = create_lexer(chunk, engine, recover)
+    for token in lexer.iter_tokens():
+        if token.type == TT_EOF and not keep_eof:
+            break
+        token.offset += offset_base
+        token.line += line_base
+        buffer.append(token)
+        if token.type == TT_EOF:
+            break
+    for error in lexer.diagnostics:
+        error.offset += offset_base
+        error.line += line_base
+    buffer.diagnostics = lexer.diagnostics
+    return buffer
+
+
+def lex_parallel(
+    text,
+    workers=None,
+    engine="regex",
+    min_chunk_size=1 << 16,
+    executor=None,
+    recover=False,
+):
+    """
+    多进程并行词法分析，结果与单进程扫描完全一致。
+    源代码按 split_source 切分后分发给进程池，各块的偏移量与行号在工作进程中
+    修正为全文位置，主进程只需按顺序拼接数组。非 recover 模式下任一块出现
+    词法错误时退回单进程扫描，以报告准确的错误位置。
+    :param workers: 进程数，默认 CPU 核数
+    :param min_chunk_size: 每块的最小字符数，源代码过小时直接单进程扫描
+    :param executor: 可复用的进程池，默认临时创建
+    :param recover: 为 True 时词法错误不抛出异常，各块记录的错误 (已修正为全文位置)
+                    按顺序汇总到返回的 TokenBuffer.diagnostics；错误 Token 位于块末尾
+                    (如未闭合的字符串被切断) 时退回单进程扫描
+    :return: TokenBuffer (以 EOF 结尾)
+    """
+    workers = workers or os.cpu_count() or 1
+    parts = min(workers, len(text) // min_chunk_size)
+    if parts <= 1:
+        return TokenBuffer.from_lexer(create_lexer(text, engine, recover))
+
+    starts = split_source(text, parts)
+    ends = starts[1:] + [len(text)]
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=min(workers, len(starts)))
+    try:
+        futures = []
+        line_base = 0
+        for index, (start, end) in enumerate(zip(starts, ends)):
+            if index:
+                line_base += text.count("\n", starts[index - 1], start)
+            futures.append(
+                executor.submit(
+                    _lex_chunk,
+                    text[start:end],
+                    engine,
+                    end == len(text),
+                    start,
+                    line_base,
+                    recover,
+                )
+            )
+        try:
+            buffers = [future.result() for future in futures]
+        except Exception:
+            return TokenBuffer.from_lexer(create_lexer(text, engine, recover))
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+    if any(buffer.types and buffer.types[-1] == ERROR_CODE for buffer in buffers[:-1]):
+        return TokenBuffer.from_lexer(create_lexer(text, engine, recover))
+    tokens = buffers[0]
+    for buffer in buffers[1:]:
+        tokens.extend(buffer)
+    return tokens
 
 
 # --- 测试入口 ---
@@ -0,0 +1,749 @@
+"""
+Description  : LL(1) 分析表生成器：读取 grammar.txt，计算 FIRST/FOLLOW 集合并报告冲突，
+               消除左递归、提取左公因子后生成表驱动预测分析器使用的分析表 (ll1_table.py)
+Author       : Hyoung
+Date         : 2026-10-17 17:40:15
+LastEditTime : 2026-10-17 17:40:15
+FilePath     : \\课程设计\\rust-like-compiler\\ll1_generator.py
+"""
+
+# 用法: python ll1_generator.py [grammar.txt] [--output ll1_table.py] [--sets]
+#
+# 文法中的每条原始产生式在末尾附加一个归约标记 (产生式下标)。变换文法时标记随符号一起移动，
+# 预测分析器弹出标记时按原始产生式归约，因此消除左递归、提取左公因子后
+# 仍能按 grammar.txt 的原始产生式构造语法树 (左递归的运算符仍是左结合)。
+
+import argparse
+import datetime
+import os
+import re
+import unicodedata
+
+EPSILON = "空"  # 空产生式
+END = "$"  # 输入结束
+TOKEN_CLASSES = (
+    "<ID>",
+    "<NUM>",
+)  # 由词法分析器识别的终结符，grammar.txt 中只给出正则定义
+
+# 多个候选产生式在 LL(2) 向前看下仍无法区分时，优先选择包含下列原始产生式的候选
+# (与手写语法分析器的选择一致)，其余冲突按产生式在 grammar.txt 中出现的顺序选择
+PREFERENCES = (
+    "<语句> -> <if语句>",
+    "<语句> -> <循环语句>",
+    "<语句> -> <表达式> ';'",
+    "<元素> -> <ID> '(' <实参列表> ')'",
+)
+
+SYMBOL_PATTERN = re.compile(r"<[^>]+>|'[^']*'|\S+")
+RULE_PATTERN = re.compile(r"^(<[^>]+>|\w+)\s*->\s*(.*)$")
+
+
+class Production:
+    """产生式 lhs -> rhs；rhs 中的整数是归约标记 (原始产生式下标)"""
+
+    def __init__(self, lhs, rhs, text=None):
+        self.lhs = lhs
+        self.rhs = tuple(rhs)
+        self.text = text  # 原始产生式在 grammar.txt 中的写法
+
+    def __repr__(self):
+        return format_production(self.lhs, self.rhs)
+
+
+def format_production(lhs, rhs):
+    """产生式的文本形式，归约标记写作 #下标"""
+    symbols = [f"#{s}" if isinstance(s, int) else s for s in rhs]
+    return f"{lhs} -> {' '.join(symbols) if symbols else EPSILON}"
+
+
+class Grammar:
+    """上下文无关文法：非终结符按首次定义的顺序排列，各自的产生式保持书写顺序"""
+
+    def __init__(self, start, rules, originals=()):
+        self.start = start
+        self.rules = rules  # 非终结符 -> [Production]
+        self.originals = list(originals)  # 原始产生式，下标即归约标记
+
+    @property
+    def productions(self):
+        return [p for alternatives in self.rules.values() for p in alternatives]
+
+    def is_nonterminal(self, symbol):
+        return isinstance(symbol, str) and symbol in self.rules
+
+    def terminals(self):
+        result = set()
+        for production in self.productions:
+            for symbol in production.rhs:
+                if isinstance(symbol, str) and symbol not in self.rules:
+                    result.add(symbol)
+        return result
+
+
+def read_grammar(path):
+    """
+    读取 grammar.txt。同一非终结符可以分多处定义；以 | 分隔的候选各成一条产生式。
+    <ID>、<NUM> 的正则定义以及关键字、运算符列表等说明行被忽略。
+    """
+    rules = {}
+    originals = []
+    start = None
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            match = RULE_PATTERN.match(line)
+            if match is None:
+                continue
+            lhs, body = match.groups()
+            if lhs in TOKEN_CLASSES:
+                continue
+            if start is None:
+                start = lhs
+            for alternative in body.split(" | "):
+                rhs = tuple(
+                    symbol
+                    for symbol in SYMBOL_PATTERN.findall(alternative)
+                    if symbol != EPSILON
+                )
+                production = Production(lhs, rhs, format_production(lhs, rhs))
+                rules.setdefault(lhs, []).append(production)
+                originals.append(production)
+    return Grammar(start, rules, originals)
+
+
+# --- FIRST / FOLLOW ---
+def first_of(symbols, first, nullable):
+    """符号串的 FIRST 集合，以及它能否推导出空串"""
+    result = set()
+    for symbol in symbols:
+        if isinstance(symbol, int):
+            continue
+        if symbol in first:
+            result |= first[symbol]
+            if symbol not in nullable:
+                return result, False
+        else:
+            result.add(symbol)
+            return result, False
+    return result, True
+
+
+def compute_first(grammar):
+    """返回 (FIRST 集合, 可空非终结符集合)"""
+    first = {nonterminal: set() for nonterminal in grammar.rules}
+    nullable = set()
+    changed = True
+    while changed:
+        changed = False
+        for production in grammar.productions:
+            symbols, empty = first_of(production.rhs, first, nullable)
+            target = first[production.lhs]
+            if not symbols <= target:
+                target |= symbols
+                changed = True
+            if empty and production.lhs not in nullable:
+                nullable.add(production.lhs)
+                changed = True
+    return first, nullable
+
+
+def compute_follow(grammar, first, nullable):
+    """返回 FOLLOW 集合"""
+    follow = {nonterminal: set() for nonterminal in grammar.rules}
+    follow[grammar.start].add(END)
+    changed = True
+    while changed:
+        changed = False
+        for production in grammar.productions:
+            rhs = production.rhs
+            for index, symbol in enumerate(rhs):
+                if not grammar.is_nonterminal(symbol):
+                    continue
+                symbols, empty = first_of(rhs[index + 1 :], first, nullable)
+                if empty:
+                    symbols = symbols | follow[production.lhs]
+                target = follow[symbol]
+                if not symbols <= target:
+                    target |= symbols
+                    changed = True
+    return follow
+
+
+def predict_sets(grammar, first, follow, nullable):
+    """各产生式的预测集合，返回 {非终结符: {终结符: [产生式]}}"""
+    table = {nonterminal: {} for nonterminal in grammar.rules}
+    for production in grammar.productions:
+        symbols, empty = first_of(production.rhs, first, nullable)
+        if empty:
+            symbols = symbols | follow[production.lhs]
+        for terminal in symbols:
+            table[production.lhs].setdefault(terminal, []).append(production)
+    return table
+
+
+def ll1_conflicts(table):
+    """分析表中有多个候选产生式的单元 [(非终结符, 终结符, [产生式])]"""
+    return [
+        (nonterminal, terminal, alternatives)
+        for nonterminal, row in table.items()
+        for terminal, alternatives in row.items()
+        if len(alternatives) > 1
+    ]
+
+
+# --- 左递归 ---
+def left_corner(production):
+    """产生式右部第一个非标记符号 (以及它之前的归约标记个数)"""
+    for index, symbol in enumerate(production.rhs):
+        if not isinstance(symbol, int):
+            return symbol, index
+    return None, len(production.rhs)
+
+
+def left_recursive_groups(grammar):
+    """
+    返回互相左递归的非终结符组 (左角图中的强连通分量，按文法顺序)，
+    含直接左递归的单个非终结符也各成一组
+    """
+    _, nullable = compute_first(grammar)
+    edges = {nonterminal: set() for nonterminal in grammar.rules}
+    for production in grammar.productions:
+        for symbol in production.rhs:
+            if isinstance(symbol, int):
+                continue
+            if grammar.is_nonterminal(symbol):
+                edges[production.lhs].add(symbol)
+                if symbol in nullable:
+                    continue
+            break
+
+    order = list(grammar.rules)
+    groups = []
+    for nonterminal in order:
+        if any(nonterminal in group for group in groups):
+            continue
+        # 从 nonterminal 出发可达且能回到 nonterminal 的非终结符
+        reachable = set()
+        pending = [nonterminal]
+        while pending:
+            for target in edges[pending.pop()]:
+                if target not in reachable:
+                    reachable.add(target)
+                    pending.append(target)
+        if nonterminal not in reachable:
+            continue
+        group = []
+        for other in order:
+            if other in reachable and (
+                other == nonterminal or reaches(edges, other, nonterminal)
+            ):
+                group.append(other)
+        groups.append(group)
+    return groups
+
+
+def reaches(edges, source, target):
+    """左角图中 source 是否可达 target"""
+    seen = set()
+    pending = [source]
+    while pending:
+        for symbol in edges[pending.pop()]:
+            if symbol == target:
+                return True
+            if symbol not in seen:
+                seen.add(symbol)
+                pending.append(symbol)
+    return False
+
+
+def new_name(grammar, base, suffix):
+    """为变换引入的非终结符取一个未使用的名字"""
+    stem = base[1:-1] if base.startswith("<") else base
+    index = 0
+    while True:
+        name = f"<{stem}{suffix}{index or ''}>"
+        if name not in grammar.rules:
+            return name
+        index += 1
+
+
+def eliminate_left_recursion(grammar):
+    """
+    消除左递归：在每个互相左递归的非终结符组内按文法顺序代入 (Paull 算法)，
+    再把直接左递归 A -> A α | β 改写为 A -> β A'，A' -> α A' | 空
+    """
+    for group in left_recursive_groups(grammar):
+        for i, nonterminal in enumerate(group):
+            for earlier in group[:i]:
+                substituted = []
+                for production in grammar.rules[nonterminal]:
+                    symbol, index = left_corner(production)
+                    if symbol != earlier:
+                        substituted.append(production)
+                        continue
+                    for replacement in grammar.rules[earlier]:
+                        substituted.append(
+                            Production(
+                                nonterminal,
+                                production.rhs[:index]
+                                + replacement.rhs
+                                + production.rhs[index + 1 :],
+                            )
+                        )
+                grammar.rules[nonterminal] = substituted
+
+            recursive, others = [], []
+            for production in grammar.rules[nonterminal]:
+                symbol, index = left_corner(production)
+                if symbol != nonterminal:
+                    others.append(production)
+                elif index:
+                    raise ValueError(f"无法消除的左递归: {production}")
+                else:
+                    recursive.append(production)
+            if not recursive:
+                continue
+            tail = new_name(grammar, nonterminal, "'")
+            grammar.rules[nonterminal] = [
+                Production(nonterminal, p.rhs + (tail,)) for p in others
+            ]
+            grammar.rules[tail] = [
+                Production(tail, p.rhs[1:] + (tail,)) for p in recursive
+            ] + [Production(tail, ())]
+    return grammar
+
+
+def left_factor(grammar):
+    """提取左公因子：A -> α β1 | α β2 改写为 A -> α A_n，A_n -> β1 | β2，直到没有公共前缀"""
+    pending = list(grammar.rules)
+    while pending:
+        nonterminal = pending.pop(0)
+        alternatives = grammar.rules[nonterminal]
+        groups = {}
+        for production in alternatives:
+            if production.rhs:
+                groups.setdefault(production.rhs[0], []).append(production)
+        shared = next((g for g in groups.values() if len(g) > 1), None)
+        if shared is None:
+            continue
+        prefix = shared[0].rhs
+        for production in shared[1:]:
+            length = 0
+            while (
+                length < len(prefix)
+                and length < len(production.rhs)
+                and prefix[length] == production.rhs[length]
+            ):
+                length += 1
+            prefix = prefix[:length]
+        factored = new_name(grammar, nonterminal, "_")
+        grammar.rules[factored] = [
+            Production(factored, p.rhs[len(prefix) :]) for p in shared
+        ]
+        # 新产生式放在公共前缀组第一个成员的位置，保持候选的先后顺序
+        position = alternatives.index(shared[0])
+        rest = [p for p in alternatives if p not in shared]
+        rest.insert(position, Production(nonterminal, prefix + (factored,)))
+        grammar.rules[nonterminal] = rest
+        pending.extend([nonterminal, factored])
+    return grammar
+
+
+def inline_left_corners(grammar):
+    """
+    冲突单元中的候选若以不同的非终结符开头 (如 <语句> 的两种 let 语句)，提取左公因子无法合并。
+    当这些非终结符的产生式都以终结符开头时，把它们代入候选再提取左公因子，直到不再变化。
+    :return: 是否有改动
+    """
+    changed = False
+    while True:
+        first, nullable = compute_first(grammar)
+        follow = compute_follow(grammar, first, nullable)
+        table = predict_sets(grammar, first, follow, nullable)
+        targets = {}
+        for nonterminal, _, alternatives in ll1_conflicts(table):
+            corners = [left_corner(p) for p in alternatives]
+            if any(index for _, index in corners):
+                continue
+            inlinable = [
+                symbol
+                for symbol, _ in corners
+                if grammar.is_nonterminal(symbol)
+                and symbol != nonterminal
+                and all(
+                    left_corner(p)[0] is not None
+                    and not grammar.is_nonterminal(left_corner(p)[0])
+                    for p in grammar.rules[symbol]
+                )
+            ]
+            if inlinable and len(inlinable) == sum(
+                grammar.is_nonterminal(symbol) for symbol, _ in corners
+            ):
+                targets.setdefault(nonterminal, set()).update(inlinable)
+        if not targets:
+            return changed
+        for nonterminal, symbols in targets.items():
+            expanded = []
+            for production in grammar.rules[nonterminal]:
+                symbol = production.rhs[0] if production.rhs else None
+                if symbol not in symbols:
+                    expanded.append(production)
+                    continue
+                for replacement in grammar.rules[symbol]:
+                    expanded.append(
+                        Production(nonterminal, replacement.rhs + production.rhs[1:])
+                    )
+            grammar.rules[nonterminal] = expanded
+        left_factor(grammar)
+        changed = True
+
+
+def remove_unreachable(grammar):
+    """删除从开始符号不可达的非终结符 (被代入后不再使用的)"""
+    reachable = {grammar.start}
+    pending = [grammar.start]
+    while pending:
+        for production in grammar.rules[pending.pop()]:
+            for symbol in production.rhs:
+                if grammar.is_nonterminal(symbol) and symbol not in reachable:
+                    reachable.add(symbol)
+                    pending.append(symbol)
+    grammar.rules = {
+        nonterminal: alternatives
+        for nonterminal, alternatives in grammar.rules.items()
+        if nonterminal in reachable
+    }
+    return grammar
+
+
+def transform(grammar):
+    """返回带归约标记、消除左递归并提取左公因子后的新文法"""
+    rules = {}
+    for index, production in enumerate(grammar.originals):
+        rules.setdefault(production.lhs, []).append(
+            Production(production.lhs, production.rhs + (index,))
+        )
+    result = left_factor(
+        eliminate_left_recursion(Grammar(grammar.start, rules, grammar.originals))
+    )
+    inline_left_corners(result)
+    return remove_unreachable(result)
+
+
+# --- LL(2) 冲突消解 ---
+def concat2(left, right):
+    """两个长度不超过 2 的终结符串集合的连接，截断为前 2 个"""
+    result = set()
+    for x in left:
+        if len(x) >= 2:
+            result.add(x)
+        else:
+            for y in right:
+                result.add((x + y)[:2])
+    return result
+
+
+def compute_first2(grammar):
+    """各非终结符能推导出的终结符串的前 2 个符号"""
+    first2 = {nonterminal: set() for nonterminal in grammar.rules}
+    changed = True
+    while changed:
+        changed = False
+        for production in grammar.productions:
+            strings = sequence_first2(production.rhs, first2)
+            target = first2[production.lhs]
+            if not strings <= target:
+                target |= strings
+                changed = True
+    return first2
+
+
+def sequence_first2(symbols, first2):
+    strings = {()}
+    for symbol in symbols:
+        if isinstance(symbol, int):
+            continue
+        if all(len(s) >= 2 for s in strings):
+            break
+        strings = concat2(strings, first2.get(symbol, {(symbol,)}))
+    return strings
+
+
+class Conflict:
+    """预测分析表中需要按规则选择候选的单元 (以原始产生式描述)"""
+
+    def __init__(self, nonterminal, terminal, lookaheads, chosen, discarded, reason):
+        self.nonterminal = nonterminal
+        self.terminal = terminal
+        self.lookaheads = lookaheads  # 适用的下一个终结符，LL(2) 也无法区分的单元
+        self.chosen = chosen
+        self.discarded = discarded
+        self.reason = reason
+
+
+def origins(grammar, production, cache):
+    """产生式可能完成的原始产生式下标 (包括经由变换引入的非终结符间接包含的标记)"""
+    key = id(production)
+    if key in cache:
+        return cache[key]
+    cache[key] = result = set()
+    for symbol in production.rhs:
+        if isinstance(symbol, int):
+            result.add(symbol)
+        elif grammar.is_nonterminal(symbol) and symbol not in grammar.originals_lhs:
+            for child in grammar.rules[symbol]:
+                result |= origins(grammar, child, cache)
+    return result
+
+
+def build_table(grammar):
+    """
+    为变换后的文法构造预测分析表。LL(1) 冲突的单元再按下一个终结符 (LL(2)) 细分，
+    仍无法区分的按 PREFERENCES 或原始产生式的顺序选择。
+    :return: (分析表, 冲突列表)；分析表的值为右部或 {下一个终结符: 右部, "": 默认右部}
+    """
+    grammar.originals_lhs = {p.lhs for p in grammar.originals}
+    first, nullable = compute_first(grammar)
+    follow = compute_follow(grammar, first, nullable)
+    first2 = compute_first2(grammar)
+    preferred = {}
+    for rank, text in enumerate(PREFERENCES):
+        for index, production in enumerate(grammar.originals):
+            if production.text == text:
+                preferred[index] = rank
+    cache = {}
+
+    def rank(production):
+        marks = origins(grammar, production, cache)
+        return (
+            min(
+                (preferred[m] for m in marks if m in preferred), default=len(preferred)
+            ),
+            min(marks, default=len(grammar.originals)),
+        )
+
+    def describe(production):
+        """决定候选优先级的原始产生式"""
+        marks = origins(grammar, production, cache)
+        mark = min(marks, key=lambda m: (preferred.get(m, len(preferred)), m))
+        return grammar.originals[mark].text
+
+    def choose(alternatives):
+        best = min(alternatives, key=rank)
+        reason = "优先规则" if rank(best)[0] < len(preferred) else "产生式顺序"
+        return best, reason
+
+    table = {}
+    conflicts = []
+    for nonterminal, row in predict_sets(grammar, first, follow, nullable).items():
+        entries = table[nonterminal] = {}
+        follow_strings = {(terminal,) for terminal in follow[nonterminal]}
+        for terminal, alternatives in row.items():
+            if len(alternatives) == 1:
+                entries[terminal] = alternatives[0].rhs
+                continue
+            by_next = {}
+            for production in alternatives:
+                strings = concat2(
+                    sequence_first2(production.rhs, first2), follow_strings
+                )
+                for string in strings:
+                    if string[0] == terminal:
+                        lookahead = string[1] if len(string) > 1 else END
+                        by_next.setdefault(lookahead, []).append(production)
+            default, _ = choose(alternatives)
+            sub = {}
+            unresolved = {}
+            for lookahead in sorted(by_next):
+                candidates = by_next[lookahead]
+                chosen = candidates[0]
+                if len(candidates) > 1:
+                    chosen, reason = choose(candidates)
+                    discarded = tuple(
+                        describe(p) for p in candidates if p is not chosen
+                    )
+                    key = (describe(chosen), discarded, reason)
+                    unresolved.setdefault(key, []).append(lookahead)
+                if chosen is not default:
+                    sub[lookahead] = chosen.rhs
+            for (chosen, discarded, reason), lookaheads in unresolved.items():
+                conflicts.append(
+                    Conflict(
+                        nonterminal, terminal, lookaheads, chosen, discarded, reason
+                    )
+                )
+            if sub:
+                sub[""] = default.rhs
+                entries[terminal] = sub
+            else:
+                entries[terminal] = default.rhs
+    return table, conflicts
+
+
+# --- 输出 ---
+def text_width(text):
+    """显示宽度 (全角字符计 2)，与 black 计算行宽的方式一致"""
+    return sum(2 if unicodedata.east_asian_width(c) in "WF" else 1 for c in text)
+
+
+def literal(value):
+    """以双引号书写的 Python 字面量"""
+    if isinstance(value, str):
+        return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+    return repr(value)
+
+
+def emit_rhs(lines, indent, prefix, rhs):
+    """写出逆序右部元组，超出行宽时每个符号一行"""
+    items = [literal(symbol) for symbol in reversed(rhs)]
+    if len(items) == 1:
+        body = f"({items[0]},)"
+    else:
+        body = f"({', '.join(items)})"
+    line = f"{indent}{prefix}{body},"
+    if text_width(line) <= 88:
+        lines.append(line)
+        return
+    lines.append(f"{indent}{prefix}(")
+    for item in items:
+        lines.append(f"{indent}    {item},")
+    lines.append(f"{indent}),")
+
+
+def write_table(path, grammar, table, source):
+    """把分析表写成 Python 模块，供 ll1_parser.LL1Parser 使用"""
+    now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    lines = [
+        '"""',
+        f"Description  : 由 ll1_generator.py 根据 {source} 自动生成的 LL(1) 预测分析表，"
+        "请勿手工修改",
+        "Author       : Hyoung",
+        f"Date         : {now}",
+        f"LastEditTime : {now}",
+        "FilePath     : \\\\课程设计\\\\rust-like-compiler\\\\ll1_table.py",
+        '"""',
+        "",
+        "# 文法开始符号",
+        f"START = {literal(grammar.start)}",
+        "",
+        "# 原始产生式 (文本, 右部符号数)，下标即归约标记",
+        "PRODUCTIONS = [",
+    ]
+    for production in grammar.originals:
+        line = f"    ({literal(production.text)}, {len(production.rhs)}),"
+        if text_width(line) <= 88:
+            lines.append(line)
+        else:
+            lines += [
+                "    (",
+                f"        {literal(production.text)},",
+                f"        {len(production.rhs)},",
+                "    ),",
+            ]
+    lines += [
+        "]",
+        "",
+        "# 预测分析表: 非终结符 -> {当前终结符: 逆序右部}，右部中的整数是归约标记；",
+        '# 值为字典时再按下一个终结符选择右部 ("" 为默认)',
+        "TABLE = {",
+    ]
+    for nonterminal, row in table.items():
+        lines.append(f"    {literal(nonterminal)}: {{")
+        for terminal in sorted(row):
+            entry = row[terminal]
+            if isinstance(entry, dict):
+                lines.append(f"        {literal(terminal)}: {{")
+                for lookahead in sorted(entry):
+                    emit_rhs(
+                        lines, " " * 12, f"{literal(lookahead)}: ", entry[lookahead]
+                    )
+                lines.append("        },")
+            else:
+                emit_rhs(lines, " " * 8, f"{literal(terminal)}: ", entry)
+        lines.append("    },")
+    lines.append("}")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def print_sets(grammar, first, follow, nullable):
+    for nonterminal in grammar.rules:
+        first_text = " ".join(sorted(first[nonterminal]))
+        if nonterminal in nullable:
+            first_text += f" {EPSILON}"
+        print(f"  {nonterminal}")
+        print(f"    FIRST : {first_text}")
+        print(f"    FOLLOW: {' '.join(sorted(follow[nonterminal]))}")
+
+
+def main():
+    root_dir = os.path.dirname(os.path.abspath(__file__))
+    arg_parser = argparse.ArgumentParser(description="LL(1) 分析表生成器")
+    arg_parser.add_argument(
+        "grammar", nargs="?", default=os.path.join(root_dir, "grammar.txt")
+    )
+    arg_parser.add_argument(
+        "--output", default=os.path.join(root_dir, "ll1_table.py"), help="分析表模块"
+    )
+    arg_parser.add_argument(
+        "--sets", action="store_true", help="输出原文法的 FIRST/FOLLOW 集合"
+    )
+    args = arg_parser.parse_args()
+
+    grammar = read_grammar(args.grammar)
+    first, nullable = compute_first(grammar)
+    follow = compute_follow(grammar, first, nullable)
+    print(
+        f"{os.path.basename(args.grammar)}: {len(grammar.originals)} 条产生式, "
+        f"{len(grammar.rules)} 个非终结符, {len(grammar.terminals())} 个终结符"
+    )
+    if args.sets:
+        print("\nFIRST / FOLLOW 集合:")
+        print_sets(grammar, first, follow, nullable)
+
+    groups = left_recursive_groups(grammar)
+    print(f"\n左递归 ({len(groups)} 组):")
+    for group in groups:
+        kind = "直接" if len(group) == 1 else "间接"
+        print(f"  {kind}: {', '.join(group)}")
+
+    conflicts = ll1_conflicts(predict_sets(grammar, first, follow, nullable))
+    print(f"\n原文法的 LL(1) 冲突 ({len(conflicts)} 个单元):")
+    grouped = {}
+    for nonterminal, terminal, alternatives in conflicts:
+        key = tuple(production.text for production in alternatives)
+        grouped.setdefault(key, []).append(terminal)
+    for texts, terminals in grouped.items():
+        print(f"  当前为 {' '.join(sorted(terminals))} 时:")
+        for text in texts:
+            print(f"      {text}")
+
+    transformed = transform(grammar)
+    table, resolved = build_table(transformed)
+    print(
+        f"\n消除左递归并提取左公因子后: {len(transformed.rules)} 个非终结符, "
+        f"{len(transformed.productions)} 条产生式"
+    )
+    cells = sum(
+        isinstance(entry, dict) for row in table.values() for entry in row.values()
+    )
+    print(f"LL(1) 向前看仍有冲突、按下一个终结符 (LL(2)) 选择的单元: {cells} 个")
+    print(f"LL(2) 也无法区分、按规则选择的单元 ({len(resolved)} 处):")
+    for conflict in resolved:
+        print(
+            f"  [{conflict.nonterminal}, {conflict.terminal}] "
+            f"下一个为 {' '.join(conflict.lookaheads)} 时 ({conflict.reason}):"
+        )
+        print(f"      选择 {conflict.chosen}")
+        for text in conflict.discarded:
+            print(f"      舍弃 {text}")
+
+    write_table(args.output, transformed, table, os.path.basename(args.grammar))
+    print(f"\n分析表已写入 {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,359 @@
+"""
+Description  : 表驱动的 LL(1) 预测分析器：按 ll1_generator.py 生成的分析表 (ll1_table.py)
+               用显式符号栈分析，弹出归约标记时按 grammar.txt 的原始产生式构造语法树
+Author       : Hyoung
+Date         : 2026-10-17 18:25:37
+LastEditTime : 2026-10-17 18:25:37
+FilePath     : \\课程设计\\rust-like-compiler\\ll1_parser.py
+"""
+
+from ll1_table import PRODUCTIONS, START, TABLE
+from lexer import (
+    PUNCTUATORS,
+    TT_EOF,
+    TT_IDENTIFIER,
+    TT_KEYWORD,
+    TT_NUMBER,
+    TokenStream,
+)
+from parallel_compiler import myparser
+from parser_nodes import *
+
+ParseError = myparser.ParseError
+
+END = "$"
+
+# Token 类型 -> 文法中的终结符 (关键字的终结符就是关键字本身)
+TERMINALS = {TT_IDENTIFIER: "<ID>", TT_NUMBER: "<NUM>", TT_EOF: END}
+TERMINALS.update((token_type, f"'{lexeme}'") for lexeme, token_type in PUNCTUATORS)
+
+
+def terminal_of(token):
+    """Token 对应的文法终结符"""
+    if token.type == TT_KEYWORD:
+        return token.value
+    return TERMINALS.get(token.type, token.type)
+
+
+def describe(token):
+    return token.type if token.value is None else token.value
+
+
+# --- 语义动作 ---
+# 以产生式文本为键，参数是右部各符号的值 (终结符为 Token)。
+# 右递归的列表产生式从最后一个元素开始归约，动作按逆序追加，由使用列表的产生式翻转。
+def append(item, rest):
+    rest.append(item)
+    return rest
+
+
+def append_after_comma(item, comma, rest):
+    rest.append(item)
+    return rest
+
+
+def identity(value):
+    return value
+
+
+def function_decl(header, body):
+    name_token, params, return_type = header
+    if return_type is not None and isinstance(body, BlockNode):
+        # 与手写分析器一致：有返回类型的函数体按函数表达式块处理
+        body = FunctionExprNode(body.statements)
+    return FunctionDeclNode(name_token, params, return_type, body)
+
+
+def untyped_let(let, var_internal, semicolon):
+    name_token = var_internal.name
+    raise ParseError(
+        f"变量 {name_token.value} 没有显式类型且没有初始化表达式，无法推导类型 "
+        f"at L{name_token.line}C{name_token.column}",
+        name_token,
+    )
+
+
+def unsupported_type(token, *rest):
+    raise ParseError(f"暂不支持的类型 {token.value}", token)
+
+
+def else_if(else_token, if_token, condition, block, rest):
+    parts, else_block = rest
+    parts.append({"condition": condition, "block": block})
+    return parts, else_block
+
+
+ACTIONS = {
+    "Program -> <声明串>": lambda decls: ProgramNode(decls[::-1]),
+    "<声明串> -> 空": list,
+    "<声明串> -> <声明> <声明串>": append,
+    "<声明> -> <函数声明>": identity,
+    "<函数声明> -> <函数头声明> <语句块>": function_decl,
+    "<函数声明> -> <函数头声明> <函数表达式语句块>": function_decl,
+    "<函数头声明> -> fn <ID> '(' <形参列表> ')'": (
+        lambda fn, name, lparen, params, rparen: (name, params[::-1], None)
+    ),
+    "<函数头声明> -> fn <ID> '(' <形参列表> ')' '->' <类型>": (
+        lambda fn, name, lparen, params, rparen, arrow, type_: (
+            name,
+            params[::-1],
+            type_,
+        )
+    ),
+    "<形参列表> -> 空": list,
+    "<形参列表> -> <形参>": lambda param: [param],
+    "<形参列表> -> <形参> ',' <形参列表>": append_after_comma,
+    "<形参> -> <变量声明内部> ':' <类型>": (
+        lambda var_internal, colon, type_: ParamNode(var_internal, type_)
+    ),
+    "<变量声明内部> -> mut <ID>": (
+        lambda mut, name: VariableInternalDeclNode(True, name)
+    ),
+    "<变量声明内部> -> <ID>": lambda name: VariableInternalDeclNode(False, name),
+    # 与手写分析器一致，只支持 i32
+    "<类型> -> i32": lambda token: "i32",
+    "<类型> -> '&' mut <类型>": unsupported_type,
+    "<类型> -> '&' <类型>": unsupported_type,
+    "<类型> -> '[' <类型> ';' <NUM> ']'": unsupported_type,
+    "<类型> -> '(' <元组类型内部> ')'": unsupported_type,
+    "<元组类型内部> -> 空": list,
+    "<元组类型内部> -> <类型> ',' <类型列表>": append_after_comma,
+    "<类型列表> -> 空": list,
+    "<类型列表> -> <类型>": lambda type_: [type_],
+    "<类型列表> -> <类型> ',' <类型列表>": append_after_comma,
+    # 语句
+    "<语句块> -> '{' <语句串> '}'": (
+        lambda lbrace, statements, rbrace: BlockNode(statements[::-1])
+    ),
+    "<语句串> -> 空": list,
+    "<语句串> -> <语句> <语句串>": append,
+    "<语句> -> ';'": lambda semicolon: EmptyStatementNode(),
+    "<语句> -> <返回语句>": identity,
+    "<语句> -> <变量声明语句>": identity,
+    "<语句> -> <赋值语句>": identity,
+    "<语句> -> <变量声明赋值语句>": identity,
+    "<语句> -> <表达式> ';'": lambda expr, semicolon: ExprStatementNode(expr),
+    "<语句> -> <if语句>": identity,
+    "<语句> -> <循环语句>": identity,
+    "<语句> -> break ';'": lambda break_, semicolon: BreakNode(),
+    "<语句> -> break <表达式> ';'": lambda break_, expr, semicolon: BreakNode(expr),
+    "<语句> -> continue ';'": lambda continue_, semicolon: ContinueNode(),
+    "<返回语句> -> return ';'": lambda return_, semicolon: ReturnNode(),
+    "<返回语句> -> return <表达式> ';'": (
+        lambda return_, expr, semicolon: ReturnNode(expr)
+    ),
+    "<变量声明语句> -> let <变量声明内部> ':' <类型> ';'": (
+        lambda let, var_internal, colon, type_, semicolon: LetDeclNode(
+            var_internal, type_
+        )
+    ),
+    "<变量声明语句> -> let <变量声明内部> ';'": untyped_let,
+    "<变量声明赋值语句> -> let <变量声明内部> ':' <类型> '=' <表达式> ';'": (
+        lambda let, var_internal, colon, type_, assign, expr, semicolon: LetDeclNode(
+            var_internal, type_, expr
+        )
+    ),
+    "<变量声明赋值语句> -> let <变量声明内部> '=' <表达式> ';'": (
+        lambda let, var_internal, assign, expr, semicolon: LetDeclNode(
+            var_internal, None, expr
+        )
+    ),
+    "<赋值语句> -> <可赋值元素> '=' <表达式> ';'": (
+        lambda target, assign, expr, semicolon: AssignNode(target, expr)
+    ),
+    "<if语句> -> if <表达式> <语句块> <else部分>": (
+        lambda if_, condition, block, rest: IfNode(
+            condition, block, rest[0][::-1], rest[1]
+        )
+    ),
+    "<else部分> -> 空": lambda: ([], None),
+    "<else部分> -> else <语句块>": lambda else_, block: ([], block),
+    "<else部分> -> else if <表达式> <语句块> <else部分>": else_if,
+    "<循环语句> -> <while语句>": identity,
+    "<循环语句> -> <for语句>": identity,
+    "<循环语句> -> <loop语句>": identity,
+    "<while语句> -> while <表达式> <语句块>": (
+        lambda while_, condition, body: WhileNode(condition, body)
+    ),
+    "<for语句> -> for <变量声明内部> in <可迭代结构> <语句块>": (
+        lambda for_, var_internal, in_, iterable, body: ForNode(
+            var_internal, iterable, body
+        )
+    ),
+    "<可迭代结构> -> <表达式> '..' <表达式>": (
+        lambda start, dotdot, end: RangeNode(start, end)
+    ),
+    "<可迭代结构> -> <元素>": identity,
+    "<loop语句> -> loop <语句块>": lambda loop, body: LoopNode(body),
+    # 表达式
+    "<表达式> -> <加法表达式>": identity,
+    "<表达式> -> <表达式> <比较运算符> <加法表达式>": BinaryOpNode,
+    "<表达式> -> <函数表达式语句块>": identity,
+    "<表达式> -> <选择表达式>": identity,
+    "<表达式> -> <loop语句>": lambda loop: LoopExprNode(loop.body),
+    "<加法表达式> -> <项>": identity,
+    "<加法表达式> -> <加法表达式> <加减运算符> <项>": BinaryOpNode,
+    "<项> -> <因子>": identity,
+    "<项> -> <项> <乘除运算符> <因子>": BinaryOpNode,
+    "<因子> -> <元素>": identity,
+    "<因子> -> '*' <因子>": UnaryOpNode,
+    "<因子> -> '&' mut <因子>": lambda amp, mut, expr: BorrowNode(True, expr),
+    "<因子> -> '&' <因子>": lambda amp, expr: BorrowNode(False, expr),
+    "<因子> -> '[' <数组元素列表> ']'": (
+        lambda lbracket, elements, rbracket: ArrayLiteralNode(elements[::-1])
+    ),
+    "<因子> -> '(' <元组赋值内部> ')'": (
+        lambda lparen, elements, rparen: TupleLiteralNode(elements[::-1])
+    ),
+    "<元素> -> <NUM>": NumberNode,
+    "<元素> -> <可赋值元素>": identity,
+    "<元素> -> '(' <表达式> ')'": lambda lparen, expr, rparen: expr,
+    "<元素> -> <ID> '(' <实参列表> ')'": (
+        lambda name, lparen, args, rparen: FunctionCallNode(
+            IdentifierNode(name), args[::-1]
+        )
+    ),
+    "<可赋值元素> -> <ID>": IdentifierNode,
+    "<可赋值元素> -> <元素> '[' <表达式> ']'": (
+        lambda array, lbracket, index, rbracket: ArrayAccessNode(array, index)
+    ),
+    "<可赋值元素> -> <元素> '.' <NUM>": (
+        lambda tuple_, dot, index: TupleAccessNode(tuple_, index)
+    ),
+    "<实参列表> -> 空": list,
+    "<实参列表> -> <表达式>": lambda expr: [expr],
+    "<实参列表> -> <表达式> ',' <实参列表>": append_after_comma,
+    "<数组元素列表> -> 空": list,
+    "<数组元素列表> -> <表达式>": lambda expr: [expr],
+    "<数组元素列表> -> <表达式> ',' <数组元素列表>": append_after_comma,
+    "<元组赋值内部> -> 空": list,
+    "<元组赋值内部> -> <表达式> ',' <元组元素列表>": append_after_comma,
+    "<元组元素列表> -> 空": list,
+    "<元组元素列表> -> <表达式>": lambda expr: [expr],
+    "<元组元素列表> -> <表达式> ',' <元组元素列表>": append_after_comma,
+    "<函数表达式语句块> -> '{' <函数表达式语句串> '}'": (
+        lambda lbrace, items, rbrace: FunctionExprNode(items[::-1])
+    ),
+    # 末尾的表达式作为函数表达式块的值，与 IRGenerator 的约定一致
+    "<函数表达式语句串> -> <表达式>": lambda expr: [expr],
+    "<函数表达式语句串> -> <语句> <函数表达式语句串>": append,
+    "<选择表达式> -> if <表达式> <函数表达式语句块> else <函数表达式语句块>": (
+        lambda if_, condition, then_block, else_, else_block: IfExprNode(
+            condition, then_block, else_block
+        )
+    ),
+    # 运算符产生式的值就是运算符 Token
+    "<比较运算符> -> '<'": identity,
+    "<比较运算符> -> '<='": identity,
+    "<比较运算符> -> '>'": identity,
+    "<比较运算符> -> '>='": identity,
+    "<比较运算符> -> '=='": identity,
+    "<比较运算符> -> '!='": identity,
+    "<加减运算符> -> '+'": identity,
+    "<加减运算符> -> '-'": identity,
+    "<乘除运算符> -> '*'": identity,
+    "<乘除运算符> -> '/'": identity,
+}
+
+
+def missing_action(text):
+    """grammar.txt 中新增、但尚未编写语义动作的产生式"""
+
+    def action(*values):
+        tokens = [value for value in values if hasattr(value, "line")]
+        token = tokens[0] if tokens else None
+        raise ParseError(f"产生式 {text} 没有对应的语义动作", token)
+
+    return action
+
+
+# 归约标记 (原始产生式下标) -> (右部符号数, 语义动作)
+REDUCTIONS = [
+    (length, ACTIONS.get(text) or missing_action(text)) for text, length in PRODUCTIONS
+]
+
+
+def strip_unit_reductions(rhs):
+    """去掉单个符号原样传递的归约标记 (<表达式> -> <加法表达式> 等)，它们不改变值栈"""
+    if isinstance(rhs, dict):
+        return {key: strip_unit_reductions(value) for key, value in rhs.items()}
+    return tuple(
+        symbol
+        for symbol in rhs
+        if not isinstance(symbol, int) or REDUCTIONS[symbol] != (1, identity)
+    )
+
+
+# 分析器实际使用的分析表
+PARSE_TABLE = {
+    nonterminal: {terminal: strip_unit_reductions(rhs) for terminal, rhs in row.items()}
+    for nonterminal, row in TABLE.items()
+}
+
+
+class LL1Parser:
+    """
+    表驱动的预测分析器，接口与手写的 Parser 相同 (parse_program 返回 ProgramNode)。
+    符号栈中的字符串是文法符号，整数是归约标记：弹出标记时从值栈取出相应个数的值
+    调用语义动作。分析表中值为字典的单元再按下一个 Token 选择产生式 (LL(2))。
+    与 Parser 不同，程序必须在最后一个函数之后结束。
+    """
+
+    def __init__(self, lexer):
+        if isinstance(lexer, TokenStream):
+            self.tokens = lexer
+        else:
+            self.tokens = TokenStream(lexer.iter_tokens())
+        self.current_token = self.tokens.next()
+
+    def error(self, expected, token):
+        return ParseError(
+            f"期望 {expected}，但得到 {describe(token)} at L{token.line}C{token.column}",
+            token,
+        )
+
+    def parse_program(self):
+        tokens = self.tokens
+        table = PARSE_TABLE
+        reductions = REDUCTIONS
+        terminals = TERMINALS
+        token = self.current_token
+        lookahead = terminal_of(token)
+        stack = [END, START]
+        values = []
+        while True:
+            symbol = stack.pop()
+            if symbol.__class__ is int:
+                length, action = reductions[symbol]
+                if length:
+                    args = values[-length:]
+                    del values[-length:]
+                    values.append(action(*args))
+                else:
+                    values.append(action())
+                continue
+            row = table.get(symbol)
+            if row is None:
+                # 终结符
+                if symbol != lookahead:
+                    self.current_token = token
+                    raise self.error(symbol, token)
+                if symbol == END:
+                    break
+                values.append(token)
+                token = tokens.next()
+                # 即 terminal_of(token)，逐个 Token 执行，展开以省去函数调用
+                if token.type == TT_KEYWORD:
+                    lookahead = token.value
+                else:
+                    lookahead = terminals.get(token.type, token.type)
+                continue
+            rhs = row.get(lookahead)
+            if rhs is None:
+                self.current_token = token
+                raise self.error(f"{symbol} ({' '.join(sorted(row))} 之一)", token)
+            if rhs.__class__ is dict:
+                rhs = rhs.get(terminal_of(tokens.peek()), rhs[""])
+            stack.extend(rhs)
+        self.current_token = token
+        return values[0]
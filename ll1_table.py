@@ -0,0 +1,658 @@
+"""
+Description  : 由 ll1_generator.py 根据 grammar.txt 自动生成的 LL(1) 预测分析表，请勿手工修改
+Author       : Hyoung
+Date         : 2026-10-17 01:31:53
+LastEditTime : 2026-10-17 01:31:53
+FilePath     : \\课程设计\\rust-like-compiler\\ll1_table.py
+"""
+
+# 文法开始符号
+START = "Program"
+
+# 原始产生式 (文本, 右部符号数)，下标即归约标记
+PRODUCTIONS = [
+    ("Program -> <声明串>", 1),
+    ("<声明串> -> 空", 0),
+    ("<声明串> -> <声明> <声明串>", 2),
+    ("<声明> -> <函数声明>", 1),
+    ("<函数声明> -> <函数头声明> <语句块>", 2),
+    ("<函数头声明> -> fn <ID> '(' <形参列表> ')'", 5),
+    ("<形参列表> -> 空", 0),
+    ("<语句块> -> '{' <语句串> '}'", 3),
+    ("<语句串> -> 空", 0),
+    ("<变量声明内部> -> mut <ID>", 2),
+    ("<类型> -> i32", 1),
+    ("<可赋值元素> -> <ID>", 1),
+    ("<语句串> -> <语句> <语句串>", 2),
+    ("<语句> -> ';'", 1),
+    ("<语句> -> <返回语句>", 1),
+    ("<返回语句> -> return ';'", 2),
+    ("<形参列表> -> <形参>", 1),
+    ("<形参列表> -> <形参> ',' <形参列表>", 3),
+    ("<形参> -> <变量声明内部> ':' <类型>", 3),
+    ("<函数头声明> -> fn <ID> '(' <形参列表> ')' '->' <类型>", 7),
+    ("<返回语句> -> return <表达式> ';'", 3),
+    ("<语句> -> <变量声明语句>", 1),
+    ("<变量声明语句> -> let <变量声明内部> ':' <类型> ';'", 5),
+    ("<变量声明语句> -> let <变量声明内部> ';'", 3),
+    ("<语句> -> <赋值语句>", 1),
+    ("<赋值语句> -> <可赋值元素> '=' <表达式> ';'", 4),
+    ("<语句> -> <变量声明赋值语句>", 1),
+    ("<变量声明赋值语句> -> let <变量声明内部> ':' <类型> '=' <表达式> ';'", 7),
+    ("<变量声明赋值语句> -> let <变量声明内部> '=' <表达式> ';'", 5),
+    ("<语句> -> <表达式> ';'", 2),
+    ("<表达式> -> <加法表达式>", 1),
+    ("<加法表达式> -> <项>", 1),
+    ("<项> -> <因子>", 1),
+    ("<因子> -> <元素>", 1),
+    ("<元素> -> <NUM>", 1),
+    ("<元素> -> <可赋值元素>", 1),
+    ("<元素> -> '(' <表达式> ')'", 3),
+    ("<表达式> -> <表达式> <比较运算符> <加法表达式>", 3),
+    ("<加法表达式> -> <加法表达式> <加减运算符> <项>", 3),
+    ("<项> -> <项> <乘除运算符> <因子>", 3),
+    ("<比较运算符> -> '<'", 1),
+    ("<比较运算符> -> '<='", 1),
+    ("<比较运算符> -> '>'", 1),
+    ("<比较运算符> -> '>='", 1),
+    ("<比较运算符> -> '=='", 1),
+    ("<比较运算符> -> '!='", 1),
+    ("<加减运算符> -> '+'", 1),
+    ("<加减运算符> -> '-'", 1),
+    ("<乘除运算符> -> '*'", 1),
+    ("<乘除运算符> -> '/'", 1),
+    ("<元素> -> <ID> '(' <实参列表> ')'", 4),
+    ("<实参列表> -> 空", 0),
+    ("<实参列表> -> <表达式>", 1),
+    ("<实参列表> -> <表达式> ',' <实参列表>", 3),
+    ("<语句> -> <if语句>", 1),
+    ("<if语句> -> if <表达式> <语句块> <else部分>", 4),
+    ("<else部分> -> 空", 0),
+    ("<else部分> -> else <语句块>", 2),
+    ("<else部分> -> else if <表达式> <语句块> <else部分>", 5),
+    ("<语句> -> <循环语句>", 1),
+    ("<循环语句> -> <while语句>", 1),
+    ("<while语句> -> while <表达式> <语句块>", 3),
+    ("<循环语句> -> <for语句>", 1),
+    ("<for语句> -> for <变量声明内部> in <可迭代结构> <语句块>", 5),
+    ("<可迭代结构> -> <表达式> '..' <表达式>", 3),
+    ("<循环语句> -> <loop语句>", 1),
+    ("<loop语句> -> loop <语句块>", 2),
+    ("<语句> -> break ';'", 2),
+    ("<语句> -> continue ';'", 2),
+    ("<变量声明内部> -> <ID>", 1),
+    ("<因子> -> '*' <因子>", 2),
+    ("<因子> -> '&' mut <因子>", 3),
+    ("<因子> -> '&' <因子>", 2),
+    ("<类型> -> '&' mut <类型>", 3),
+    ("<类型> -> '&' <类型>", 2),
+    ("<表达式> -> <函数表达式语句块>", 1),
+    ("<函数表达式语句块> -> '{' <函数表达式语句串> '}'", 3),
+    ("<函数表达式语句串> -> <表达式>", 1),
+    ("<函数表达式语句串> -> <语句> <函数表达式语句串>", 2),
+    ("<函数声明> -> <函数头声明> <函数表达式语句块>", 2),
+    ("<表达式> -> <选择表达式>", 1),
+    ("<选择表达式> -> if <表达式> <函数表达式语句块> else <函数表达式语句块>", 5),
+    ("<表达式> -> <loop语句>", 1),
+    ("<语句> -> break <表达式> ';'", 3),
+    ("<类型> -> '[' <类型> ';' <NUM> ']'", 5),
+    ("<因子> -> '[' <数组元素列表> ']'", 3),
+    ("<数组元素列表> -> 空", 0),
+    ("<数组元素列表> -> <表达式>", 1),
+    ("<数组元素列表> -> <表达式> ',' <数组元素列表>", 3),
+    ("<可赋值元素> -> <元素> '[' <表达式> ']'", 4),
+    ("<可迭代结构> -> <元素>", 1),
+    ("<类型> -> '(' <元组类型内部> ')'", 3),
+    ("<元组类型内部> -> 空", 0),
+    ("<元组类型内部> -> <类型> ',' <类型列表>", 3),
+    ("<类型列表> -> 空", 0),
+    ("<类型列表> -> <类型>", 1),
+    ("<类型列表> -> <类型> ',' <类型列表>", 3),
+    ("<因子> -> '(' <元组赋值内部> ')'", 3),
+    ("<元组赋值内部> -> 空", 0),
+    ("<元组赋值内部> -> <表达式> ',' <元组元素列表>", 3),
+    ("<元组元素列表> -> 空", 0),
+    ("<元组元素列表> -> <表达式>", 1),
+    ("<元组元素列表> -> <表达式> ',' <元组元素列表>", 3),
+    ("<可赋值元素> -> <元素> '.' <NUM>", 3),
+]
+
+# 预测分析表: 非终结符 -> {当前终结符: 逆序右部}，右部中的整数是归约标记；
+# 值为字典时再按下一个终结符选择右部 ("" 为默认)
+TABLE = {
+    "Program": {
+        "$": (0, "<声明串>"),
+        "fn": (0, "<声明串>"),
+    },
+    "<声明串>": {
+        "$": (1,),
+        "fn": (2, "<声明串>", "<声明>"),
+    },
+    "<声明>": {
+        "fn": (3, "<函数声明>"),
+    },
+    "<函数声明>": {
+        "fn": ("<函数声明_>", "<函数头声明>"),
+    },
+    "<函数头声明>": {
+        "fn": ("<函数头声明_>", "')'", "<形参列表>", "'('", "<ID>", "fn"),
+    },
+    "<形参列表>": {
+        "')'": (6,),
+        "<ID>": ("<形参列表_>", "<形参>"),
+        "mut": ("<形参列表_>", "<形参>"),
+    },
+    "<语句块>": {
+        "'{'": (7, "'}'", "<语句串>", "'{'"),
+    },
+    "<语句串>": {
+        "'&'": (12, "<语句串>", "<语句>"),
+        "'('": (12, "<语句串>", "<语句>"),
+        "'*'": (12, "<语句串>", "<语句>"),
+        "';'": (12, "<语句串>", "<语句>"),
+        "'['": (12, "<语句串>", "<语句>"),
+        "'{'": (12, "<语句串>", "<语句>"),
+        "'}'": (8,),
+        "<ID>": (12, "<语句串>", "<语句>"),
+        "<NUM>": (12, "<语句串>", "<语句>"),
+        "break": (12, "<语句串>", "<语句>"),
+        "continue": (12, "<语句串>", "<语句>"),
+        "for": (12, "<语句串>", "<语句>"),
+        "if": (12, "<语句串>", "<语句>"),
+        "let": (12, "<语句串>", "<语句>"),
+        "loop": (12, "<语句串>", "<语句>"),
+        "return": (12, "<语句串>", "<语句>"),
+        "while": (12, "<语句串>", "<语句>"),
+    },
+    "<变量声明内部>": {
+        "<ID>": (69, "<ID>"),
+        "mut": (9, "<ID>", "mut"),
+    },
+    "<类型>": {
+        "'&'": ("<类型_>", "'&'"),
+        "'('": (91, "')'", "<元组类型内部>", "'('"),
+        "'['": (84, "']'", "<NUM>", "';'", "<类型>", "'['"),
+        "i32": (10, "i32"),
+    },
+    "<可赋值元素>": {
+        "'('": ("<可赋值元素_>", "<元素'>", 36, "')'", "<表达式>", "'('"),
+        "<ID>": ("<可赋值元素_1>", "<ID>"),
+        "<NUM>": ("<可赋值元素_>", "<元素'>", 34, "<NUM>"),
+    },
+    "<语句>": {
+        "'&'": (29, "';'", "<表达式>"),
+        "'('": (29, "';'", "<表达式>"),
+        "'*'": (29, "';'", "<表达式>"),
+        "';'": (13, "';'"),
+        "'['": (29, "';'", "<表达式>"),
+        "'{'": (29, "';'", "<表达式>"),
+        "<ID>": {
+            "": (29, "';'", "<表达式>"),
+            "'='": (24, "<赋值语句>"),
+        },
+        "<NUM>": (29, "';'", "<表达式>"),
+        "break": ("<语句_>", "break"),
+        "continue": (68, "';'", "continue"),
+        "for": (59, "<循环语句>"),
+        "if": (54, "<if语句>"),
+        "let": ("<语句_1>", "<变量声明内部>", "let"),
+        "loop": (59, "<循环语句>"),
+        "return": (14, "<返回语句>"),
+        "while": (59, "<循环语句>"),
+    },
+    "<返回语句>": {
+        "return": ("<返回语句_>", "return"),
+    },
+    "<形参>": {
+        "<ID>": (18, "<类型>", "':'", "<变量声明内部>"),
+        "mut": (18, "<类型>", "':'", "<变量声明内部>"),
+    },
+    "<赋值语句>": {
+        "'('": (25, "';'", "<表达式>", "'='", "<可赋值元素>"),
+        "<ID>": (25, "';'", "<表达式>", "'='", "<可赋值元素>"),
+        "<NUM>": (25, "';'", "<表达式>", "'='", "<可赋值元素>"),
+    },
+    "<表达式>": {
+        "'&'": ("<表达式'>", 30, "<加法表达式>"),
+        "'('": ("<表达式'>", 30, "<加法表达式>"),
+        "'*'": ("<表达式'>", 30, "<加法表达式>"),
+        "'['": ("<表达式'>", 30, "<加法表达式>"),
+        "'{'": ("<表达式'>", 75, "<函数表达式语句块>"),
+        "<ID>": ("<表达式'>", 30, "<加法表达式>"),
+        "<NUM>": ("<表达式'>", 30, "<加法表达式>"),
+        "if": ("<表达式'>", 80, "<选择表达式>"),
+        "loop": ("<表达式'>", 82, "<loop语句>"),
+    },
+    "<加法表达式>": {
+        "'&'": ("<加法表达式'>", 31, "<项>"),
+        "'('": ("<加法表达式'>", 31, "<项>"),
+        "'*'": ("<加法表达式'>", 31, "<项>"),
+        "'['": ("<加法表达式'>", 31, "<项>"),
+        "<ID>": ("<加法表达式'>", 31, "<项>"),
+        "<NUM>": ("<加法表达式'>", 31, "<项>"),
+    },
+    "<项>": {
+        "'&'": ("<项'>", 32, "<因子>"),
+        "'('": ("<项'>", 32, "<因子>"),
+        "'*'": ("<项'>", 32, "<因子>"),
+        "'['": ("<项'>", 32, "<因子>"),
+        "<ID>": ("<项'>", 32, "<因子>"),
+        "<NUM>": ("<项'>", 32, "<因子>"),
+    },
+    "<因子>": {
+        "'&'": ("<因子_>", "'&'"),
+        "'('": ("<因子_1>", "'('"),
+        "'*'": (70, "<因子>", "'*'"),
+        "'['": (85, "']'", "<数组元素列表>", "'['"),
+        "<ID>": (33, "<元素_>", "<ID>"),
+        "<NUM>": (33, "<元素'>", 34, "<NUM>"),
+    },
+    "<元素>": {
+        "'('": ("<元素'>", 36, "')'", "<表达式>", "'('"),
+        "<ID>": ("<元素_>", "<ID>"),
+        "<NUM>": ("<元素'>", 34, "<NUM>"),
+    },
+    "<比较运算符>": {
+        "'!='": (45, "'!='"),
+        "'<'": (40, "'<'"),
+        "'<='": (41, "'<='"),
+        "'=='": (44, "'=='"),
+        "'>'": (42, "'>'"),
+        "'>='": (43, "'>='"),
+    },
+    "<加减运算符>": {
+        "'+'": (46, "'+'"),
+        "'-'": (47, "'-'"),
+    },
+    "<乘除运算符>": {
+        "'*'": (48, "'*'"),
+        "'/'": (49, "'/'"),
+    },
+    "<实参列表>": {
+        "'&'": ("<实参列表_>", "<表达式>"),
+        "'('": ("<实参列表_>", "<表达式>"),
+        "')'": (51,),
+        "'*'": ("<实参列表_>", "<表达式>"),
+        "'['": ("<实参列表_>", "<表达式>"),
+        "'{'": ("<实参列表_>", "<表达式>"),
+        "<ID>": ("<实参列表_>", "<表达式>"),
+        "<NUM>": ("<实参列表_>", "<表达式>"),
+        "if": ("<实参列表_>", "<表达式>"),
+        "loop": ("<实参列表_>", "<表达式>"),
+    },
+    "<if语句>": {
+        "if": (55, "<else部分>", "<语句块>", "<表达式>", "if"),
+    },
+    "<else部分>": {
+        "'&'": (56,),
+        "'('": (56,),
+        "'*'": (56,),
+        "';'": (56,),
+        "'['": (56,),
+        "'{'": (56,),
+        "'}'": (56,),
+        "<ID>": (56,),
+        "<NUM>": (56,),
+        "break": (56,),
+        "continue": (56,),
+        "else": ("<else部分_>", "else"),
+        "for": (56,),
+        "if": (56,),
+        "let": (56,),
+        "loop": (56,),
+        "return": (56,),
+        "while": (56,),
+    },
+    "<循环语句>": {
+        "for": (62, "<for语句>"),
+        "loop": (65, "<loop语句>"),
+        "while": (60, "<while语句>"),
+    },
+    "<while语句>": {
+        "while": (61, "<语句块>", "<表达式>", "while"),
+    },
+    "<for语句>": {
+        "for": (63, "<语句块>", "<可迭代结构>", "in", "<变量声明内部>", "for"),
+    },
+    "<可迭代结构>": {
+        "'&'": (64, "<表达式>", "'..'", "<表达式>"),
+        "'('": (64, "<表达式>", "'..'", "<表达式>"),
+        "'*'": (64, "<表达式>", "'..'", "<表达式>"),
+        "'['": (64, "<表达式>", "'..'", "<表达式>"),
+        "'{'": (64, "<表达式>", "'..'", "<表达式>"),
+        "<ID>": {
+            "": (64, "<表达式>", "'..'", "<表达式>"),
+            "'{'": (90, "<元素>"),
+        },
+        "<NUM>": {
+            "": (64, "<表达式>", "'..'", "<表达式>"),
+            "'{'": (90, "<元素>"),
+        },
+        "if": (64, "<表达式>", "'..'", "<表达式>"),
+        "loop": (64, "<表达式>", "'..'", "<表达式>"),
+    },
+    "<loop语句>": {
+        "loop": (66, "<语句块>", "loop"),
+    },
+    "<函数表达式语句块>": {
+        "'{'": (76, "'}'", "<函数表达式语句串>", "'{'"),
+    },
+    "<函数表达式语句串>": {
+        "'&'": (77, "<表达式>"),
+        "'('": (77, "<表达式>"),
+        "'*'": (77, "<表达式>"),
+        "';'": (78, "<函数表达式语句串>", "<语句>"),
+        "'['": (77, "<表达式>"),
+        "'{'": (77, "<表达式>"),
+        "<ID>": {
+            "": (77, "<表达式>"),
+            "';'": (78, "<函数表达式语句串>", "<语句>"),
+            "'='": (78, "<函数表达式语句串>", "<语句>"),
+        },
+        "<NUM>": {
+            "": (77, "<表达式>"),
+            "';'": (78, "<函数表达式语句串>", "<语句>"),
+        },
+        "break": (78, "<函数表达式语句串>", "<语句>"),
+        "continue": (78, "<函数表达式语句串>", "<语句>"),
+        "for": (78, "<函数表达式语句串>", "<语句>"),
+        "if": (77, "<表达式>"),
+        "let": (78, "<函数表达式语句串>", "<语句>"),
+        "loop": (77, "<表达式>"),
+        "return": (78, "<函数表达式语句串>", "<语句>"),
+        "while": (78, "<函数表达式语句串>", "<语句>"),
+    },
+    "<选择表达式>": {
+        "if": (
+            81,
+            "<函数表达式语句块>",
+            "else",
+            "<函数表达式语句块>",
+            "<表达式>",
+            "if",
+        ),
+    },
+    "<数组元素列表>": {
+        "'&'": ("<数组元素列表_>", "<表达式>"),
+        "'('": ("<数组元素列表_>", "<表达式>"),
+        "'*'": ("<数组元素列表_>", "<表达式>"),
+        "'['": ("<数组元素列表_>", "<表达式>"),
+        "']'": (86,),
+        "'{'": ("<数组元素列表_>", "<表达式>"),
+        "<ID>": ("<数组元素列表_>", "<表达式>"),
+        "<NUM>": ("<数组元素列表_>", "<表达式>"),
+        "if": ("<数组元素列表_>", "<表达式>"),
+        "loop": ("<数组元素列表_>", "<表达式>"),
+    },
+    "<元组类型内部>": {
+        "'&'": (93, "<类型列表>", "','", "<类型>"),
+        "'('": (93, "<类型列表>", "','", "<类型>"),
+        "')'": (92,),
+        "'['": (93, "<类型列表>", "','", "<类型>"),
+        "i32": (93, "<类型列表>", "','", "<类型>"),
+    },
+    "<类型列表>": {
+        "'&'": ("<类型列表_>", "<类型>"),
+        "'('": ("<类型列表_>", "<类型>"),
+        "')'": (94,),
+        "'['": ("<类型列表_>", "<类型>"),
+        "i32": ("<类型列表_>", "<类型>"),
+    },
+    "<元组赋值内部>": {
+        "'&'": (99, "<元组元素列表>", "','", "<表达式>"),
+        "'('": (99, "<元组元素列表>", "','", "<表达式>"),
+        "')'": (98,),
+        "'*'": (99, "<元组元素列表>", "','", "<表达式>"),
+        "'['": (99, "<元组元素列表>", "','", "<表达式>"),
+        "'{'": (99, "<元组元素列表>", "','", "<表达式>"),
+        "<ID>": (99, "<元组元素列表>", "','", "<表达式>"),
+        "<NUM>": (99, "<元组元素列表>", "','", "<表达式>"),
+        "if": (99, "<元组元素列表>", "','", "<表达式>"),
+        "loop": (99, "<元组元素列表>", "','", "<表达式>"),
+    },
+    "<元组元素列表>": {
+        "'&'": ("<元组元素列表_>", "<表达式>"),
+        "'('": ("<元组元素列表_>", "<表达式>"),
+        "')'": (100,),
+        "'*'": ("<元组元素列表_>", "<表达式>"),
+        "'['": ("<元组元素列表_>", "<表达式>"),
+        "'{'": ("<元组元素列表_>", "<表达式>"),
+        "<ID>": ("<元组元素列表_>", "<表达式>"),
+        "<NUM>": ("<元组元素列表_>", "<表达式>"),
+        "if": ("<元组元素列表_>", "<表达式>"),
+        "loop": ("<元组元素列表_>", "<表达式>"),
+    },
+    "<元素'>": {
+        "'!='": (),
+        "')'": (),
+        "'*'": (),
+        "'+'": (),
+        "','": (),
+        "'-'": (),
+        "'.'": {
+            "": ("<元素'>", 35, 103, "<NUM>", "'.'"),
+            "$": (),
+        },
+        "'..'": (),
+        "'/'": (),
+        "';'": (),
+        "'<'": (),
+        "'<='": (),
+        "'=='": (),
+        "'>'": (),
+        "'>='": (),
+        "'['": {
+            "": ("<元素'>", 35, 89, "']'", "<表达式>", "'['"),
+            "$": (),
+        },
+        "']'": (),
+        "'{'": (),
+        "'}'": (),
+    },
+    "<表达式'>": {
+        "'!='": ("<表达式'>", 37, "<加法表达式>", "<比较运算符>"),
+        "')'": (),
+        "','": (),
+        "'..'": (),
+        "';'": (),
+        "'<'": ("<表达式'>", 37, "<加法表达式>", "<比较运算符>"),
+        "'<='": ("<表达式'>", 37, "<加法表达式>", "<比较运算符>"),
+        "'=='": ("<表达式'>", 37, "<加法表达式>", "<比较运算符>"),
+        "'>'": ("<表达式'>", 37, "<加法表达式>", "<比较运算符>"),
+        "'>='": ("<表达式'>", 37, "<加法表达式>", "<比较运算符>"),
+        "']'": (),
+        "'{'": (),
+        "'}'": (),
+    },
+    "<加法表达式'>": {
+        "'!='": (),
+        "')'": (),
+        "'+'": ("<加法表达式'>", 38, "<项>", "<加减运算符>"),
+        "','": (),
+        "'-'": ("<加法表达式'>", 38, "<项>", "<加减运算符>"),
+        "'..'": (),
+        "';'": (),
+        "'<'": (),
+        "'<='": (),
+        "'=='": (),
+        "'>'": (),
+        "'>='": (),
+        "']'": (),
+        "'{'": (),
+        "'}'": (),
+    },
+    "<项'>": {
+        "'!='": (),
+        "')'": (),
+        "'*'": ("<项'>", 39, "<因子>", "<乘除运算符>"),
+        "'+'": (),
+        "','": (),
+        "'-'": (),
+        "'..'": (),
+        "'/'": ("<项'>", 39, "<因子>", "<乘除运算符>"),
+        "';'": (),
+        "'<'": (),
+        "'<='": (),
+        "'=='": (),
+        "'>'": (),
+        "'>='": (),
+        "']'": (),
+        "'{'": (),
+        "'}'": (),
+    },
+    "<函数声明_>": {
+        "'{'": ("<函数声明__>", "'{'"),
+    },
+    "<函数头声明_>": {
+        "'->'": (19, "<类型>", "'->'"),
+        "'{'": (5,),
+    },
+    "<形参列表_>": {
+        "')'": (16,),
+        "','": (17, "<形参列表>", "','"),
+    },
+    "<类型_>": {
+        "'&'": (74, "<类型>"),
+        "'('": (74, "<类型>"),
+        "'['": (74, "<类型>"),
+        "i32": (74, "<类型>"),
+        "mut": (73, "<类型>", "mut"),
+    },
+    "<可赋值元素_>": {
+        "'.'": (103, "<NUM>", "'.'"),
+        "'['": (89, "']'", "<表达式>", "'['"),
+    },
+    "<语句_>": {
+        "'&'": (83, "';'", "<表达式>"),
+        "'('": (83, "';'", "<表达式>"),
+        "'*'": (83, "';'", "<表达式>"),
+        "';'": (67, "';'"),
+        "'['": (83, "';'", "<表达式>"),
+        "'{'": (83, "';'", "<表达式>"),
+        "<ID>": (83, "';'", "<表达式>"),
+        "<NUM>": (83, "';'", "<表达式>"),
+        "if": (83, "';'", "<表达式>"),
+        "loop": (83, "';'", "<表达式>"),
+    },
+    "<返回语句_>": {
+        "'&'": (20, "';'", "<表达式>"),
+        "'('": (20, "';'", "<表达式>"),
+        "'*'": (20, "';'", "<表达式>"),
+        "';'": (15, "';'"),
+        "'['": (20, "';'", "<表达式>"),
+        "'{'": (20, "';'", "<表达式>"),
+        "<ID>": (20, "';'", "<表达式>"),
+        "<NUM>": (20, "';'", "<表达式>"),
+        "if": (20, "';'", "<表达式>"),
+        "loop": (20, "';'", "<表达式>"),
+    },
+    "<因子_>": {
+        "'&'": (72, "<因子>"),
+        "'('": (72, "<因子>"),
+        "'*'": (72, "<因子>"),
+        "'['": (72, "<因子>"),
+        "<ID>": (72, "<因子>"),
+        "<NUM>": (72, "<因子>"),
+        "mut": (71, "<因子>", "mut"),
+    },
+    "<元素_>": {
+        "'!='": ("<元素'>", 35, 11),
+        "'('": ("<元素'>", 50, "')'", "<实参列表>", "'('"),
+        "')'": ("<元素'>", 35, 11),
+        "'*'": ("<元素'>", 35, 11),
+        "'+'": ("<元素'>", 35, 11),
+        "','": ("<元素'>", 35, 11),
+        "'-'": ("<元素'>", 35, 11),
+        "'.'": ("<元素'>", 35, 11),
+        "'..'": ("<元素'>", 35, 11),
+        "'/'": ("<元素'>", 35, 11),
+        "';'": ("<元素'>", 35, 11),
+        "'<'": ("<元素'>", 35, 11),
+        "'<='": ("<元素'>", 35, 11),
+        "'=='": ("<元素'>", 35, 11),
+        "'>'": ("<元素'>", 35, 11),
+        "'>='": ("<元素'>", 35, 11),
+        "'['": ("<元素'>", 35, 11),
+        "']'": ("<元素'>", 35, 11),
+        "'{'": ("<元素'>", 35, 11),
+        "'}'": ("<元素'>", 35, 11),
+    },
+    "<实参列表_>": {
+        "')'": (52,),
+        "','": (53, "<实参列表>", "','"),
+    },
+    "<else部分_>": {
+        "'{'": (57, "<语句块>"),
+        "if": (58, "<else部分>", "<语句块>", "<表达式>", "if"),
+    },
+    "<数组元素列表_>": {
+        "','": (88, "<数组元素列表>", "','"),
+        "']'": (87,),
+    },
+    "<类型列表_>": {
+        "')'": (95,),
+        "','": (96, "<类型列表>", "','"),
+    },
+    "<元组元素列表_>": {
+        "')'": (101,),
+        "','": (102, "<元组元素列表>", "','"),
+    },
+    "<可赋值元素_1>": {
+        "'('": ("<可赋值元素_>", "<元素_>"),
+        "'.'": ("<可赋值元素_>", "<元素_>"),
+        "'='": (11,),
+        "'['": ("<可赋值元素_>", "<元素_>"),
+    },
+    "<语句_1>": {
+        "':'": ("<语句_1_>", "<类型>", "':'"),
+        "';'": (21, 23, "';'"),
+        "'='": (26, 28, "';'", "<表达式>", "'='"),
+    },
+    "<因子_1>": {
+        "'&'": (33, "<元素'>", 36, "')'", "<表达式>"),
+        "'('": (33, "<元素'>", 36, "')'", "<表达式>"),
+        "')'": (97, "')'", "<元组赋值内部>"),
+        "'*'": (33, "<元素'>", 36, "')'", "<表达式>"),
+        "'['": (33, "<元素'>", 36, "')'", "<表达式>"),
+        "'{'": (33, "<元素'>", 36, "')'", "<表达式>"),
+        "<ID>": {
+            "": (33, "<元素'>", 36, "')'", "<表达式>"),
+            "','": (97, "')'", "<元组赋值内部>"),
+        },
+        "<NUM>": {
+            "": (33, "<元素'>", 36, "')'", "<表达式>"),
+            "','": (97, "')'", "<元组赋值内部>"),
+        },
+        "if": (33, "<元素'>", 36, "')'", "<表达式>"),
+        "loop": (33, "<元素'>", 36, "')'", "<表达式>"),
+    },
+    "<函数声明__>": {
+        "'&'": (4, 7, "'}'", "<语句串>"),
+        "'('": (4, 7, "'}'", "<语句串>"),
+        "'*'": (4, 7, "'}'", "<语句串>"),
+        "';'": (4, 7, "'}'", "<语句串>"),
+        "'['": (4, 7, "'}'", "<语句串>"),
+        "'{'": (4, 7, "'}'", "<语句串>"),
+        "'}'": (4, 7, "'}'", "<语句串>"),
+        "<ID>": {
+            "": (4, 7, "'}'", "<语句串>"),
+            "'}'": (79, 76, "'}'", "<函数表达式语句串>"),
+        },
+        "<NUM>": {
+            "": (4, 7, "'}'", "<语句串>"),
+            "'}'": (79, 76, "'}'", "<函数表达式语句串>"),
+        },
+        "break": (4, 7, "'}'", "<语句串>"),
+        "continue": (4, 7, "'}'", "<语句串>"),
+        "for": (4, 7, "'}'", "<语句串>"),
+        "if": (4, 7, "'}'", "<语句串>"),
+        "let": (4, 7, "'}'", "<语句串>"),
+        "loop": (4, 7, "'}'", "<语句串>"),
+        "return": (4, 7, "'}'", "<语句串>"),
+        "while": (4, 7, "'}'", "<语句串>"),
+    },
+    "<语句_1_>": {
+        "';'": (21, 22, "';'"),
+        "'='": (26, 27, "';'", "<表达式>", "'='"),
+    },
+}
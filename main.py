@@ -10,6 +10,7 @@ FilePath     : \\课程设计\\rust-like-compiler\\temp_main.py
 
 import sys
 import os
+import mmap
 
 # 添加当前目录到模块搜索路径
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -19,7 +20,9 @@ if current_dir not in sys.path:
 # 导入编译器相关模块
 try:
     # 导入词法分析器
-    from lexer import Lexer, TT_DOTDOT, TT_MOD  # 确保导入这两个标记类型
+    from lexer import TT_DOTDOT, TT_MOD  # 确保导入这两个标记类型
+    from lexer import create_lexer, LEXER_ENGINES, MappedLexer
+    from lexer import TokenBuffer, lex_parallel, TT_ERROR
 
     # 明确使用本地的parser模块，避免与标准库冲突
     sys.modules.pop("parser", None)  # 移除可能已导入的标准库parser模块
@@ -29,13 +32,18 @@ try:
         "myparser", os.path.join(current_dir, "parser.py")
     )
     myparser = importlib.util.module_from_spec(spec)
+    # 登记模块，语法树与 ParseError 才能在并行编译的进程间传递
+    sys.modules["myparser"] = myparser
     spec.loader.exec_module(myparser)
     Parser, ParseError = myparser.Parser, myparser.ParseError
 
     # 导入其他编译器组件
+    from ast_writer import format_ast, save_ast_to_file
+    from ast_cache import ASTCache, file_digest
     from ir_generator import IRGenerator
     from ir_writer import save_ir_to_file
     from codegen2mips import MIPSCodeGenerator
+    from parallel_compiler import compile_parallel
 
     print("编译器模块导入成功")
 except ImportError as e:
@@ -46,65 +54,50 @@ except ImportError as e:
     sys.exit(1)
 
 
-def format_ast(node, indent=0):
-    """格式化AST为文本格式"""
-    if node is None:
-        return ""
-
-    result = " " * indent + f"{node.__class__.__name__}"
-
-    # 收集非列表类型的属性用于显示
-    attrs = {}
-    for key, value in node.__dict__.items():
-        if not isinstance(value, list) and not key.startswith("_"):
-            attrs[key] = value
-
-    if attrs:
-        result += ": " + ", ".join(f"{k}={v}" for k, v in attrs.items())
-
-    result += "\n"
-
-    # 检查不同类型的子节点属性
-    children = []
-    if hasattr(node, "declarations"):
-        children = node.declarations
-    elif hasattr(node, "statements"):
-        children = node.statements
-    elif hasattr(node, "children"):
-        children = node.children
-    elif hasattr(node, "params") and node.params:
-        children.extend(node.params)
-    elif hasattr(node, "body") and node.body:
-        children = [node.body]
-    elif hasattr(node, "then_block") and node.then_block:
-        children = [node.condition, node.then_block]
-        if node.else_block:
-            children.append(node.else_block)
-    elif hasattr(node, "expr") and node.expr:
-        children = [node.expr]
-    elif hasattr(node, "left") and node.left:
-        children = [node.left, node.right]
-
-    # 递归处理子节点
-    if children:
-        for child in children:
-            if child is not None:  # 确保子节点不为空
-                result += format_ast(child, indent + 2)
-
-    return result
-
-
-def save_ast_to_file(ast, file_path):
-    """保存AST到文件"""
+def report_lexical_errors(parser, lexer):
+    """扫描完剩余的源代码，一次性输出全部词法错误，返回错误数"""
+    diagnostics = getattr(lexer, "diagnostics", None)
+    if diagnostics is None:
+        return 0
+    if parser is not None:
+        parser.tokens.drain()
+    for error in diagnostics:
+        print(f"词法错误: {error.message} at L{error.line}C{error.col}")
+    if diagnostics:
+        print(f"共 {len(diagnostics)} 个词法错误")
+    return len(diagnostics)
+
+
+def report_syntax_errors(errors, lexical_errors):
+    """输出全部语法错误；由错误 Token 引起的语法错误只是词法错误的后果，不再重复输出"""
+    count = 0
+    for error in errors:
+        if lexical_errors and error.token is not None and error.token.type == TT_ERROR:
+            continue
+        print(f"语法错误: {error}")
+        count += 1
+    if count > 1:
+        print(f"共 {count} 个语法错误")
+    return count
+
+
+def report_parse_profile(profiler, profile_path):
+    """打印各语法规则的统计表，指定 profile_path 时改为保存为 JSON"""
+    if profile_path is None:
+        print(profiler.format_table())
+        return
+    profiler.dump(profile_path)
+    print(f"语法分析统计已保存到 {profile_path}")
+
+
+def map_source_file(file_path):
+    """以只读方式内存映射源文件，返回 (文件对象, 映射缓冲区)"""
+    source_file = open(file_path, "rb")
     try:
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write("# 抽象语法树 (Abstract Syntax Tree)\n")
-            f.write(
-                "# 生成时间: " + str(__import__("datetime").datetime.now()) + "\n\n"
-            )
-            f.write(format_ast(ast))
-    except Exception as e:
-        print(f"保存AST文件时出错: {e}")
+        return source_file, mmap.mmap(source_file.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        # 空文件无法映射
+        return source_file, b""
 
 
 def main():
@@ -119,10 +112,29 @@ def main():
     os.makedirs(ast_dir, exist_ok=True)
 
     if not args:
-        print("使用方法: python main.py <源文件路径> [--ir] [--asm]")
+        print(
+            "使用方法: python main.py <源文件路径> [--ir] [--asm] [--single-pass] [--lexer=char|regex] [--mmap] [--jobs=N] [--compile-jobs=N] [--profile-parse[=FILE]] [--ast-cache] [--ast-depth=N] [--ast-width=N]"
+        )
         print("选项:")
         print("  --ir  : 只生成中间代码")
         print("  --asm : 生成汇编代码")
+        print(
+            "  --single-pass : 单遍编译：语法分析时直接生成四元式，不构造语法树、不输出 .ast (不适用于 --compile-jobs 与 --ast-cache)"
+        )
+        print("  --lexer=regex : 使用主正则表驱动的词法分析引擎 (默认 char)")
+        print("  --mmap : 内存映射源文件并直接扫描字节，不整体读入内存")
+        print("  --jobs=N : 使用 N 个进程并行分块词法分析 (适用于大文件)")
+        print(
+            "  --compile-jobs=N : 使用 N 个进程按函数并行进行语法分析、类型检查与中间代码生成"
+        )
+        print(
+            "  --profile-parse[=FILE] : 统计各语法规则的调用次数、耗时与 Token 数，打印或保存为 JSON (不适用于 --compile-jobs)"
+        )
+        print(
+            "  --ast-cache : 把语法树缓存为二进制文件，源文件未修改时跳过词法与语法分析 (构造语法树，不单遍编译；不适用于 --compile-jobs)"
+        )
+        print("  --ast-depth=N : .ast 文件只输出前 N 层子节点，更深的子树以 ... 代替")
+        print("  --ast-width=N : .ast 文件中每个节点最多输出 N 个子节点")
         # 寻找测试文件夹中所有的.rs文件
         rs_files = []
         for file in os.listdir(test_dir):
@@ -137,6 +149,51 @@ def main():
     source_path = args[0]
     gen_ir = "--ir" in args
     gen_asm = "--asm" in args
+    use_single_pass = "--single-pass" in args
+    use_mmap = "--mmap" in args
+    use_ast_cache = "--ast-cache" in args
+    ast_depth = ast_width = None
+    lexer_engine = "char"
+    jobs = "1"
+    compile_jobs = "1"
+    profile_parse = False
+    profile_path = None
+    for arg in args:
+        if arg.startswith("--lexer="):
+            lexer_engine = arg.split("=", 1)[1]
+        elif arg.startswith("--jobs="):
+            jobs = arg.split("=", 1)[1]
+        elif arg.startswith("--compile-jobs="):
+            compile_jobs = arg.split("=", 1)[1]
+        elif arg == "--profile-parse":
+            profile_parse = True
+        elif arg.startswith("--profile-parse="):
+            profile_parse = True
+            profile_path = arg.split("=", 1)[1]
+        elif arg.startswith("--ast-depth="):
+            ast_depth = arg.split("=", 1)[1]
+        elif arg.startswith("--ast-width="):
+            ast_width = arg.split("=", 1)[1]
+    if lexer_engine not in LEXER_ENGINES:
+        print(f"错误: 未知的词法分析引擎 '{lexer_engine}'")
+        return
+    if not jobs.isdigit() or int(jobs) < 1:
+        print(f"错误: 无效的进程数 '{jobs}'")
+        return
+    jobs = int(jobs)
+    if not compile_jobs.isdigit() or int(compile_jobs) < 1:
+        print(f"错误: 无效的进程数 '{compile_jobs}'")
+        return
+    compile_jobs = int(compile_jobs)
+    for option, value in (("--ast-depth", ast_depth), ("--ast-width", ast_width)):
+        if value is not None and not value.isdigit():
+            print(f"错误: 无效的 {option} 值 '{value}'")
+            return
+    # .ast 文件的输出限制
+    ast_options = {
+        "max_depth": None if ast_depth is None else int(ast_depth),
+        "max_width": None if ast_width is None else int(ast_width),
+    }
 
     if not os.path.exists(source_path):
         print(f"错误: 源文件 '{source_path}' 不存在")
@@ -149,33 +206,96 @@ def main():
     asm_path = os.path.join(asm_dir, f"{name_without_ext}.asm")
     ast_path = os.path.join(ast_dir, f"{name_without_ext}.ast")
 
-    try:
-        with open(source_path, "r", encoding="utf-8") as f:
-            source_code = f.read()
+    # 语法树缓存 (与 .ast 文件放在同一目录)
+    ast_cache = ASTCache(ast_dir) if use_ast_cache and compile_jobs <= 1 else None
 
+    source_file = source_buffer = None
+    try:
         print(f"正在编译 {base_name}...")
 
+        # 源文件内容未改变时读回缓存的语法树 (统计语法分析开销时仍重新分析)
+        cached_ast = None
+        if ast_cache is not None:
+            digest = file_digest(source_path)
+            if not profile_parse:
+                cached_ast = ast_cache.load(source_path, digest)
+
         # 词法分析
-        lexer = Lexer(source_code)
+        if cached_ast is not None:
+            lexer = None
+        elif use_mmap:
+            source_file, source_buffer = map_source_file(source_path)
+            lexer = MappedLexer(source_buffer, recover=True)
+        else:
+            with open(source_path, "r", encoding="utf-8") as f:
+                source_code = f.read()
+            if jobs > 1:
+                # 各块的词法错误汇总在 TokenBuffer.diagnostics 中，同样统一报告
+                tokens = lex_parallel(source_code, jobs, lexer_engine, recover=True)
+                lexer = tokens
+            else:
+                # 词法错误不中断扫描，语法分析失败后统一报告
+                lexer = create_lexer(source_code, lexer_engine, recover=True)
 
         # IR生成器
         irgen = IRGenerator()
+        # 指定 --single-pass 时单遍编译：语法分析器直接生成四元式，不构造和保存语法树
+        single_pass = use_single_pass and compile_jobs <= 1 and ast_cache is None
 
-        # 语法分析
-        parser = Parser(lexer, irgen)
-
+        parser = None
         try:
-            # 解析程序
-            ast = parser.parse_program()
-            print("语法分析成功")
-
-            # 保存AST到文件
-            save_ast_to_file(ast, ast_path)
-            print(f"AST已保存到 {ast_path}")
+            if compile_jobs > 1:
+                # 按函数并行编译：先得到完整的 Token 序列，再以顶层函数为单位分发
+                if jobs > 1:
+                    token_buffer = tokens
+                else:
+                    token_buffer = TokenBuffer.from_lexer(lexer)
+                ast, semantic_errors, ir = compile_parallel(token_buffer, compile_jobs)
+                print("语法分析成功")
+                for error in semantic_errors:
+                    location = f" at L{error.line}C{error.col}" if error.line else ""
+                    print(f"语义检查: {error.message}{location}")
+            elif cached_ast is not None:
+                ast = cached_ast
+                print(
+                    f"源文件未修改，使用缓存的语法树 {ast_cache.path_for(source_path)}"
+                )
+            else:
+                # 语法分析：出错后恢复并继续，一遍报告全部语法错误
+                parser = Parser(
+                    lexer,
+                    irgen if single_pass else None,
+                    recover=True,
+                    profile=profile_parse,
+                )
+                # 解析程序
+                ast = parser.parse_program()
+                if profile_parse:
+                    report_parse_profile(parser.profiler, profile_path)
+                if parser.diagnostics:
+                    lexical_errors = report_lexical_errors(parser, lexer)
+                    report_syntax_errors(parser.diagnostics, lexical_errors)
+                    # 保存含 ErrorNode 的部分语法树，不再生成中间代码
+                    if not single_pass:
+                        save_ast_to_file(ast, ast_path, **ast_options)
+                        print(f"AST已保存到 {ast_path}")
+                    return
+                print("语法分析成功")
+                if ast_cache is not None:
+                    cache_path = ast_cache.store(source_path, digest, ast)
+                    print(f"语法树已缓存到 {cache_path}")
+
+            if not single_pass:
+                # 保存AST到文件
+                save_ast_to_file(ast, ast_path, **ast_options)
+                print(f"AST已保存到 {ast_path}")
 
             # 生成IR
-            irgen.generate(ast)
-            ir = irgen.quads
+            if single_pass:
+                ir = irgen.quads
+            elif compile_jobs <= 1:
+                irgen.generate(ast)
+                ir = irgen.quads
 
             # 保存IR到文件
             save_ir_to_file(ir, ir_path)
@@ -193,13 +313,20 @@ def main():
                 print(f"汇编代码已保存到 {asm_path}")
 
         except ParseError as e:
-            print(f"语法错误: {e}")
+            # 按函数并行编译时遇到第一个语法错误即停止
+            lexical_errors = report_lexical_errors(parser, lexer)
+            report_syntax_errors([e], lexical_errors)
 
     except Exception as e:
         print(f"发生错误: {e}")
         import traceback
 
         traceback.print_exc()
+    finally:
+        if isinstance(source_buffer, mmap.mmap):
+            source_buffer.close()
+        if source_file is not None:
+            source_file.close()
 
 
 if __name__ == "__main__":
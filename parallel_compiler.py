@@ -0,0 +1,197 @@
+"""
+Description  : 按函数并行编译：以顶层 fn 为界切分 Token 序列，在进程池中分别完成
+               语法分析、类型检查与中间代码生成，再按原顺序确定性地合并结果
+Author       : Hyoung
+Date         : 2026-10-17 15:20:44
+LastEditTime : 2026-10-17 15:20:44
+FilePath     : \\课程设计\\rust-like-compiler\\parallel_compiler.py
+"""
+
+import importlib.util
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from ast_walker import run
+from flat_ast import FlatAST
+from ir_generator import GeneratedName, IRGenerator, Quadruple
+from lexer import TT_KEYWORD, TT_LBRACE, TT_RBRACE, TOKEN_TYPE_CODES, TokenStream
+from parser_nodes import FunctionDeclNode, ProgramNode
+from semantic_analyzer import SemanticAnalyzer
+
+
+def load_parser():
+    """
+    加载本地 parser.py (避免与标准库 parser 冲突)，并登记为 myparser 模块，
+    使 ParseError 与语法树能够在进程间传递，且与 main.py 加载的是同一个模块
+    """
+    module = sys.modules.get("myparser")
+    if module is None:
+        spec = importlib.util.spec_from_file_location(
+            "myparser", os.path.join(os.path.dirname(__file__), "parser.py")
+        )
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["myparser"] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+myparser = load_parser()
+
+KEYWORD_CODE = TOKEN_TYPE_CODES[TT_KEYWORD]
+LBRACE_CODE = TOKEN_TYPE_CODES[TT_LBRACE]
+RBRACE_CODE = TOKEN_TYPE_CODES[TT_RBRACE]
+
+
+def split_functions(tokens):
+    """
+    返回各个顶层函数在 TokenBuffer 中的起始下标 (花括号深度为 0 的 fn 关键字)。
+    程序不以 fn 开头时 parse_program 不解析任何函数，返回空列表。
+    """
+    types = tokens.types
+    values = tokens.values
+    if not len(types) or types[0] != KEYWORD_CODE or values[0] != "fn":
+        return []
+    starts = []
+    depth = 0
+    for index, code in enumerate(types):
+        if code == LBRACE_CODE:
+            depth += 1
+        elif code == RBRACE_CODE:
+            depth -= 1
+            if depth < 0:
+                # 多余的右花括号：顺序分析在此之前已经停止
+                break
+        elif depth == 0 and code == KEYWORD_CODE and values[index] == "fn":
+            starts.append(index)
+    return starts
+
+
+def parse_headers(tokens, starts):
+    """在主进程中只解析各函数的函数头，返回其函数符号 (函数头有误时为 None)"""
+    analyzer = SemanticAnalyzer()
+    symbols = []
+    for start, stop in zip(starts, starts[1:] + [len(tokens)]):
+        parser = myparser.Parser(TokenStream(tokens.slice(start, stop).iter_tokens()))
+        try:
+            name_token, params, return_type = parser.parse_function_header()
+        except myparser.ParseError:
+            symbols.append(None)
+            continue
+        header = FunctionDeclNode(name_token, params, return_type, None)
+        symbols.append(analyzer.function_symbol(header))
+    return symbols
+
+
+def compile_functions(chunk, count, declared, check=True, keep_ast=True):
+    """
+    工作进程：依次编译 chunk 中的 count 个函数。
+    chunk 末尾附带下一组的第一个 Token (fn 或 EOF)，使出错位置与顺序分析一致。
+    :param declared: 在这组函数之前声明的函数符号，用于类型检查
+    :param keep_ast: 为 False 时不回传语法树 (语法树的序列化开销与编译本身相当)
+    :return: (每个函数的 (语法树, 语义错误, 四元式, 临时变量数, 标签数) 列表,
+              是否在这组末尾之前停止解析)；语法树以 FlatAST 回传 (pickle 按对象递归，
+              深层嵌套的节点对象会超出递归深度限制，扁平语法树只含数组与常量表)
+    """
+    parser = myparser.Parser(TokenStream(chunk.iter_tokens()))
+    boundary = chunk.offsets[len(chunk) - 1]
+    analyzer = SemanticAnalyzer()
+    if check:
+        analyzer.declare_functions(symbol for symbol in declared if symbol)
+    results = []
+    for _ in range(count):
+        decl = run(parser.parse_function_decl())
+
+        errors = []
+        if check:
+            analyzer.walk(decl)
+            errors = analyzer.symbol_table.errors[:]
+            analyzer.symbol_table.clear_errors()
+
+        irgen = IRGenerator()
+        quads = irgen.generate(decl)
+        decl = FlatAST.from_tree(decl) if keep_ast else None
+        results.append((decl, errors, quads, irgen.temp_count, irgen.label_count))
+
+        token = parser.current_token
+        if token.offset == boundary:
+            continue
+        if token.type != TT_KEYWORD or token.value != "fn":
+            # 函数之后不是 fn，与 parse_program 相同，在此停止解析
+            return results, True
+    return results, False
+
+
+def renumber(value, temp_base, label_base):
+    """
+    把函数内从 0 开始编号的临时变量与标签平移到全程序编号。
+    只处理 IRGenerator 生成的名字 (GeneratedName)，名为 t0、L1 等的用户变量保持不变。
+    """
+    if isinstance(value, GeneratedName):
+        base = temp_base if value[0] == "t" else label_base
+        return GeneratedName(f"{value[0]}{int(value[1:]) + base}")
+    if isinstance(value, list):
+        return [renumber(item, temp_base, label_base) for item in value]
+    return value
+
+
+def compile_parallel(tokens, workers=None, check=True, executor=None, keep_ast=True):
+    """
+    按函数并行编译整个程序，结果与顺序执行 parse_program、SemanticAnalyzer.analyze
+    和 IRGenerator.generate 完全一致 (语法错误时抛出同一个 ParseError)。
+    临时变量与标签按函数顺序累加编号 (只重新编号 IRGenerator 生成的名字)。
+    :param tokens: 不带 SourceMap、以 EOF 结尾的 TokenBuffer
+    :param workers: 进程数，默认 CPU 核数
+    :param check: 是否进行类型检查
+    :param executor: 可复用的进程池，默认临时创建
+    :param keep_ast: 是否回传并合并语法树，不需要时可省去大部分进程间通信
+    :return: (ProgramNode, 语义错误列表, 四元式列表)，keep_ast 为 False 时 ProgramNode 为 None
+    """
+    workers = workers or os.cpu_count() or 1
+    starts = split_functions(tokens)
+    if not starts:
+        return (ProgramNode([]) if keep_ast else None), [], []
+    symbols = parse_headers(tokens, starts) if check else [None] * len(starts)
+
+    # 每个进程分到若干组连续的函数，组数多于进程数以平衡负载
+    groups = min(len(starts), workers * 4)
+    bounds = [len(starts) * i // groups for i in range(groups + 1)]
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = []
+        for first, last in zip(bounds, bounds[1:]):
+            stop = starts[last] if last < len(starts) else len(tokens) - 1
+            futures.append(
+                executor.submit(
+                    compile_functions,
+                    tokens.slice(starts[first], stop + 1),
+                    last - first,
+                    symbols[:first],
+                    check,
+                    keep_ast,
+                )
+            )
+
+        declarations, errors, quads = [], [], []
+        temp_base = label_base = 0
+        for future in futures:
+            results, stopped = future.result()
+            for decl, decl_errors, decl_quads, temps, labels in results:
+                declarations.append(decl.to_tree() if keep_ast else None)
+                errors.extend(decl_errors)
+                for quad in decl_quads:
+                    quads.append(
+                        Quadruple(
+                            *(renumber(item, temp_base, label_base) for item in quad)
+                        )
+                    )
+                temp_base += temps
+                label_base += labels
+            if stopped:
+                break
+    finally:
+        if own_executor:
+            executor.shutdown(cancel_futures=True)
+    return (ProgramNode(declarations) if keep_ast else None), errors, quads
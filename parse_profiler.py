@@ -0,0 +1,163 @@
+"""
+Description  : 语法分析器的按规则性能剖析：各 parse_* 方法的调用次数、累计/自身耗时与消费的 Token 数
+Author       : Hyoung
+Date         : 2026-10-17 21:05:18
+LastEditTime : 2026-10-17 21:05:18
+FilePath     : \\课程设计\\rust-like-compiler\\parse_profiler.py
+"""
+
+import json
+import time
+from functools import partial
+from types import GeneratorType
+
+# 统计表各列：调用次数, 累计耗时, 自身耗时, 消费的 Token 数, 自身消费的 Token 数
+CALLS, INCLUSIVE, EXCLUSIVE, TOKENS, SELF_TOKENS = range(5)
+
+
+class ParseProfiler:
+    """
+    按规则统计语法分析的开销，由 Parser(profile=True) 创建。
+
+    instrument 把分析器实例的 parse_* 方法与 advance 换成计时版本 (实例属性)，
+    类中的方法不变，不开启剖析的分析器没有任何额外开销。
+    解析方法返回生成器时 (由 run 在显式栈上执行)，计时持续到生成器执行完毕。
+
+    累计耗时/Token 数包含子规则，递归调用 (如 parse_binary) 只在最外层计入一次；
+    自身耗时/Token 数扣除了直接子规则的部分，各规则之和即为总量。
+    耗时包含剖析本身的开销，适合比较各规则的相对占比。
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        # 规则名 -> [调用次数, 累计耗时, 自身耗时, Token 数, 自身 Token 数]
+        self.stats = {}
+        self.active = {}  # 规则名 -> 正在执行的层数
+        # 正在执行的规则: [规则名, 开始时刻, 子规则耗时, 开始时的 Token 数, 子规则 Token 数]
+        self.stack = []
+        self.tokens = 0  # 已消费的 Token 总数 (回溯后重新消费的也计入)
+
+    def instrument(self, parser):
+        """替换 parser 的 parse_* 方法 (包括已被记忆化包装的) 与 advance"""
+        for name in dir(type(parser)):
+            if name.startswith("parse_"):
+                setattr(parser, name, partial(self.call, name, getattr(parser, name)))
+        advance = parser.advance
+
+        def counted_advance():
+            self.tokens += 1
+            advance()
+
+        parser.advance = counted_advance
+
+    def call(self, rule, method, *args):
+        frame = self.enter(rule)
+        try:
+            result = method(*args)
+        except BaseException:
+            self.exit(frame)
+            raise
+        if type(result) is GeneratorType:
+            return self.finish(frame, result)
+        self.exit(frame)
+        return result
+
+    def finish(self, frame, task):
+        """执行规则返回的生成器，结束 (包括抛出语法错误) 时停止计时"""
+        try:
+            return (yield task)
+        finally:
+            self.exit(frame)
+
+    def enter(self, rule):
+        active = self.active
+        active[rule] = active.get(rule, 0) + 1
+        frame = [rule, self.clock(), 0.0, self.tokens, 0]
+        self.stack.append(frame)
+        return frame
+
+    def exit(self, frame):
+        elapsed = self.clock() - frame[1]
+        consumed = self.tokens - frame[3]
+        stack = self.stack
+        stack.pop()
+        rule = frame[0]
+        stats = self.stats.get(rule)
+        if stats is None:
+            stats = self.stats[rule] = [0, 0.0, 0.0, 0, 0]
+        stats[CALLS] += 1
+        stats[EXCLUSIVE] += elapsed - frame[2]
+        stats[SELF_TOKENS] += consumed - frame[4]
+        self.active[rule] -= 1
+        if not self.active[rule]:
+            stats[INCLUSIVE] += elapsed
+            stats[TOKENS] += consumed
+        if stack:
+            parent = stack[-1]
+            parent[2] += elapsed
+            parent[4] += consumed
+
+    # --- 输出 ---
+    def rows(self):
+        """各规则的统计结果，按自身耗时从大到小排列"""
+        rows = [
+            {
+                "rule": rule,
+                "calls": stats[CALLS],
+                "inclusive_ms": stats[INCLUSIVE] * 1000,
+                "exclusive_ms": stats[EXCLUSIVE] * 1000,
+                "tokens": stats[TOKENS],
+                "self_tokens": stats[SELF_TOKENS],
+            }
+            for rule, stats in self.stats.items()
+        ]
+        rows.sort(key=lambda row: row["exclusive_ms"], reverse=True)
+        return rows
+
+    def to_json(self):
+        rows = self.rows()
+        return {
+            "total_ms": sum(row["exclusive_ms"] for row in rows),
+            "total_tokens": self.tokens,
+            "rules": rows,
+        }
+
+    def dump(self, path):
+        """把统计结果以 JSON 格式写入 path"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_json(), f, ensure_ascii=False, indent=2)
+
+    def format_table(self):
+        rows = self.rows()
+        total = sum(row["exclusive_ms"] for row in rows)
+        widths = (30, 9, 10, 10, 9, 9, 10)
+        titles = (
+            "规则",
+            "调用次数",
+            "累计(ms)",
+            "自身(ms)",
+            "自身占比",
+            "Token",
+            "自身Token",
+        )
+        lines = [
+            " ".join(
+                pad(title, width, left=index == 0)
+                for index, (title, width) in enumerate(zip(titles, widths))
+            )
+        ]
+        for row in rows:
+            share = row["exclusive_ms"] / total if total else 0.0
+            lines.append(
+                f"{row['rule']:<30} {row['calls']:>9} {row['inclusive_ms']:>10.2f} "
+                f"{row['exclusive_ms']:>10.2f} {share:>9.1%} "
+                f"{row['tokens']:>9} {row['self_tokens']:>10}"
+            )
+        lines.append(f"共消费 {self.tokens} 个 Token，语法分析耗时 {total:.2f} ms")
+        return "\n".join(lines)
+
+
+def pad(text, width, left=False):
+    """按显示宽度 (中文字符占两列) 补齐到 width 列"""
+    fill = " " * (width - sum(2 if ord(c) > 0x2E7F else 1 for c in text))
+    return text + fill if left else fill + text
@@ -6,9 +6,13 @@ LastEditTime : 2025-08-18 18:56:43
 FilePath     : \\课程设计\\rust-like-compiler\\parser.py
 """
 
+from functools import partial
+from types import GeneratorType
+
 from lexer import (
     Lexer,
     Token,
+    TokenStream,
     TT_EOF,
     TT_KEYWORD,
     TT_IDENTIFIER,
@@ -37,54 +41,445 @@ from lexer import (
 )
 from parser_nodes import *
 from ir_generator import IRGenerator
+from ast_walker import run
+from parse_profiler import ParseProfiler
+from flat_ast import FlatAST
+
+# 二元运算符绑定力表：Token 类型 -> (左绑定力, 右绑定力)，数值越大结合越紧。
+# 左结合运算符的右绑定力比左绑定力大 1；新增运算符只需在此登记。
+BINARY_BINDING_POWER = {
+    # 比较运算符
+    TT_EQ: (10, 11),
+    TT_NE: (10, 11),
+    TT_LT: (10, 11),
+    TT_LTE: (10, 11),
+    TT_GT: (10, 11),
+    TT_GTE: (10, 11),
+    # 加减运算符
+    TT_PLUS: (20, 21),
+    TT_MINUS: (20, 21),
+    # 乘除运算符
+    TT_MUL: (30, 31),
+    TT_DIV: (30, 31),
+    TT_MOD: (30, 31),
+}
+
+# 前缀 (一元) 运算符表：Token 类型 -> 操作数的右绑定力，生成 UnaryOpNode。
+# 当前文法尚未启用一元运算符，登记后即可解析，无需新增解析函数。
+PREFIX_BINDING_POWER = {}
+
+
+class ASTBuilder:
+    """
+    语法分析器的默认语义动作：构造语法树。
+    方法名与参数同 IRGenerator 的语法制导翻译方法一一对应；控制结构中
+    *_begin 等穿插在子结构之间的步骤只有生成中间代码时才需要，这里什么也不做。
+    """
+
+    program = ProgramNode
+    block = BlockNode
+    function_expr = FunctionExprNode
+    empty_statement = EmptyStatementNode
+    expr_statement = ExprStatementNode
+    return_statement = ReturnNode
+    break_statement = BreakNode
+    continue_statement = ContinueNode
+    number = NumberNode
+    identifier = IdentifierNode
+    binary = BinaryOpNode
+    unary = UnaryOpNode
+
+    def function_begin(self, name_token, params, return_type):
+        pass
+
+    def function_end(self, name_token, params, return_type, body):
+        return FunctionDeclNode(name_token, params, return_type, body)
+
+    def let_decl(self, var_internal, var_type):
+        return LetDeclNode(var_internal, var_type)
+
+    def let_init(self, var_internal, var_type, value):
+        return LetDeclNode(var_internal, var_type, value)
+
+    def assign(self, name_token, value):
+        return AssignNode(IdentifierNode(name_token), value)
+
+    def call(self, name_token, args):
+        return FunctionCallNode(IdentifierNode(name_token), args)
+
+    def if_begin(self, condition):
+        return None
+
+    def if_then_end(self, context, has_else):
+        pass
+
+    def else_if_begin(self, context):
+        pass
+
+    def else_if_condition(self, context, condition):
+        pass
+
+    def else_if_end(self, context):
+        pass
+
+    def else_begin(self, context):
+        pass
+
+    def if_end(self, context, condition, then_block, else_if_parts, else_block):
+        return IfNode(condition, then_block, else_if_parts, else_block)
+
+    def while_begin(self):
+        return None
+
+    def while_condition(self, context, condition):
+        pass
+
+    def while_end(self, context, condition, body):
+        return WhileNode(condition, body)
+
+    def for_begin(self):
+        return None
+
+    def for_range(self, context, var_internal, start, end):
+        pass
+
+    def for_end(self, context, var_internal, start, end, body):
+        return ForNode(var_internal, RangeNode(start, end), body)
+
+    def loop_begin(self):
+        return None
+
+    def loop_end(self, context, body):
+        return LoopNode(body)
+
+    def if_expr_begin(self, condition):
+        return None
+
+    def if_expr_else(self, context, then_block):
+        pass
+
+    def if_expr_end(self, context, condition, then_block, else_block):
+        return IfExprNode(condition, then_block, else_block)
+
+    # 构造语法树没有副作用，回溯时无需撤销
+    def checkpoint(self):
+        return None
+
+    def rollback(self, checkpoint):
+        pass
+
+
+class FlatASTBuilder(ASTBuilder):
+    """
+    构造扁平语法树 (flat_ast.FlatAST) 的语义动作：各节点归约后立即编码进数组，
+    返回节点下标作为父节点的子节点，parse_program 返回根节点的游标。
+    分析器直接创建的节点对象 (参数、变量声明、ErrorNode) 在编码父节点时一并编码。
+    """
+
+    def __init__(self):
+        self.ast = FlatAST()
+
+    def program(self, declarations):
+        self.ast.root = self.ast.add(ProgramNode(declarations))
+        return self.ast.node(self.ast.root)
+
+    def checkpoint(self):
+        return self.ast.checkpoint()
+
+    def rollback(self, checkpoint):
+        self.ast.rollback(checkpoint)
+
+
+def flat_action(build):
+    """把 ASTBuilder 中构造节点的动作包装为编码节点、返回下标的版本"""
+    if isinstance(build, type):
+        return lambda self, *args: self.ast.add(build(*args))
+    return lambda self, *args: self.ast.add(build(self, *args))
+
+
+for _name in (
+    "block",
+    "function_expr",
+    "empty_statement",
+    "expr_statement",
+    "return_statement",
+    "break_statement",
+    "continue_statement",
+    "number",
+    "identifier",
+    "binary",
+    "unary",
+    "function_end",
+    "let_decl",
+    "let_init",
+    "assign",
+    "call",
+    "if_end",
+    "while_end",
+    "for_end",
+    "loop_end",
+    "if_expr_end",
+):
+    setattr(FlatASTBuilder, _name, flat_action(getattr(ASTBuilder, _name)))
+
+
+# parse_binary 未给出左操作数 (单遍编译时左操作数的值可能是 None)
+NO_OPERAND = object()
 
 
 class ParseError(Exception):
-    pass
+    """语法错误，记录出错 Token 的偏移量，显示时再由 SourceMap 换算行列号"""
+
+    def __init__(self, message, token=None):
+        super().__init__(message)
+        self.token = token
+        self.offset = None if token is None else token.offset
 
 
 class Parser:
-    def __init__(self, lexer: Lexer, irgen: IRGenerator = None):
+    """
+    各产生式归约时调用 self.actions 上的语义动作，默认为 ASTBuilder，返回语法树。
+    传入 irgen 时改为单遍编译：语义动作由 IRGenerator 直接生成四元式，不构造语法树，
+    parse_program 返回 None，结果在 irgen.quads 中。
+    也可以由 actions 传入其他语义动作，如构造扁平语法树的 FlatASTBuilder。
+
+    recover=True 时遇到语法错误不抛出异常，而是记录到 diagnostics 并以恐慌模式恢复：
+    跳过 Token 直到 ';'、'}' 或 fn，出错的语句或函数声明在语法树中由 ErrorNode 代替，
+    一遍即可报告全部语法错误。
+
+    mark/backtrack 提供推测分析的回溯点 (恢复 Token 位置、已记录的语法错误与语义动作的结果)，
+    回溯后同一段 Token 会被再次分析。
+    memo=True 时以 (规则, Token 位置) 为键记忆语句与表达式的分析结果 (packrat)，
+    回溯后不再重复分析同一段 Token；命中情况记录在 memo_hits、memo_misses 中。
+    记忆化保存整个 Token 序列与各规则的结果，只用于语法树模式。
+
+    profile=True 时由 ParseProfiler 统计各 parse_* 方法的调用次数、耗时与消费的 Token 数，
+    结果在 self.profiler 中；默认不开启，分析器的方法保持原样。
+    """
+
+    def __init__(
+        self,
+        lexer: Lexer,
+        irgen: IRGenerator = None,
+        recover=False,
+        memo=False,
+        profile=False,
+        actions=None,
+    ):
+        # 既可以传入 Lexer，也可以传入与其他消费者共享的 TokenStream
         self.lexer = lexer
-        self.current_token = self.lexer.get_next_token()
+        if isinstance(lexer, TokenStream):
+            self.tokens = lexer
+        else:
+            self.tokens = TokenStream(lexer.iter_tokens())
+        self.current_token = self.tokens.next()
         self.irgen = irgen
+        if irgen is not None:
+            self.actions = irgen
+        else:
+            self.actions = actions if actions is not None else ASTBuilder()
+        self.recover = recover
+        self.diagnostics = []  # recover 模式下收集的语法错误 (ParseError)
+        self.backtracks = 0  # 推测分析失败而回溯的次数
+        self.memo = None  # (规则, Token 位置) -> 分析结果 (见 memoized)
+        self.memo_hits = 0
+        self.memo_misses = 0
+        if memo:
+            if irgen is not None:
+                raise ValueError("单遍编译的语义动作有副作用，不能与记忆化同时使用")
+            if actions is not None:
+                raise ValueError(
+                    "回溯会撤销语义动作的结果，记忆化只用于默认的语法树构造"
+                )
+            self.memo = {}
+            # 整个分析期间记录 Token，位置从当前 Token 之后开始计
+            self.tokens.mark()
+            self.parse_statement = partial(
+                self.memoized, "statement", self.parse_statement
+            )
+            self.parse_expression = partial(
+                self.memoized, "expression", self.parse_expression
+            )
+        self.profiler = None
+        if profile:
+            self.profiler = ParseProfiler()
+            self.profiler.instrument(self)
 
     def advance(self):
-        self.current_token = self.lexer.get_next_token()
+        self.current_token = self.tokens.next()
+
+    def peek(self, k=1):
+        """查看当前 Token 之后的第 k 个 Token"""
+        return self.tokens.peek(k)
 
     def consume(self, expected_type, expected_value=None):
         token = self.current_token
         if token.type != expected_type:
             raise ParseError(
-                f"期望 {expected_type}，但得到 {token.type} at L{token.line}C{token.column}"
+                f"期望 {expected_type}，但得到 {token.type} at L{token.line}C{token.column}",
+                token,
             )
         if expected_value is not None and token.value != expected_value:
             raise ParseError(
-                f"期望 {expected_value}，但得到 {token.value} at L{token.line}C{token.column}"
+                f"期望 {expected_value}，但得到 {token.value} at L{token.line}C{token.column}",
+                token,
             )
         self.advance()
         return token
 
-    def parse(self):
-        program = self.parse_program()
-        if self.irgen:
-            self.irgen.generate(program)
-        return program
+    def at_function_start(self):
+        """当前 Token 是否为函数声明开头的 fn"""
+        token = self.current_token
+        return token.type == TT_KEYWORD and token.value == "fn"
+
+    def at_else(self):
+        """当前 Token 是否为 else"""
+        token = self.current_token
+        return token.type == TT_KEYWORD and token.value == "else"
+
+    # --- 推测分析 ---
+    def mark(self):
+        """记录当前状态，之后可用 backtrack 回到此处；与 self.tokens.release() 成对使用"""
+        return (
+            self.current_token,
+            self.tokens.mark(),
+            len(self.diagnostics),
+            self.actions.checkpoint(),
+        )
+
+    def backtrack(self, mark):
+        """回到 mark 处：Token 位置、已记录的语法错误与语义动作 (单遍编译生成的四元式)"""
+        self.current_token, position, diagnostics, checkpoint = mark
+        self.tokens.reset(position)
+        del self.diagnostics[diagnostics:]
+        self.actions.rollback(checkpoint)
+        self.backtracks += 1
+
+    def memoized(self, rule, parse):
+        """
+        以 (规则, Token 位置) 为键记忆 parse 的结果与结束位置，语法错误也一并记忆。
+        同一位置的同一规则总是得到相同的结果，再次分析时直接跳到结束位置，
+        并重新记录分析期间报告的语法错误 (回溯时已被撤销)。
+        """
+        tokens = self.tokens
+        key = (rule, tokens.position)
+        entry = self.memo.get(key)
+        if entry is not None:
+            self.memo_hits += 1
+            result, error, self.current_token, position, diagnostics = entry
+            tokens.reset(position)
+            for diagnostic in diagnostics:
+                self.report(diagnostic)
+            if error is not None:
+                raise error
+            return result
+        self.memo_misses += 1
+        count = len(self.diagnostics)
+        result = error = None
+        try:
+            result = parse()
+            if type(result) is GeneratorType:
+                result = yield result
+            return result
+        except ParseError as e:
+            error = e
+            raise
+        finally:
+            self.memo[key] = (
+                result,
+                error,
+                self.current_token,
+                tokens.position,
+                self.diagnostics[count:],
+            )
+
+    # --- 错误恢复 (recover 模式) ---
+    def report(self, error):
+        """记录语法错误并返回代替出错部分的 ErrorNode；同一 Token 处的连带错误只记录一次"""
+        diagnostics = self.diagnostics
+        if (
+            not diagnostics
+            or error.token is None
+            or diagnostics[-1].token is not error.token
+        ):
+            diagnostics.append(error)
+        return ErrorNode(str(error), error.token)
+
+    def synchronize(self):
+        """
+        恐慌模式：跳过 Token 直到同步点。花括号深度为 0 的 ';' 一并跳过，'}'、fn
+        与文件结束不跳过；途中遇到的语句块成对跳过，跳过的块闭合后即视为语句结束。
+        """
+        depth = 0
+        while True:
+            token = self.current_token
+            if token.type == TT_EOF or self.at_function_start():
+                return
+            if token.type == TT_LBRACE:
+                depth += 1
+            elif token.type == TT_RBRACE:
+                if depth == 0:
+                    return
+                depth -= 1
+                if depth == 0:
+                    self.advance()
+                    return
+            elif token.type == TT_SEMICOLON and depth == 0:
+                self.advance()
+                return
+            self.advance()
+
+    def recover_statement(self):
+        """解析一条语句，出错时记录错误、同步到下一条语句，以 ErrorNode 代替该语句"""
+        try:
+            return (yield self.parse_statement())
+        except ParseError as error:
+            node = self.report(error)
+            self.synchronize()
+            return node
+
+    def consume_block_end(self):
+        """语句块结尾的 '}'；recover 模式下缺少时只记录错误，视为语句块已经结束"""
+        try:
+            self.consume(TT_RBRACE)
+        except ParseError as error:
+            if not self.recover:
+                raise
+            self.report(error)
 
     # 为了兼容旧代码，添加一个parse方法作为parse_program的别名
     def parse(self):
         return self.parse_program()
 
+    # 语句与表达式可以任意嵌套，相应的解析方法写成生成器：用 `node = yield self.parse_xxx()`
+    # 代替递归调用，由 run 在显式栈上执行，嵌套深度不受 Python 调用栈限制。
+    # 不含子结构的成分 (类型、参数表、数字、变量) 仍由普通方法直接返回结果；
+    # parse_statement、parse_expression、parse_factor 只做分派，返回结果或生成器，都可以被 yield。
+
     # --- 1.1 基础程序 ---
     def parse_program(self):
+        """解析整个程序 (入口)"""
+        return run(self.program())
+
+    def program(self):
         declarations = []
-        while (
-            self.current_token.type == TT_KEYWORD and self.current_token.value == "fn"
-        ):
-            declarations.append(self.parse_function_decl())
-        return ProgramNode(declarations)
+        while self.at_function_start():
+            if not self.recover:
+                declarations.append((yield self.parse_function_decl()))
+                continue
+            try:
+                declarations.append((yield self.parse_function_decl()))
+            except ParseError as error:
+                # 函数头出错或错误未能在函数体内恢复：跳到下一个函数声明
+                declarations.append(self.report(error))
+                while (
+                    self.current_token.type != TT_EOF and not self.at_function_start()
+                ):
+                    self.advance()
+        return self.actions.program(declarations)
 
-    def parse_function_decl(self):
+    def parse_function_header(self):
+        """函数头 fn 名称(形参表) [-> 返回类型]，返回 (名称 Token, 形参表, 返回类型)"""
         self.consume(TT_KEYWORD, "fn")
         name_token = self.consume(TT_IDENTIFIER)
         self.consume(TT_LPAREN)
@@ -95,16 +490,21 @@ class Parser:
         if self.current_token.type == TT_ARROW:
             self.advance()
             return_type = self.parse_type()
+        return name_token, params, return_type
+
+    def parse_function_decl(self):
+        name_token, params, return_type = self.parse_function_header()
         # 支持表达式块或语句块
         if self.current_token.type == TT_LBRACE:
+            self.actions.function_begin(name_token, params, return_type)
             # 支持7.2：函数表达式块作为函数体
             if return_type:
-                body = self.parse_function_expr_block()
+                body = yield self.parse_function_expr_block()
             else:
-                body = self.parse_block()
+                body = yield self.parse_block()
         else:
-            raise ParseError("函数体必须是语句块")
-        return FunctionDeclNode(name_token, params, return_type, body)
+            raise ParseError("函数体必须是语句块", self.current_token)
+        return self.actions.function_end(name_token, params, return_type, body)
 
     def parse_param_list(self):
         params = []
@@ -141,7 +541,9 @@ class Parser:
         if self.current_token.type == TT_KEYWORD and self.current_token.value == "i32":
             self.advance()
             return "i32"
-        raise ParseError(f"暂不支持的类型 {self.current_token.value}")
+        raise ParseError(
+            f"暂不支持的类型 {self.current_token.value}", self.current_token
+        )
 
     def parse_block(self):
         self.consume(TT_LBRACE)
@@ -149,16 +551,22 @@ class Parser:
         while (
             self.current_token.type != TT_RBRACE and self.current_token.type != TT_EOF
         ):
-            statements.append(self.parse_statement())
-        self.consume(TT_RBRACE)
-        return BlockNode(statements)
+            if not self.recover:
+                statements.append((yield self.parse_statement()))
+            elif self.at_function_start():
+                # 语句中不会出现 fn：缺少 '}'，在此结束语句块
+                break
+            else:
+                statements.append((yield self.recover_statement()))
+        self.consume_block_end()
+        return self.actions.block(statements)
 
     # --- 语句 ---
     def parse_statement(self):
         # ';' 空语句
         if self.current_token.type == TT_SEMICOLON:
             self.advance()
-            return EmptyStatementNode()
+            return self.actions.empty_statement()
         # if/else
         if self.current_token.type == TT_KEYWORD and self.current_token.value == "if":
             return self.parse_if_statement()
@@ -203,33 +611,40 @@ class Parser:
         return self.parse_expr_statement()
 
     def parse_if_statement(self):
+        actions = self.actions
         self.consume(TT_KEYWORD, "if")
-        condition = self.parse_expression()
-        then_block = self.parse_block()
+        condition = yield self.parse_expression()
+        context = actions.if_begin(condition)
+        then_block = yield self.parse_block()
+        actions.if_then_end(context, self.at_else())
         else_if_parts = []
         else_block = None
-        while (
-            self.current_token.type == TT_KEYWORD and self.current_token.value == "else"
-        ):
+        while self.at_else():
             self.advance()
             if (
                 self.current_token.type == TT_KEYWORD
                 and self.current_token.value == "if"
             ):
                 self.advance()
-                cond = self.parse_expression()
-                blk = self.parse_block()
+                actions.else_if_begin(context)
+                cond = yield self.parse_expression()
+                actions.else_if_condition(context, cond)
+                blk = yield self.parse_block()
+                actions.else_if_end(context)
                 else_if_parts.append({"condition": cond, "block": blk})
             else:
-                else_block = self.parse_block()
+                actions.else_begin(context)
+                else_block = yield self.parse_block()
                 break
-        return IfNode(condition, then_block, else_if_parts, else_block)
+        return actions.if_end(context, condition, then_block, else_if_parts, else_block)
 
     def parse_while_statement(self):
         self.consume(TT_KEYWORD, "while")
-        condition = self.parse_expression()
-        body = self.parse_block()
-        return WhileNode(condition, body)
+        context = self.actions.while_begin()
+        condition = yield self.parse_expression()
+        self.actions.while_condition(context, condition)
+        body = yield self.parse_block()
+        return self.actions.while_end(context, condition, body)
 
     def parse_for_statement(self):
         self.consume(TT_KEYWORD, "for")
@@ -243,42 +658,44 @@ class Parser:
 
         # 解析 in 关键字
         self.consume(TT_KEYWORD, "in")
+        context = self.actions.for_begin()
 
         # 解析可迭代结构 (目前仅支持 range: expr..expr)
-        start_expr = self.parse_expression()
+        start_expr = yield self.parse_expression()
         self.consume(TT_DOTDOT)
-        end_expr = self.parse_expression()
-        range_node = RangeNode(start_expr, end_expr)
+        end_expr = yield self.parse_expression()
+        self.actions.for_range(context, var_internal, start_expr, end_expr)
 
         # 解析循环体
-        body = self.parse_block()
+        body = yield self.parse_block()
 
-        return ForNode(var_internal, range_node, body)
+        return self.actions.for_end(context, var_internal, start_expr, end_expr, body)
 
     def parse_loop_statement(self):
         self.consume(TT_KEYWORD, "loop")
-        body = self.parse_block()
-        return LoopNode(body)
+        context = self.actions.loop_begin()
+        body = yield self.parse_block()
+        return self.actions.loop_end(context, body)
 
     def parse_break_statement(self):
         self.consume(TT_KEYWORD, "break")
         self.consume(TT_SEMICOLON)
-        return BreakNode()
+        return self.actions.break_statement()
 
     def parse_continue_statement(self):
         self.consume(TT_KEYWORD, "continue")
         self.consume(TT_SEMICOLON)
-        return ContinueNode()
+        return self.actions.continue_statement()
 
     def parse_return_statement(self):
         self.consume(TT_KEYWORD, "return")
         # 支持 return; 或 return expr;
         if self.current_token.type == TT_SEMICOLON:
             self.advance()
-            return ReturnNode()
-        expr = self.parse_expression()
+            return self.actions.return_statement()
+        expr = yield self.parse_expression()
         self.consume(TT_SEMICOLON)
-        return ReturnNode(expr)
+        return self.actions.return_statement(expr)
 
     def parse_let_statement(self):
         self.consume(TT_KEYWORD, "let")
@@ -294,51 +711,47 @@ class Parser:
             var_type = self.parse_type()
 
         # 初始化 - 支持2.3规则：变量声明赋值语句
-        init_expr = None
-        if self.current_token.type == TT_ASSIGN:
+        has_init = self.current_token.type == TT_ASSIGN
+        if has_init:
             self.advance()
-            init_expr = self.parse_expression()
+            init_expr = yield self.parse_expression()
         elif var_type is None:
             # 如果没有显式类型且没有初始化表达式，则报错
             # 因为类型无法推导
             raise ParseError(
-                f"变量 {name_token.value} 没有显式类型且没有初始化表达式，无法推导类型 at L{name_token.line}C{name_token.column}"
+                f"变量 {name_token.value} 没有显式类型且没有初始化表达式，无法推导类型 at L{name_token.line}C{name_token.column}",
+                name_token,
             )
 
         # 无论表达式是什么类型，都必须要分号
         self.consume(TT_SEMICOLON)
         var_internal = VariableInternalDeclNode(is_mutable, name_token)
-        return LetDeclNode(var_internal, var_type, init_expr)
+        if has_init:
+            return self.actions.let_init(var_internal, var_type, init_expr)
+        return self.actions.let_decl(var_internal, var_type)
 
     def parse_assign_or_expr_statement(self):
         # 赋值或表达式
         name_token = self.consume(TT_IDENTIFIER)
         if self.current_token.type == TT_ASSIGN:
             self.advance()
-            expr = self.parse_expression()
+            expr = yield self.parse_expression()
             self.consume(TT_SEMICOLON)
-            return AssignNode(IdentifierNode(name_token), expr)
+            return self.actions.assign(name_token, expr)
         # 函数调用 foo();
         if self.current_token.type == TT_LPAREN:
-            self.advance()
-            args = []
-            if self.current_token.type != TT_RPAREN:
-                args.append(self.parse_expression())
-                while self.current_token.type == TT_COMMA:
-                    self.advance()
-                    args.append(self.parse_expression())
-            self.consume(TT_RPAREN)
+            call = yield self.parse_call(name_token)
             self.consume(TT_SEMICOLON)
-            return ExprStatementNode(FunctionCallNode(IdentifierNode(name_token), args))
+            return self.actions.expr_statement(call)
         # 不是赋值或函数调用，就是其他表达式语句
-        expr = self.parse_expression_rest(IdentifierNode(name_token))
+        expr = yield self.parse_binary(left=self.actions.identifier(name_token))
         self.consume(TT_SEMICOLON)
-        return ExprStatementNode(expr)
+        return self.actions.expr_statement(expr)
 
     def parse_expr_statement(self):
-        expr = self.parse_expression()
+        expr = yield self.parse_expression()
         self.consume(TT_SEMICOLON)
-        return ExprStatementNode(expr)
+        return self.actions.expr_statement(expr)
 
     # --- 表达式 ---
     def parse_expression(self):
@@ -350,81 +763,80 @@ class Parser:
         if self.current_token.type == TT_LBRACE:
             return self.parse_function_expr_block()
 
-        return self.parse_comparison()
-
-    def parse_comparison(self):
-        node = self.parse_additive()
-        while self.current_token.type in (TT_EQ, TT_NE, TT_LT, TT_LTE, TT_GT, TT_GTE):
-            op_token = self.current_token
-            self.advance()
-            right = self.parse_additive()
-            node = BinaryOpNode(node, op_token, right)
-        return node
-
-    def parse_additive(self):
-        node = self.parse_term()
-        while self.current_token.type in (TT_PLUS, TT_MINUS):
-            op_token = self.current_token
-            self.advance()
-            right = self.parse_term()
-            node = BinaryOpNode(node, op_token, right)
-        return node
-
-    def parse_term(self):
-        node = self.parse_factor()
-        while self.current_token.type in (TT_MUL, TT_DIV, TT_MOD):
+        return self.parse_binary()
+
+    def parse_binary(self, min_bp=0, left=NO_OPERAND):
+        """
+        Pratt 运算符优先级分析：由绑定力表驱动，一个循环处理所有二元运算符。
+        只有遇到结合更紧的运算符时才为右操作数递归，同级运算符链不增加调用深度。
+        :param min_bp: 只继续结合左绑定力不小于 min_bp 的运算符
+        :param left: 已解析的左操作数 (从语句开头的标识符继续解析时使用)
+        """
+        table = BINARY_BINDING_POWER
+        binary = self.actions.binary
+        if left is NO_OPERAND:
+            left = self.parse_factor()
+            if type(left) is GeneratorType:
+                left = yield left
+        binding_power = table.get(self.current_token.type)
+        while binding_power is not None and binding_power[0] >= min_bp:
             op_token = self.current_token
             self.advance()
             right = self.parse_factor()
-            node = BinaryOpNode(node, op_token, right)
-        return node
+            # 数字与变量 (最常见的操作数) 不经过 run 调度
+            if type(right) is GeneratorType:
+                right = yield right
+            next_bp = table.get(self.current_token.type)
+            if next_bp is not None and next_bp[0] >= binding_power[1]:
+                right = yield self.parse_binary(binding_power[1], right)
+                next_bp = table.get(self.current_token.type)
+            left = binary(left, op_token, right)
+            binding_power = next_bp
+        return left
 
     def parse_factor(self):
+        """数字与变量直接返回结果，含子表达式的因子返回对应的生成器"""
         token = self.current_token
         if token.type == TT_NUMBER:
             self.advance()
-            return NumberNode(token)
+            return self.actions.number(token)
         if token.type == TT_IDENTIFIER:
             self.advance()
             # 函数调用
             if self.current_token.type == TT_LPAREN:
-                self.advance()
-                args = []
-                if self.current_token.type != TT_RPAREN:
-                    args.append(self.parse_expression())
-                    while self.current_token.type == TT_COMMA:
-                        self.advance()
-                        args.append(self.parse_expression())
-                self.consume(TT_RPAREN)
-                return FunctionCallNode(IdentifierNode(token), args)
-            return IdentifierNode(token)
+                return self.parse_call(token)
+            return self.actions.identifier(token)
         if token.type == TT_LPAREN:
-            self.advance()
-            expr = self.parse_expression()
-            self.consume(TT_RPAREN)
-            return expr
-        raise ParseError(f"无法识别的因子: {token}")
-
-    def parse_expression_rest(self, left):
-        # 用于处理赋值以外的表达式（如a+b等）
-        node = left
-        while self.current_token.type in (
-            TT_PLUS,
-            TT_MINUS,
-            TT_MUL,
-            TT_DIV,
-            TT_EQ,
-            TT_NE,
-            TT_LT,
-            TT_LTE,
-            TT_GT,
-            TT_GTE,
-        ):
-            op_token = self.current_token
-            self.advance()
-            right = self.parse_term()
-            node = BinaryOpNode(node, op_token, right)
-        return node
+            return self.parse_paren_expression()
+        # 前缀运算符 (查表)
+        operand_bp = PREFIX_BINDING_POWER.get(token.type)
+        if operand_bp is not None:
+            return self.parse_prefix_expression(operand_bp)
+        raise ParseError(f"无法识别的因子: {token}", token)
+
+    def parse_call(self, name_token):
+        """函数调用的实参表，当前 Token 为 '('"""
+        self.consume(TT_LPAREN)
+        args = []
+        if self.current_token.type != TT_RPAREN:
+            args.append((yield self.parse_expression()))
+            while self.current_token.type == TT_COMMA:
+                self.advance()
+                args.append((yield self.parse_expression()))
+        self.consume(TT_RPAREN)
+        return self.actions.call(name_token, args)
+
+    def parse_paren_expression(self):
+        self.consume(TT_LPAREN)
+        expr = yield self.parse_expression()
+        self.consume(TT_RPAREN)
+        return expr
+
+    def parse_prefix_expression(self, operand_bp):
+        token = self.current_token
+        self.advance()
+        operand = yield self.parse_binary(operand_bp)
+        return self.actions.unary(token, operand)
 
     # --- 支持7.1: 函数表达式块 ---
     def parse_function_expr_block(self):
@@ -433,10 +845,16 @@ class Parser:
 
         # 解析语句序列
         while self.current_token.type != TT_RBRACE:
-            statements.append(self.parse_statement())
+            if not self.recover:
+                statements.append((yield self.parse_statement()))
+            elif self.current_token.type == TT_EOF or self.at_function_start():
+                # 缺少 '}'，在此结束语句块
+                break
+            else:
+                statements.append((yield self.recover_statement()))
 
-        self.consume(TT_RBRACE)
-        return FunctionExprNode(statements)
+        self.consume_block_end()
+        return self.actions.function_expr(statements)
 
     def peek_next_is_rbrace(self):
         # 不再需要这个函数，但保留为空实现以避免出错
@@ -445,13 +863,15 @@ class Parser:
     # --- 支持7.3: 选择表达式 ---
     def parse_if_expression(self):
         self.consume(TT_KEYWORD, "if")
-        condition = self.parse_expression()
+        condition = yield self.parse_expression()
+        context = self.actions.if_expr_begin(condition)
 
         # 解析then块
-        then_block = self.parse_function_expr_block()
+        then_block = yield self.parse_function_expr_block()
+        self.actions.if_expr_else(context, then_block)
 
         # 解析else块
         self.consume(TT_KEYWORD, "else")
-        else_block = self.parse_function_expr_block()
+        else_block = yield self.parse_function_expr_block()
 
-        return IfExprNode(condition, then_block, else_block)
+        return self.actions.if_expr_end(context, condition, then_block, else_block)
@@ -8,13 +8,21 @@ FilePath     : \\课程设计\\rust-like-compiler\\parser_nodes.py
 
 
 class ASTNode:
-    """基本AST节点类"""
+    """
+    基本AST节点类。节点不使用实例 __dict__ (__slots__)，以节省大程序语法树的内存。
+    _fields 为全部属性 (按构造时的赋值顺序)，_children 为可能保存子节点或子节点列表的属性，
+    通用遍历按这两个元组访问节点；新增节点类时须一并声明。
+    """
 
-    pass
+    __slots__ = _fields = ()
+    _children = ()
 
 
 # --- 程序结构 ---
 class ProgramNode(ASTNode):
+    __slots__ = _fields = ("declarations",)
+    _children = ("declarations",)
+
     def __init__(self, declarations):
         self.declarations = declarations  # list of FunctionDeclNode
 
@@ -23,6 +31,9 @@ class ProgramNode(ASTNode):
 
 
 class FunctionDeclNode(ASTNode):
+    __slots__ = _fields = ("token", "params", "return_type", "body", "name")
+    _children = ("params", "return_type", "body")
+
     def __init__(self, name_token, params, return_type, body):
         self.token = name_token  # 函数名 Token
         self.params = params  # 形参列表 (list of ParamNode)
@@ -35,6 +46,9 @@ class FunctionDeclNode(ASTNode):
 
 
 class ParamNode(ASTNode):
+    __slots__ = _fields = ("name_internal", "param_type")
+    _children = ("name_internal", "param_type")
+
     def __init__(self, name_internal, param_type):
         self.name_internal = name_internal  # VariableInternalDeclNode
         self.param_type = param_type  # TypeNode
@@ -44,6 +58,8 @@ class ParamNode(ASTNode):
 
 
 class VariableInternalDeclNode(ASTNode):
+    __slots__ = _fields = ("mutable", "name")
+
     def __init__(self, mutable, name):
         self.mutable = mutable  # bool
         self.name = name  # Token(IDENTIFIER)
@@ -56,6 +72,17 @@ class VariableInternalDeclNode(ASTNode):
 class TypeNode(ASTNode):
     """类型节点 (支持基础类型, 数组, 元组, 引用)"""
 
+    __slots__ = _fields = (
+        "type_token",
+        "array_type",
+        "array_size",
+        "tuple_types",
+        "is_ref",
+        "ref_mutable",
+        "ref_type",
+    )
+    _children = ("array_type", "tuple_types", "ref_type")
+
     def __init__(
         self,
         type_token=None,
@@ -88,6 +115,9 @@ class TypeNode(ASTNode):
 
 # --- 语句 ---
 class BlockNode(ASTNode):
+    __slots__ = _fields = ("statements",)
+    _children = ("statements",)
+
     def __init__(self, statements):
         self.statements = statements  # list of StatementNode
 
@@ -96,15 +126,20 @@ class BlockNode(ASTNode):
 
 
 class StatementNode(ASTNode):
-    pass
+    __slots__ = ()
 
 
 class EmptyStatementNode(StatementNode):
+    __slots__ = _fields = ()
+
     def __repr__(self):
         return "EmptyStmt"
 
 
 class LetDeclNode(StatementNode):
+    __slots__ = _fields = ("var_internal_decl", "var_type", "init_expr")
+    _children = ("var_internal_decl", "var_type", "init_expr")
+
     def __init__(self, var_internal_decl, var_type, init_expr=None):
         self.var_internal_decl = var_internal_decl  # VariableInternalDeclNode
         self.var_type = var_type  # TypeNode or None
@@ -117,6 +152,9 @@ class LetDeclNode(StatementNode):
 
 
 class AssignNode(StatementNode):
+    __slots__ = _fields = ("assignable_element", "expr")
+    _children = ("assignable_element", "expr")
+
     def __init__(self, assignable_element, expr):
         self.assignable_element = assignable_element  # e.g., IdentifierNode, ArrayAccessNode, TupleAccessNode, UnaryOpNode(*)
         self.expr = expr  # ExpressionNode
@@ -126,6 +164,9 @@ class AssignNode(StatementNode):
 
 
 class ReturnNode(StatementNode):
+    __slots__ = _fields = ("expr",)
+    _children = ("expr",)
+
     def __init__(self, expr=None):
         self.expr = expr  # ExpressionNode or None
 
@@ -134,6 +175,9 @@ class ReturnNode(StatementNode):
 
 
 class IfNode(StatementNode):
+    __slots__ = _fields = ("condition", "then_block", "else_if_parts", "else_block")
+    _children = ("condition", "then_block", "else_if_parts", "else_block")
+
     def __init__(self, condition, then_block, else_if_parts, else_block):
         self.condition = condition  # ExpressionNode
         self.then_block = then_block  # BlockNode
@@ -147,6 +191,9 @@ class IfNode(StatementNode):
 
 
 class WhileNode(StatementNode):
+    __slots__ = _fields = ("condition", "body")
+    _children = ("condition", "body")
+
     def __init__(self, condition, body):
         self.condition = condition  # ExpressionNode
         self.body = body  # BlockNode
@@ -156,6 +203,9 @@ class WhileNode(StatementNode):
 
 
 class ForNode(StatementNode):
+    __slots__ = _fields = ("var_internal_decl", "iterable", "body")
+    _children = ("var_internal_decl", "iterable", "body")
+
     def __init__(self, var_internal_decl, iterable, body):
         self.var_internal_decl = var_internal_decl  # VariableInternalDeclNode
         self.iterable = iterable  # ExpressionNode (RangeNode or other)
@@ -166,6 +216,9 @@ class ForNode(StatementNode):
 
 
 class LoopNode(StatementNode):
+    __slots__ = _fields = ("body",)
+    _children = ("body",)
+
     def __init__(self, body):
         self.body = body  # BlockNode
 
@@ -174,6 +227,9 @@ class LoopNode(StatementNode):
 
 
 class BreakNode(StatementNode):
+    __slots__ = _fields = ("expr",)
+    _children = ("expr",)
+
     def __init__(self, expr=None):  # Rust's break can return a value from loop expr
         self.expr = expr
 
@@ -182,11 +238,16 @@ class BreakNode(StatementNode):
 
 
 class ContinueNode(StatementNode):
+    __slots__ = _fields = ()
+
     def __repr__(self):
         return "ContinueNode"
 
 
 class ExprStatementNode(StatementNode):
+    __slots__ = _fields = ("expr",)
+    _children = ("expr",)
+
     def __init__(self, expr):
         self.expr = expr
 
@@ -194,12 +255,27 @@ class ExprStatementNode(StatementNode):
         return f"ExprStmtNode({self.expr})"
 
 
+class ErrorNode(StatementNode):
+    """语法错误恢复时代替被跳过的语句或函数声明"""
+
+    __slots__ = _fields = ("message", "token")
+
+    def __init__(self, message, token=None):
+        self.message = message  # 语法错误信息
+        self.token = token  # 出错的 Token
+
+    def __repr__(self):
+        return f"ErrorNode({self.message})"
+
+
 # --- 表达式 ---
 class ExpressionNode(ASTNode):
-    pass
+    __slots__ = ()
 
 
 class NumberNode(ExpressionNode):
+    __slots__ = _fields = ("token", "value")
+
     def __init__(self, token):
         self.token = token
         self.value = token.value  # int or float
@@ -209,6 +285,8 @@ class NumberNode(ExpressionNode):
 
 
 class BooleanLiteralNode(ExpressionNode):
+    __slots__ = _fields = ("token", "value")
+
     def __init__(self, token, value):
         self.token = token  # The 'true' or 'false' keyword token
         self.value = value  # Python bool (True or False)
@@ -218,6 +296,8 @@ class BooleanLiteralNode(ExpressionNode):
 
 
 class IdentifierNode(ExpressionNode):
+    __slots__ = _fields = ("token", "name")
+
     def __init__(self, token):
         self.token = token
         self.name = token.value  # string
@@ -227,6 +307,9 @@ class IdentifierNode(ExpressionNode):
 
 
 class BinaryOpNode(ExpressionNode):
+    __slots__ = _fields = ("left", "op_token", "right")
+    _children = ("left", "right")
+
     def __init__(self, left, op_token, right):
         self.left = left  # ExpressionNode
         self.op_token = op_token  # Token (e.g., TT_PLUS, TT_EQ)
@@ -240,6 +323,9 @@ class BinaryOpNode(ExpressionNode):
 class UnaryOpNode(ExpressionNode):
     """一元操作节点 (例如: -, *, !)"""
 
+    __slots__ = _fields = ("op_token", "expr")
+    _children = ("expr",)
+
     def __init__(self, op_token, expr):
         self.op_token = op_token  # Token (e.g., TT_MINUS, TT_MUL for deref, TT_NOT?)
         self.expr = expr  # ExpressionNode
@@ -253,6 +339,9 @@ class UnaryOpNode(ExpressionNode):
 class BorrowNode(ExpressionNode):
     """借用表达式节点 (&expr, &mut expr)"""
 
+    __slots__ = _fields = ("is_mutable", "expr")
+    _children = ("expr",)
+
     def __init__(self, is_mutable, expr):
         self.is_mutable = is_mutable  # bool
         self.expr = expr  # ExpressionNode being borrowed
@@ -266,6 +355,9 @@ class BorrowNode(ExpressionNode):
 
 
 class FunctionCallNode(ExpressionNode):
+    __slots__ = _fields = ("func_expr", "args")
+    _children = ("func_expr", "args")
+
     def __init__(self, func_expr, args):  # Changed func_name_token to func_expr
         self.func_expr = func_expr  # ExpressionNode (usually IdentifierNode)
         self.args = args  # list of ExpressionNode
@@ -278,6 +370,9 @@ class FunctionCallNode(ExpressionNode):
 
 
 class ArrayLiteralNode(ExpressionNode):
+    __slots__ = _fields = ("elements",)
+    _children = ("elements",)
+
     def __init__(self, elements):
         self.elements = elements  # list of ExpressionNode
 
@@ -286,6 +381,9 @@ class ArrayLiteralNode(ExpressionNode):
 
 
 class ArrayAccessNode(ExpressionNode):
+    __slots__ = _fields = ("array_expr", "index_expr")
+    _children = ("array_expr", "index_expr")
+
     def __init__(self, array_expr, index_expr):
         self.array_expr = array_expr  # ExpressionNode
         self.index_expr = index_expr  # ExpressionNode
@@ -295,6 +393,9 @@ class ArrayAccessNode(ExpressionNode):
 
 
 class TupleLiteralNode(ExpressionNode):
+    __slots__ = _fields = ("elements",)
+    _children = ("elements",)
+
     def __init__(self, elements):
         self.elements = elements  # list of ExpressionNode
 
@@ -306,6 +407,9 @@ class TupleLiteralNode(ExpressionNode):
 
 
 class TupleAccessNode(ExpressionNode):
+    __slots__ = _fields = ("tuple_expr", "index_token")
+    _children = ("tuple_expr",)
+
     def __init__(self, tuple_expr, index_token):
         self.tuple_expr = tuple_expr  # ExpressionNode
         self.index_token = index_token  # Token(NUMBER)
@@ -315,6 +419,9 @@ class TupleAccessNode(ExpressionNode):
 
 
 class RangeNode(ASTNode):  # Not strictly an expression itself, but used in ForNode
+    __slots__ = _fields = ("start_expr", "end_expr")
+    _children = ("start_expr", "end_expr")
+
     def __init__(self, start_expr, end_expr):
         self.start_expr = start_expr  # ExpressionNode
         self.end_expr = end_expr  # ExpressionNode
@@ -325,6 +432,9 @@ class RangeNode(ASTNode):  # Not strictly an expression itself, but used in ForN
 
 # --- 表达式块相关 (保持不变) ---
 class FunctionExprNode(ExpressionNode):
+    __slots__ = _fields = ("items",)
+    _children = ("items",)
+
     def __init__(self, items):
         self.items = items
 
@@ -333,6 +443,9 @@ class FunctionExprNode(ExpressionNode):
 
 
 class IfExprNode(ExpressionNode):
+    __slots__ = _fields = ("condition", "then_expr_block", "else_expr_block")
+    _children = ("condition", "then_expr_block", "else_expr_block")
+
     def __init__(self, condition, then_expr_block, else_expr_block):
         self.condition = condition
         self.then_expr_block = then_expr_block  # BlockNode or similar
@@ -343,6 +456,9 @@ class IfExprNode(ExpressionNode):
 
 
 class LoopExprNode(ExpressionNode):
+    __slots__ = _fields = ("body",)
+    _children = ("body",)
+
     def __init__(self, body):
         self.body = body  # BlockNode
 
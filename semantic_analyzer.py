@@ -8,9 +8,15 @@ FilePath     : \\课程设计\\rust-like-compiler\\semantic_analyzer.py
 
 from symbol_table import SymbolTable, Symbol, FunctionSymbol, CompilerError
 from parser_nodes import *
+from ast_walker import ASTVisitor
 
 
-class SemanticAnalyzer:
+class SemanticAnalyzer(ASTVisitor):
+    """
+    含子节点的 visit 方法与表达式类型推导都是生成器，用 `yield` 代替递归调用，
+    由 ASTVisitor.walk 在显式栈上执行。
+    """
+
     def __init__(self):
         self.symbol_table = SymbolTable()
         self.current_function_return_type = None
@@ -46,6 +52,23 @@ class SemanticAnalyzer:
             return node.column
         return None
 
+    def get_node_offset(self, node):
+        """安全地获取节点在源代码中的偏移量 (节点自身或运算符 Token，否则取最左侧子节点)"""
+        # 沿最左侧子节点向下查找 (循环代替递归，长运算符链不会耗尽调用栈)
+        while node is not None:
+            for attr in ("token", "op_token"):
+                token = getattr(node, attr, None)
+                if token is not None and getattr(token, "offset", None) is not None:
+                    return token.offset
+            for attr in ("left", "func_expr", "expr"):
+                child = getattr(node, attr, None)
+                if child is not None:
+                    node = child
+                    break
+            else:
+                node = None
+        return None
+
     def get_type_name(self, type_node):
         """安全地获取类型名称"""
         if type_node is None:
@@ -58,32 +81,28 @@ class SemanticAnalyzer:
             return self.get_node_value(type_node.name)
         return self.get_node_value(type_node)
 
-    def analyze(self, ast):
-        """分析AST并返回错误列表"""
+    def analyze(self, ast, source_map=None):
+        """分析AST并返回错误列表，给出 source_map 时为只记录了偏移量的错误补全行列号"""
         self.symbol_table.clear_errors()
-        self.visit(ast)
+        self.walk(ast)
+        if source_map is not None:
+            for error in self.symbol_table.errors:
+                error.locate(source_map)
         return self.symbol_table.errors
 
-    def visit(self, node):
-        """访问AST节点的通用方法"""
-        method_name = f"visit_{node.__class__.__name__}"
-        visitor = getattr(self, method_name, self.generic_visit)
-        return visitor(node)
-
     def generic_visit(self, node):
         """通用访问方法"""
         for child in getattr(node, "children", []):
             if child:
-                self.visit(child)
+                yield self.visit(child)
 
     def visit_ProgramNode(self, node):
         """访问程序根节点"""
         for decl in node.declarations:
-            self.visit(decl)
+            yield self.visit(decl)
 
-    def visit_FunctionDeclNode(self, node):
-        """访问函数声明节点"""
-        # 添加函数到符号表
+    def function_symbol(self, node):
+        """由函数声明 (只需函数头，可以没有函数体) 构造函数符号"""
         param_types = []
         for param in node.params:
             param_types.append(self.get_type_name(param.param_type))
@@ -91,7 +110,7 @@ class SemanticAnalyzer:
         # 获取函数名称 - 使用辅助函数
         func_name = self.get_node_value(node.name)
 
-        func_symbol = FunctionSymbol(
+        return FunctionSymbol(
             func_name,
             self.get_type_name(node.return_type),
             param_types,
@@ -99,7 +118,20 @@ class SemanticAnalyzer:
             self.get_node_column(node),
         )
 
-        self.symbol_table.define(func_symbol)
+    def declare_functions(self, symbols):
+        """
+        预先登记在当前位置之前声明的函数 (单独分析某个函数时使用)，
+        使全局作用域与顺序分析到此处时一致；登记过程不产生诊断信息
+        """
+        errors = len(self.symbol_table.errors)
+        for symbol in symbols:
+            self.symbol_table.define(symbol)
+        del self.symbol_table.errors[errors:]
+
+    def visit_FunctionDeclNode(self, node):
+        """访问函数声明节点"""
+        # 添加函数到符号表
+        self.symbol_table.define(self.function_symbol(node))
 
         # 进入函数作用域
         self.symbol_table.enter_scope()
@@ -125,7 +157,7 @@ class SemanticAnalyzer:
 
         # 访问函数体
         if node.body:
-            self.visit(node.body)
+            yield self.visit(node.body)
 
         # 退出函数作用域
         self.current_function_return_type = old_return_type
@@ -157,7 +189,7 @@ class SemanticAnalyzer:
 
         # 类型推断：如果没有显式类型，从初始化表达式推断
         if var_type == "unknown" and node.init_expr:
-            init_type = self.get_expression_type(node.init_expr)
+            init_type = yield self.get_expression_type(node.init_expr)
             if init_type != "unknown":
                 var_type = init_type
 
@@ -167,7 +199,7 @@ class SemanticAnalyzer:
 
         # 访问初始化表达式
         if node.init_expr:
-            init_type = self.visit_expression(node.init_expr)
+            init_type = yield self.visit_expression(node.init_expr)
             # 检查类型兼容性
             if (
                 var_type != "unknown"
@@ -195,7 +227,7 @@ class SemanticAnalyzer:
 
             # 检查类型兼容性
             if node.expr:
-                value_type = self.visit_expression(node.expr)
+                value_type = yield self.visit_expression(node.expr)
                 symbol = self.symbol_table.lookup(var_name, mark_used=False)
                 if symbol and symbol.type != "unknown" and value_type != "unknown":
                     self.symbol_table.check_type_compatibility(
@@ -210,34 +242,36 @@ class SemanticAnalyzer:
         """访问if语句节点"""
         # 检查条件表达式类型
         if node.condition:
-            cond_type = self.visit_expression(node.condition)
+            cond_type = yield self.visit_expression(node.condition)
             if cond_type != "unknown" and cond_type != "bool":
                 self.symbol_table.add_error(
                     "type_mismatch",
                     f"If condition must be of type 'bool', found '{cond_type}'",
                     suggestion="Use a boolean expression as the condition",
+                    offset=self.get_node_offset(node.condition),
                 )
 
         # 访问then和else块
         if node.then_block:
             self.symbol_table.enter_scope()
-            self.visit(node.then_block)
+            yield self.visit(node.then_block)
             self.symbol_table.exit_scope()
 
         if node.else_block:
             self.symbol_table.enter_scope()
-            self.visit(node.else_block)
+            yield self.visit(node.else_block)
             self.symbol_table.exit_scope()
 
     def visit_WhileNode(self, node):
         """访问while循环节点"""
         # 检查条件表达式类型
         if node.condition:
-            cond_type = self.visit_expression(node.condition)
+            cond_type = yield self.visit_expression(node.condition)
             if cond_type != "unknown" and cond_type != "bool":
                 self.symbol_table.add_error(
                     "type_mismatch",
                     f"While condition must be of type 'bool', found '{cond_type}'",
+                    offset=self.get_node_offset(node.condition),
                 )
 
         # 访问循环体
@@ -245,14 +279,14 @@ class SemanticAnalyzer:
             old_in_loop = self.in_loop
             self.in_loop = True
             self.symbol_table.enter_scope()
-            self.visit(node.body)
+            yield self.visit(node.body)
             self.symbol_table.exit_scope()
             self.in_loop = old_in_loop
 
     def visit_ReturnNode(self, node):
         """访问return语句节点"""
         if node.expr:
-            return_type = self.visit_expression(node.expr)
+            return_type = yield self.visit_expression(node.expr)
             # 检查返回类型
             if (
                 self.current_function_return_type
@@ -279,14 +313,14 @@ class SemanticAnalyzer:
     def visit_BlockNode(self, node):
         """访问代码块节点"""
         for stmt in node.statements:
-            self.visit(stmt)
+            yield self.visit(stmt)
 
     def visit_expression(self, node):
-        """访问表达式并返回类型"""
+        """访问表达式并返回类型 (调用方以 yield 取得结果)"""
         return self.get_expression_type(node)
 
     def get_expression_type(self, node):
-        """获取表达式的类型"""
+        """获取表达式的类型：字面量与变量直接返回，复合表达式返回待执行的生成器"""
         if isinstance(node, NumberNode):
             return "i32"
         elif isinstance(node, BooleanLiteralNode):
@@ -302,6 +336,7 @@ class SemanticAnalyzer:
                     f"Use of undeclared variable '{var_name}'",
                     self.get_node_line(node),
                     self.get_node_column(node),
+                    offset=self.get_node_offset(node),
                 )
                 return "unknown"
         elif isinstance(node, BinaryOpNode):
@@ -315,8 +350,8 @@ class SemanticAnalyzer:
 
     def get_binary_op_type(self, node):
         """获取二元操作的返回类型"""
-        left_type = self.get_expression_type(node.left)
-        right_type = self.get_expression_type(node.right)
+        left_type = yield self.get_expression_type(node.left)
+        right_type = yield self.get_expression_type(node.right)
 
         operator = (
             self.get_node_value(node.op_token)
@@ -332,6 +367,7 @@ class SemanticAnalyzer:
                 self.symbol_table.add_error(
                     "type_mismatch",
                     f"Cannot apply operator '{operator}' to types '{left_type}' and '{right_type}'",
+                    offset=self.get_node_offset(node),
                 )
 
         # 比较操作符
@@ -346,6 +382,7 @@ class SemanticAnalyzer:
                 self.symbol_table.add_error(
                     "type_mismatch",
                     f"Cannot compare types '{left_type}' and '{right_type}'",
+                    offset=self.get_node_offset(node),
                 )
 
         # 逻辑操作符
@@ -356,13 +393,14 @@ class SemanticAnalyzer:
                 self.symbol_table.add_error(
                     "type_mismatch",
                     f"Logical operator '{operator}' requires bool operands",
+                    offset=self.get_node_offset(node),
                 )
 
         return "unknown"
 
     def get_unary_op_type(self, node):
         """获取一元操作的返回类型"""
-        operand_type = self.get_expression_type(node.expr)
+        operand_type = yield self.get_expression_type(node.expr)
         operator = (
             self.get_node_value(node.op_token)
             if hasattr(node, "op_token")
@@ -379,14 +417,15 @@ class SemanticAnalyzer:
             self.symbol_table.add_error(
                 "type_mismatch",
                 f"Cannot apply operator '{operator}' to type '{operand_type}'",
+                offset=self.get_node_offset(node),
             )
 
         return "unknown"
 
     def get_function_call_type(self, node):
         """获取函数调用的返回类型"""
-        if node.callee:
-            func_name = self.get_node_value(node.callee)
+        if node.func_expr:
+            func_name = self.get_node_value(node.func_expr)
             symbol = self.symbol_table.lookup(func_name)
 
             if symbol and symbol.is_function:
@@ -0,0 +1,70 @@
+"""
+Description  : 源文件位置索引：字符偏移量与 (行号, 列号) 之间的相互换算
+Author       : Hyoung
+Date         : 2026-10-17 12:20:16
+LastEditTime : 2026-10-17 12:20:16
+FilePath     : \\课程设计\\rust-like-compiler\\source_map.py
+"""
+
+from array import array
+from bisect import bisect_right
+
+
+def build_line_index(text):
+    """返回每一行起始位置的偏移量数组 (第 i 行从 line_starts[i-1] 开始)"""
+    line_starts = array("i", [0])
+    find = text.find
+    pos = find("\n")
+    while pos != -1:
+        line_starts.append(pos + 1)
+        pos = find("\n", pos + 1)
+    return line_starts
+
+
+class SourceMap:
+    """
+    每个源文件建立一次的行首偏移量索引。
+    Token、语法错误与语义错误只需记录字符偏移量，真正显示诊断信息时
+    再通过二分查找换算为行列号 (行号、列号均从 1 开始)。
+    """
+
+    def __init__(self, text, name=None):
+        self.text = text
+        self.name = name  # 文件名，仅用于显示
+        self.line_starts = build_line_index(text)
+
+    def __len__(self):
+        """行数"""
+        return len(self.line_starts)
+
+    def line_of(self, offset):
+        """偏移量所在的行号"""
+        return bisect_right(self.line_starts, offset)
+
+    def position(self, offset):
+        """将字符偏移量换算为 (行号, 列号)"""
+        line = bisect_right(self.line_starts, offset)
+        return line, offset - self.line_starts[line - 1] + 1
+
+    def offset_of(self, line, column=1):
+        """将 (行号, 列号) 换算为字符偏移量，超出范围时截断到文件内"""
+        line = min(max(line, 1), len(self.line_starts))
+        start = self.line_starts[line - 1]
+        return min(start + max(column, 1) - 1, self.line_end(line))
+
+    def line_end(self, line):
+        """第 line 行末尾 (不含换行符) 的偏移量"""
+        if line < len(self.line_starts):
+            return self.line_starts[line] - 1
+        return len(self.text)
+
+    def line_text(self, line):
+        """第 line 行的文本 (不含换行符)，行号越界时返回空串"""
+        if not 1 <= line <= len(self.line_starts):
+            return ""
+        return self.text[self.line_starts[line - 1] : self.line_end(line)]
+
+    def describe(self, offset):
+        """诊断信息中使用的位置描述，形如 L3C5"""
+        line, column = self.position(offset)
+        return f"L{line}C{column}"
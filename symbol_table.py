@@ -36,12 +36,21 @@ class FunctionSymbol(Symbol):
 
 
 class CompilerError:
-    def __init__(self, error_type, message, line=None, col=None, suggestion=None):
+    def __init__(
+        self, error_type, message, line=None, col=None, suggestion=None, offset=None
+    ):
         self.error_type = error_type  # 'syntax', 'semantic', 'type', 'scope'
         self.message = message
         self.line = line
         self.col = col
         self.suggestion = suggestion  # 修复建议
+        self.offset = offset  # 源代码中的字符偏移量
+
+    def locate(self, source_map):
+        """只记录了偏移量的错误，显示前由 SourceMap 换算出行列号"""
+        if self.line is None and self.offset is not None:
+            self.line, self.col = source_map.position(self.offset)
+        return self
 
 
 class SymbolTable:
@@ -49,6 +58,9 @@ class SymbolTable:
         self.scopes = [{}]  # 全局作用域
         self.errors = []  # 错误列表
         self.scope_level = 0  # 当前作用域层级
+        # 名字 -> 各层作用域中同名符号组成的栈 (内层在后)，查找时不必逐层遍历作用域，
+        # 嵌套再深也只需一次字典查找
+        self.bindings = {}
 
     def enter_scope(self):
         self.scopes.append({})
@@ -68,6 +80,11 @@ class SymbolTable:
                         f"Consider removing unused variable '{symbol.name}'",
                     )
 
+            for name in current_scope:
+                symbols = self.bindings[name]
+                symbols.pop()
+                if not symbols:
+                    del self.bindings[name]
             self.scopes.pop()
             self.scope_level -= 1
 
@@ -90,16 +107,20 @@ class SymbolTable:
                 f"Previous declaration was at line {existing.line}",
             )
 
+            self.bindings[symbol.name][-1] = symbol
+        else:
+            self.bindings.setdefault(symbol.name, []).append(symbol)
+
         current_scope[symbol.name] = symbol
         return True
 
     def lookup(self, name, mark_used=True):
-        for scope in reversed(self.scopes):
-            if name in scope:
-                symbol = scope[name]
-                if mark_used:
-                    symbol.is_used = True
-                return symbol
+        symbols = self.bindings.get(name)
+        if symbols:
+            symbol = symbols[-1]
+            if mark_used:
+                symbol.is_used = True
+            return symbol
         return None
 
     def lookup_current_scope(self, name):
@@ -108,13 +129,19 @@ class SymbolTable:
             return self.scopes[-1][name]
         return None
 
-    def add_error(self, error_type, message, line=None, col=None, suggestion=None):
-        error = CompilerError(error_type, message, line, col, suggestion)
+    def add_error(
+        self, error_type, message, line=None, col=None, suggestion=None, offset=None
+    ):
+        error = CompilerError(error_type, message, line, col, suggestion, offset)
         self.errors.append(error)
 
-    def add_warning(self, error_type, message, line=None, col=None, suggestion=None):
+    def add_warning(
+        self, error_type, message, line=None, col=None, suggestion=None, offset=None
+    ):
         # 警告也作为错误处理，但类型标记为warning
-        error = CompilerError(f"warning_{error_type}", message, line, col, suggestion)
+        error = CompilerError(
+            f"warning_{error_type}", message, line, col, suggestion, offset
+        )
         self.errors.append(error)
 
     def check_assignment(self, var_name, line=None, col=None):